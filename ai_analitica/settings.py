@@ -222,6 +222,93 @@ CELERY_TASK_TIME_LIMIT = 30 * 60  # 30 minutes
 CELERY_TASK_SOFT_TIME_LIMIT = 25 * 60  # 25 minutes
 CELERY_WORKER_PREFETCH_MULTIPLIER = 1
 CELERY_WORKER_MAX_TASKS_PER_CHILD = 1000
+CELERY_IMPORTS = ('news.ai_tasks',)  # Task modules not named tasks.py
 
 # Celery Beat Schedule (for periodic tasks)
 CELERY_BEAT_SCHEDULER = 'django_celery_beat.schedulers:DatabaseScheduler'
+CELERY_BEAT_SCHEDULE = {
+    'schedule-news-scrapes': {
+        'task': 'news.ai_tasks.schedule_news_scrapes',
+        'schedule': float(os.getenv('SCRAPER_SCHEDULE_TICK_SECONDS', '300')),
+    },
+    'verify-scraped-images': {
+        'task': 'news.ai_tasks.verify_scraped_images',
+        'schedule': float(os.getenv('SCRAPER_IMAGE_TICK_SECONDS', '120')),
+    },
+    'flush-counters': {
+        'task': 'news.ai_tasks.flush_counters',
+        'schedule': float(os.getenv('COUNTER_FLUSH_SECONDS', '10')),
+    },
+    'discover-trending-keywords': {
+        'task': 'news.ai_tasks.discover_trending_keywords',
+        'schedule': float(os.getenv('TRENDS_TICK_SECONDS', '900')),
+    },
+}
+
+# Write-Behind Counters (shares, ad impressions/clicks; see news.counters)
+COUNTER_REDIS_URL = os.getenv('COUNTER_REDIS_URL', '')  # Empty: each process keeps and flushes its own increments (the beat task cannot see them)
+COUNTER_FLUSH_SECONDS = float(os.getenv('COUNTER_FLUSH_SECONDS', '10'))  # Seconds between flushes to the database
+
+# Ad Serving (see news.ad_index)
+AD_INDEX_TTL = int(os.getenv('AD_INDEX_TTL', '60'))  # Seconds before the in-memory ad index is rebuilt
+AD_ROTATION = os.getenv('AD_ROTATION', 'weighted')  # 'weighted' or 'round_robin'
+AD_MAX_SLOTS = int(os.getenv('AD_MAX_SLOTS', '10'))  # Slots one /api/advertisements/slots/ request may fill
+
+# Cache (public API responses, see news.response_cache; also Celery's cache backend)
+CACHE_REDIS_URL = os.getenv('CACHE_REDIS_URL', '')  # Empty: per-process memory, invalidation reaches only this process
+if CACHE_REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': CACHE_REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'OPTIONS': {'MAX_ENTRIES': 5000},
+        }
+    }
+# Seconds a cached response may be served; 0 disables. Off by default without a shared cache,
+# since other processes would keep serving responses invalidated in this one
+RESPONSE_CACHE_TTL = int(os.getenv('RESPONSE_CACHE_TTL', '300' if CACHE_REDIS_URL else '0'))
+
+# Related Articles (see news.related)
+RELATED_ARTICLES_K = int(os.getenv('RELATED_ARTICLES_K', '6'))  # Neighbours stored per article
+RELATED_TERMS = int(os.getenv('RELATED_TERMS', '40'))  # Key terms kept per article
+
+# News Scraper Configuration
+SCRAPER_MAX_CONCURRENCY = int(os.getenv('SCRAPER_MAX_CONCURRENCY', '16'))  # Simultaneous requests across all hosts
+SCRAPER_PER_HOST_CONNECTIONS = int(os.getenv('SCRAPER_PER_HOST_CONNECTIONS', '2'))  # Simultaneous requests per host
+SCRAPER_POLITENESS_DELAY = float(os.getenv('SCRAPER_POLITENESS_DELAY', '1.0'))  # Seconds between requests to one host
+SCRAPER_PARSE_WORKERS = int(os.getenv('SCRAPER_PARSE_WORKERS', '4'))
+SCRAPER_PARSE_PROCESSES = int(os.getenv('SCRAPER_PARSE_PROCESSES', '2'))  # Parse process pool size; 0 parses on threads
+SCRAPER_HTTP_CACHE_DIR = os.getenv('SCRAPER_HTTP_CACHE_DIR', str(BASE_DIR / '.scraper_cache'))  # Conditional-request validators
+SCRAPER_MAX_RESPONSE_BYTES = int(os.getenv('SCRAPER_MAX_RESPONSE_BYTES', str(5 * 1024 * 1024)))  # Larger pages are dropped unread
+SCRAPER_SCHEDULE_BUDGET = int(os.getenv('SCRAPER_SCHEDULE_BUDGET', '4'))  # Max scrape jobs active at once
+SCRAPER_SCHEDULE_MIN_INTERVAL_MINUTES = int(os.getenv('SCRAPER_SCHEDULE_MIN_INTERVAL_MINUTES', '15'))
+SCRAPER_SCHEDULE_MAX_BACKOFF = float(os.getenv('SCRAPER_SCHEDULE_MAX_BACKOFF', '4'))  # x scrape_frequency_hours
+SCRAPER_RESPECT_ROBOTS = os.getenv('SCRAPER_RESPECT_ROBOTS', 'True') == 'True'
+SCRAPER_ROBOTS_TTL = int(os.getenv('SCRAPER_ROBOTS_TTL', '21600'))  # Seconds a parsed robots.txt is reused
+SCRAPER_BREAKER_WINDOW = int(os.getenv('SCRAPER_BREAKER_WINDOW', '20'))  # Recent requests per host in the error rate
+SCRAPER_BREAKER_MIN_SAMPLES = int(os.getenv('SCRAPER_BREAKER_MIN_SAMPLES', '5'))
+SCRAPER_BREAKER_ERROR_RATE = float(os.getenv('SCRAPER_BREAKER_ERROR_RATE', '0.5'))  # Error rate that opens the breaker
+SCRAPER_BREAKER_COOLDOWN = int(os.getenv('SCRAPER_BREAKER_COOLDOWN', '300'))  # Seconds a failing host is skipped
+SCRAPER_MAX_RETRY_AFTER = int(os.getenv('SCRAPER_MAX_RETRY_AFTER', '600'))  # Longest Retry-After pause honoured for a host
+SCRAPER_MAX_RETRY_WAIT = float(os.getenv('SCRAPER_MAX_RETRY_WAIT', '5'))  # Longer pauses drop the host's URLs for the crawl
+SCRAPER_FEED_DISCOVERY_TTL = int(os.getenv('SCRAPER_FEED_DISCOVERY_TTL', '24'))  # Hours discovered feeds are reused before re-checking the homepage
+SCRAPER_DEDUP_THRESHOLD = float(os.getenv('SCRAPER_DEDUP_THRESHOLD', '0.6'))  # Estimated Jaccard similarity for near-duplicates
+SCRAPER_DEDUP_WINDOW_DAYS = int(os.getenv('SCRAPER_DEDUP_WINDOW_DAYS', '7'))  # How far back to look for the same story
+SCRAPER_IMAGE_MIN_WIDTH = int(os.getenv('SCRAPER_IMAGE_MIN_WIDTH', '300'))  # Smaller images are icons, avatars or pixels
+SCRAPER_IMAGE_MIN_HEIGHT = int(os.getenv('SCRAPER_IMAGE_MIN_HEIGHT', '200'))
+SCRAPER_IMAGE_MAX_ASPECT = float(os.getenv('SCRAPER_IMAGE_MAX_ASPECT', '3.0'))  # Wider/taller images are banners and logos
+SCRAPER_IMAGE_KEEP = int(os.getenv('SCRAPER_IMAGE_KEEP', '3'))  # Verified images stored per article
+SCRAPER_IMAGE_WORKERS = int(os.getenv('SCRAPER_IMAGE_WORKERS', '8'))  # Simultaneous image probes
+
+# Trending Keyword Discovery (over scraped articles)
+TRENDS_WINDOW_HOURS = int(os.getenv('TRENDS_WINDOW_HOURS', '6'))  # Recent window tested for a burst
+TRENDS_BASELINE_DAYS = int(os.getenv('TRENDS_BASELINE_DAYS', '7'))  # History the expected rate comes from
+TRENDS_MIN_ARTICLES = int(os.getenv('TRENDS_MIN_ARTICLES', '3'))  # Articles mentioning a term in the window
+TRENDS_MIN_SCORE = float(os.getenv('TRENDS_MIN_SCORE', '3.0'))  # Burst z-score for a keyword candidate
+TRENDS_MAX_CANDIDATES = int(os.getenv('TRENDS_MAX_CANDIDATES', '20'))  # Candidates proposed per tick
@@ -3,12 +3,16 @@ import {
   createNewsSource, 
   getNewsSources, 
   triggerScrape,
+  getScrapeStatus,
   getScrapedArticles,
   approveScrapedArticle,
   rejectScrapedArticle,
   bulkApproveArticles
 } from '../../../services/aiContentService'
 
+// How often to poll a running scrape job (ms)
+const SCRAPE_POLL_INTERVAL = 2000
+
 export default function KeywordScraper({ onKeywordsAdded, showModal, setShowModal, showFullUI = true, hideConfigurations = false, showConfigsOnly = false }) {
   const [activeTab, setActiveTab] = useState('review')
   const [loading, setLoading] = useState(false)
@@ -259,19 +263,41 @@ export default function KeywordScraper({ onKeywordsAdded, showModal, setShowModa
     }))
     
     try {
-      // Update progress to scraping
-      setScrapingProgress(prev => ({
-        ...prev,
-        [configId]: { 
-          status: 'scraping', 
-          progress: 30, 
-          message: 'Searching for articles on websites...',
-          articlesFound: 0,
-          articlesCreated: 0
+      let job
+      try {
+        const response = await triggerScrape(configId)
+        job = response.data.job
+      } catch (error) {
+        // A scrape is already running for this config: follow that job instead
+        if (error.response?.status === 409 && error.response.data?.job) {
+          job = error.response.data.job
+        } else {
+          throw error
         }
-      }))
+      }
+      
+      // Poll the background job until it finishes
+      while (job.status === 'queued' || job.status === 'running') {
+        setScrapingProgress(prev => ({
+          ...prev,
+          [configId]: { 
+            status: 'scraping', 
+            progress: job.progress, 
+            message: job.status === 'queued'
+              ? 'Waiting for scraper...'
+              : `Scraped ${job.sites_done}/${job.sites_total} websites...`,
+            articlesFound: job.articles_found,
+            articlesCreated: job.articles_saved
+          }
+        }))
+        await new Promise(resolve => setTimeout(resolve, SCRAPE_POLL_INTERVAL))
+        const statusResponse = await getScrapeStatus(configId, job.id)
+        job = statusResponse.data
+      }
       
-      const response = await triggerScrape(configId)
+      if (job.status === 'failed') {
+        throw new Error(job.error_message || 'Scraping failed')
+      }
       
       // Update progress with actual results
       setScrapingProgress(prev => ({
@@ -280,14 +306,14 @@ export default function KeywordScraper({ onKeywordsAdded, showModal, setShowModa
           status: 'complete', 
           progress: 100, 
           message: 'Scraping completed!',
-          articlesFound: response.data.total_found || 0,
-          articlesCreated: response.data.articles_created || 0
+          articlesFound: job.articles_found || 0,
+          articlesCreated: job.articles_saved || 0
         }
       }))
       
       setMessage({ 
         type: 'success', 
-        text: `✅ Found ${response.data.total_found || 0} articles, saved ${response.data.articles_created || 0} new articles for "${configName}"` 
+        text: `✅ Found ${job.articles_found || 0} articles, saved ${job.articles_saved || 0} new articles for "${configName}"` 
       })
         
       // Reload scraped articles if on review tab
@@ -347,16 +373,26 @@ export default function KeywordScraper({ onKeywordsAdded, showModal, setShowModa
     }
   }
 
-  const handleApproveArticle = async (articleId) => {
+  const handleApproveArticle = async (articleId, force = false) => {
     setLoading(true)
     try {
-      await approveScrapedArticle(articleId, { auto_generate: true })
+      await approveScrapedArticle(articleId, { auto_generate: true, force })
       setMessage({ 
         type: 'success', 
         text: 'Article approved and sent to generation pipeline!' 
       })
       loadScrapedArticles()
     } catch (error) {
+      if (error.response?.status === 409 && !force) {
+        // Same story already approved from another source
+        const { duplicate_title: duplicateTitle } = error.response.data
+        if (window.confirm(`"${duplicateTitle}" covers the same story and was already approved. Generate this one anyway?`)) {
+          setLoading(false)
+          return handleApproveArticle(articleId, true)
+        }
+        setMessage({ type: 'error', text: error.response.data.detail })
+        return
+      }
       setMessage({ 
         type: 'error', 
         text: error.response?.data?.detail || 'Failed to approve article' 
@@ -770,6 +806,7 @@ export default function KeywordScraper({ onKeywordsAdded, showModal, setShowModa
                     <div className="scraped-article-meta">
                       <span className="meta-item">
                         <strong>Source:</strong> {article.source_website}
+                        {article.duplicate_count > 0 && ` (+${article.duplicate_count} similar)`}
                       </span>
                       <span className="meta-item">
                         <strong>Category:</strong> {article.category}
@@ -39,8 +39,9 @@ export const getNewsSource = (id) => api.get(`/admin/ai/news-sources/${id}/`)
 export const createNewsSource = (data) => api.post('/admin/ai/news-sources/', data)
 export const updateNewsSource = (id, data) => api.patch(`/admin/ai/news-sources/${id}/`, data)
 export const deleteNewsSource = (id) => api.delete(`/admin/ai/news-sources/${id}/`)
-// Scraping can take a long time, so use extended timeout (2 minutes)
-export const triggerScrape = (id) => api.post(`/admin/ai/news-sources/${id}/trigger_scrape/`, {}, { timeout: 120000 })
+// Scraping runs as a background job; poll getScrapeStatus for progress
+export const triggerScrape = (id) => api.post(`/admin/ai/news-sources/${id}/trigger_scrape/`)
+export const getScrapeStatus = (id, jobId) => api.get(`/admin/ai/news-sources/${id}/scrape_status/`, { params: { job_id: jobId } })
 
 // Scraped Articles
 export const getScrapedArticles = (params) => api.get('/admin/ai/scraped-articles/', { params })
@@ -78,6 +79,7 @@ export default {
 	updateNewsSource,
 	deleteNewsSource,
 	triggerScrape,
+	getScrapeStatus,
 	getScrapedArticles,
 	getScrapedArticle,
 	approveScrapedArticle,
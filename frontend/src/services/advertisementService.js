@@ -10,6 +10,16 @@ class AdvertisementService {
     return response.data;
   }
 
+  /**
+   * Get one rotated advertisement per slot, e.g. ['header', 'inline', 'inline']
+   */
+  async getSlots(positions) {
+    const response = await api.get('/advertisements/slots/', {
+      params: { slots: positions.join(',') },
+    });
+    return response.data.slots;
+  }
+
   /**
    * Track advertisement impression
    */
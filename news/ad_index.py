@@ -0,0 +1,190 @@
+"""
+In-Memory Ad Serving Index
+
+Every page requests ads for its slots, and each request used to run a
+date-range query over Advertisement. The index keeps the serialized ads
+in memory instead, grouped by position:
+- Built from active ads whose end date has not passed, including ads that
+  start later; start/end dates are checked on each lookup, so ads come and
+  go at their boundaries without a rebuild
+- Rebuilt after an ad is saved or deleted in this process (Advertisement.save
+  and delete) and, to pick up changes made by other processes or bulk
+  updates, once it is AD_INDEX_TTL seconds old
+- pick() fills slots by weighted random choice (Advertisement.weight) or
+  round-robin (AD_ROTATION), never repeats an ad within one request and
+  skips ads a visitor has reached the frequency cap of
+
+Frequency caps are counted per visitor and day in the ad_freq cookie (see
+read_views/write_views), so serving an ad needs no database access.
+"""
+
+import logging
+import random
+import threading
+import time
+from collections import defaultdict
+from itertools import count
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Advertisement
+from .serializers import AdvertisementSerializer
+
+logger = logging.getLogger(__name__)
+
+ROTATION_WEIGHTED = 'weighted'
+ROTATION_ROUND_ROBIN = 'round_robin'
+
+VIEWS_COOKIE = 'ad_freq'
+VIEWS_COOKIE_MAX_AGE = 24 * 60 * 60
+
+
+class AdIndex:
+    """
+    Snapshot of the servable ads.
+
+    Usage:
+        index = ad_index()
+        ads = index.pick(['sidebar', 'inline', 'inline'], views)
+    """
+
+    def __init__(self, ads):
+        self.built_at = time.monotonic()
+        self.by_id = {}
+        self.by_position = defaultdict(list)
+        self._turns = defaultdict(count)
+        for ad in ads:  # Ordered by order, -created_at
+            entry = {
+                'id': ad.pk,
+                'position': ad.position,
+                'start_date': ad.start_date,
+                'end_date': ad.end_date,
+                'weight': ad.weight,
+                'frequency_cap': ad.frequency_cap,
+                'link_url': ad.link_url,
+                'data': AdvertisementSerializer(ad).data,
+            }
+            self.by_id[ad.pk] = entry
+            self.by_position[ad.position].append(entry)
+
+    @classmethod
+    def build(cls):
+        ads = Advertisement.objects.filter(is_active=True).filter(
+            Q(end_date__isnull=True) | Q(end_date__gte=timezone.now())
+        ).order_by('order', '-created_at')
+        index = cls(ads)
+        logger.info(f"Built ad index: {len(index.by_id)} ads")
+        return index
+
+    @staticmethod
+    def _live(entry, now):
+        return entry['start_date'] <= now and (entry['end_date'] is None or entry['end_date'] >= now)
+
+    def get(self, ad_id):
+        """Entry of a live ad, or None"""
+        entry = self.by_id.get(ad_id)
+        return entry if entry and self._live(entry, timezone.now()) else None
+
+    def active(self, position=None):
+        """
+        Live ads in display order.
+
+        Args:
+            position (str): Only ads for this position (all positions when None)
+
+        Returns:
+            list: Index entries
+        """
+        now = timezone.now()
+        entries = self.by_id.values() if position is None else self.by_position.get(position, [])
+        return [entry for entry in entries if self._live(entry, now)]
+
+    def _choose(self, position, candidates):
+        if settings.AD_ROTATION == ROTATION_ROUND_ROBIN:
+            return candidates[next(self._turns[position]) % len(candidates)]
+        return random.choices(candidates, weights=[entry['weight'] for entry in candidates])[0]
+
+    def pick(self, positions, views=None):
+        """
+        One ad per slot.
+
+        Args:
+            positions (list): Position of each slot; a position may repeat
+            views (dict): Ad ID -> times this visitor saw it today; updated
+                with the ads picked
+
+        Returns:
+            list: Entry or None for each slot, in slot order
+        """
+        views = {} if views is None else views
+        picked = []
+        served = set()
+        for position in positions:
+            candidates = [
+                entry for entry in self.active(position)
+                if entry['id'] not in served and entry['weight'] > 0 and not (
+                    entry['frequency_cap'] and views.get(entry['id'], 0) >= entry['frequency_cap']
+                )
+            ]
+            entry = self._choose(position, candidates) if candidates else None
+            if entry:
+                served.add(entry['id'])
+                views[entry['id']] = views.get(entry['id'], 0) + 1
+            picked.append(entry)
+        return picked
+
+
+_index = None
+_lock = threading.Lock()
+
+
+def ad_index():
+    """The current index, rebuilt when invalidated or older than AD_INDEX_TTL"""
+    global _index
+    index = _index
+    if index is None or time.monotonic() - index.built_at >= settings.AD_INDEX_TTL:
+        with _lock:
+            if _index is index:
+                _index = AdIndex.build()
+            index = _index
+    return index
+
+
+def invalidate():
+    """Drop the index; the next lookup rebuilds it"""
+    global _index
+    _index = None
+
+
+# ============================================================================
+# Frequency cap cookie: "<date>|<ad id>.<views>-<ad id>.<views>"
+# ============================================================================
+
+def read_views(request):
+    """Ad ID -> times the visitor saw it today, from the ad_freq cookie"""
+    day, _, counts = request.COOKIES.get(VIEWS_COOKIE, '').partition('|')
+    if day != timezone.localdate().isoformat():
+        return {}
+    views = {}
+    for item in counts.split('-'):
+        ad_id, _, seen = item.partition('.')
+        if ad_id.isdigit() and seen.isdigit():
+            views[int(ad_id)] = int(seen)
+    return views
+
+
+def write_views(response, views, index):
+    """Store the visitor's views of frequency-capped ads on the response"""
+    capped = {
+        ad_id: seen for ad_id, seen in views.items()
+        if ad_id in index.by_id and index.by_id[ad_id]['frequency_cap']
+    }
+    if not capped:
+        return
+    counts = '-'.join(f"{ad_id}.{seen}" for ad_id, seen in sorted(capped.items()))
+    response.set_cookie(
+        VIEWS_COOKIE, f"{timezone.localdate().isoformat()}|{counts}",
+        max_age=VIEWS_COOKIE_MAX_AGE, samesite='Lax',
+    )
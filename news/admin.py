@@ -1,6 +1,8 @@
 from django.contrib import admin
+from django.db import transaction
 from .models import News, TeamMember, Comment, ShareCount, JobOpening, JobApplication, LegalPage
 from .ai_models import KeywordSource, AIArticle, AIGenerationConfig, AIWorkflowLog
+from .response_cache import LEGAL_TAG, TEAM_TAG, author_tag, invalidate
 from django.utils.html import format_html
 
 @admin.register(News)
@@ -71,11 +73,13 @@ class TeamMemberAdmin(admin.ModelAdmin):
     
     def activate_members(self, request, queryset):
         updated = queryset.update(is_active=True)
+        invalidate(TEAM_TAG, *[author_tag(pk) for pk in queryset.values_list('pk', flat=True)])
         self.message_user(request, f'{updated} team member(s) activated successfully.')
     activate_members.short_description = "Activate selected team members"
     
     def deactivate_members(self, request, queryset):
         updated = queryset.update(is_active=False)
+        invalidate(TEAM_TAG, *[author_tag(pk) for pk in queryset.values_list('pk', flat=True)])
         self.message_user(request, f'{updated} team member(s) deactivated successfully.')
     deactivate_members.short_description = "Deactivate selected team members"
 
@@ -96,14 +100,20 @@ class CommentAdmin(admin.ModelAdmin):
     actions = ['approve_comments', 'unapprove_comments']
     
     def approve_comments(self, request, queryset):
-        updated = queryset.update(is_approved=True)
+        updated = Comment.set_approval(queryset, True)
         self.message_user(request, f'{updated} comment(s) approved successfully.')
     approve_comments.short_description = "Approve selected comments"
     
     def unapprove_comments(self, request, queryset):
-        updated = queryset.update(is_approved=False)
+        updated = Comment.set_approval(queryset, False)
         self.message_user(request, f'{updated} comment(s) unapproved successfully.')
     unapprove_comments.short_description = "Unapprove selected comments"
+    
+    def delete_queryset(self, request, queryset):
+        # Unapprove first so the articles' approved_comment_count drops
+        with transaction.atomic():
+            Comment.set_approval(queryset, False)
+            queryset.delete()
 
 
 @admin.register(ShareCount)
@@ -219,16 +229,19 @@ class LegalPageAdmin(admin.ModelAdmin):
     
     def publish_pages(self, request, queryset):
         updated = queryset.update(status='published')
+        invalidate(LEGAL_TAG)
         self.message_user(request, f'{updated} page(s) published successfully.')
     publish_pages.short_description = "Publish selected pages"
     
     def unpublish_pages(self, request, queryset):
         updated = queryset.update(status='draft')
+        invalidate(LEGAL_TAG)
         self.message_user(request, f'{updated} page(s) unpublished successfully.')
     unpublish_pages.short_description = "Unpublish selected pages"
     
     def archive_pages(self, request, queryset):
         updated = queryset.update(status='archived')
+        invalidate(LEGAL_TAG)
         self.message_user(request, f'{updated} page(s) archived successfully.')
     archive_pages.short_description = "Archive selected pages"
 
@@ -9,6 +9,7 @@ from django.http import HttpResponse
 from datetime import timedelta
 import csv
 from .models import News, TeamMember, Comment, ShareCount, Subscriber
+from .search import search_backend
 from django.contrib.auth.models import User
 
 
@@ -100,10 +101,8 @@ def admin_dashboard(request):
     
     # Top shared articles
     top_shared = []
-    for news in News.objects.all()[:10]:
-        total_shares = ShareCount.objects.filter(news=news).aggregate(
-            total=Count('id')
-        )['total'] or 0
+    for news in News.objects.filter(share_total__gt=0).order_by('-share_total')[:5]:
+        total_shares = news.share_total
         if total_shares > 0:
             top_shared.append({'news': news, 'shares': total_shares})
     top_shared.sort(key=lambda x: x['shares'], reverse=True)
@@ -136,9 +135,7 @@ def admin_news_list(request):
         news_list = news_list.filter(category=category)
     
     if search:
-        news_list = news_list.filter(
-            Q(title__icontains=search) | Q(content__icontains=search)
-        )
+        news_list = search_backend().search(news_list, search)
     
     context = {
         'news_list': news_list,
@@ -367,8 +364,7 @@ def admin_comments_list(request):
 def admin_comment_approve(request, pk):
     """Approve a comment"""
     comment = get_object_or_404(Comment, pk=pk)
-    comment.is_approved = True
-    comment.save()
+    comment.set_approved(True)
     messages.success(request, 'Comment approved successfully!')
     return redirect('custom_admin:comments_list')
 
@@ -376,8 +372,7 @@ def admin_comment_approve(request, pk):
 def admin_comment_unapprove(request, pk):
     """Unapprove a comment"""
     comment = get_object_or_404(Comment, pk=pk)
-    comment.is_approved = False
-    comment.save()
+    comment.set_approved(False)
     messages.success(request, 'Comment unapproved successfully!')
     return redirect('custom_admin:comments_list')
 
@@ -441,8 +436,8 @@ def admin_reports(request):
     
     # Most commented articles
     most_commented = []
-    for news in News.objects.all():
-        comment_count = Comment.objects.filter(news=news, is_approved=True).count()
+    for news in News.objects.filter(approved_comment_count__gt=0).order_by('-approved_comment_count')[:5]:
+        comment_count = news.approved_comment_count
         if comment_count > 0:
             most_commented.append({
                 'news': news,
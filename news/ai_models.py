@@ -41,6 +41,7 @@ class KeywordSource(models.Model):
         NEWS_API = 'news_api', 'News API'
         TWITTER_TRENDS = 'twitter_trends', 'Twitter Trends'
         INTERNAL = 'internal', 'Internal Analytics'
+        SCRAPED_TRENDS = 'scraped_trends', 'Trending in Scraped News'
     
     # Primary Fields
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -375,6 +376,9 @@ class AIArticle(models.Model):
             models.Index(fields=['status', '-created_at']),
             models.Index(fields=['workflow_stage', 'status']),
             models.Index(fields=['keyword', 'status']),
+            # Keyset pages of the generation and review queues
+            models.Index(fields=['status', 'created_at', 'id']),
+            models.Index(fields=['status', 'generation_completed_at', 'id']),
         ]
     
     def __str__(self):
@@ -809,6 +813,17 @@ class NewsSourceConfig(models.Model):
         help_text="How often to scrape (in hours)"
     )
     
+    # Adaptive scheduling (see scraping_scheduler)
+    next_scrape_at = models.DateTimeField(null=True, blank=True, db_index=True)
+    adaptive_interval_minutes = models.FloatField(
+        null=True, blank=True,
+        help_text="Current polling interval, adapted to the new-article rate"
+    )
+    new_article_rate = models.FloatField(
+        default=0,
+        help_text="Smoothed new articles per hour"
+    )
+    
     status = models.CharField(
         max_length=20,
         choices=Status.choices,
@@ -868,7 +883,7 @@ class ScrapedArticle(models.Model):
     summary = models.TextField(blank=True)
     
     # Source Information
-    source_url = models.URLField(max_length=1000)
+    source_url = models.URLField(max_length=1000, unique=True)
     source_website = models.CharField(max_length=255)
     author = models.CharField(max_length=255, blank=True)
     published_date = models.DateTimeField(null=True, blank=True)
@@ -878,6 +893,10 @@ class ScrapedArticle(models.Model):
         default=list,
         help_text="Keywords that matched this article"
     )
+    relevance_score = models.FloatField(
+        default=0,
+        help_text="Keyword relevance (title hits weighted higher)"
+    )
     image_urls = models.JSONField(
         default=list,
         help_text="Image URLs found in article"
@@ -917,6 +936,34 @@ class ScrapedArticle(models.Model):
         related_name='source_scraped_article'
     )
     
+    # Near-duplicate clustering (see scraping_dedup)
+    content_signature = models.BinaryField(
+        null=True, blank=True,
+        editable=False,
+        help_text="MinHash signature of the title and content"
+    )
+    duplicate_of = models.ForeignKey(
+        'self',
+        on_delete=models.SET_NULL,
+        null=True, blank=True,
+        related_name='duplicates',
+        help_text="First article of this story's cluster; empty for cluster representatives"
+    )
+    trend_indexed = models.BooleanField(
+        default=False,
+        db_index=True,
+        help_text="Terms counted by the trending keyword extractor"
+    )
+    images_verified = models.BooleanField(
+        default=False,
+        db_index=True,
+        help_text="image_urls checked and reduced to the best images (see scraping_images)"
+    )
+    images_claimed_at = models.DateTimeField(
+        null=True, blank=True,
+        help_text="When an image verification run claimed the article; the claim lapses after CELERY_TASK_TIME_LIMIT"
+    )
+    
     # Timestamps
     scraped_at = models.DateTimeField(auto_now_add=True, db_index=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -929,6 +976,7 @@ class ScrapedArticle(models.Model):
             models.Index(fields=['status', '-scraped_at']),
             models.Index(fields=['category', 'status']),
             models.Index(fields=['source_config', '-scraped_at']),
+            models.Index(fields=['status', '-relevance_score']),
         ]
     
     def __str__(self):
@@ -948,4 +996,274 @@ class ScrapedArticle(models.Model):
         self.reviewed_at = timezone.now()
         self.rejection_reason = reason
         self.save(update_fields=['status', 'reviewed_by', 'reviewed_at', 'rejection_reason', 'updated_at'])
+    
+    @property
+    def cluster_id(self):
+        """ID of the cluster representative (this article if it is one)"""
+        return self.duplicate_of_id or self.id
+    
+    def cluster_members(self):
+        """Other articles in this article's near-duplicate cluster"""
+        return ScrapedArticle.objects.filter(
+            models.Q(id=self.cluster_id) | models.Q(duplicate_of_id=self.cluster_id)
+        ).exclude(id=self.id)
+    
+    def approved_duplicate(self):
+        """A cluster member already approved or generated, if any"""
+        return self.cluster_members().filter(
+            status__in=[self.Status.APPROVED, self.Status.GENERATED]
+        ).select_related('ai_article').first()
+    
+    def merge_duplicates(self, user):
+        """
+        Fold pending cluster members into this article: their URLs become
+        reference URLs here and they are rejected as duplicates.
+        
+        Returns:
+            int: Number of duplicates merged
+        """
+        pending = self.cluster_members().filter(status=self.Status.PENDING)
+        urls = list(pending.values_list('source_url', flat=True))
+        if not urls:
+            return 0
+        self.reference_urls = list(dict.fromkeys(list(self.reference_urls or []) + urls))
+        self.save(update_fields=['reference_urls', 'updated_at'])
+        now = timezone.now()
+        return pending.update(
+            status=self.Status.REJECTED,
+            reviewed_by=user,
+            reviewed_at=now,
+            rejection_reason=f"Duplicate of {self.title[:200]} ({self.id})",
+            updated_at=now,
+        )
+
+
+# ============================================================================
+# Near-Duplicate Index Model
+# ============================================================================
+
+class MinHashBucket(models.Model):
+    """
+    One LSH band hash of a scraped article's MinHash signature.
+    Articles sharing a bucket are near-duplicate candidates.
+    """
+    
+    article = models.ForeignKey(
+        ScrapedArticle,
+        on_delete=models.CASCADE,
+        related_name='minhash_buckets'
+    )
+    bucket = models.BigIntegerField(db_index=True)
+    
+    class Meta:
+        verbose_name = 'MinHash Bucket'
+        verbose_name_plural = 'MinHash Buckets'
+    
+    def __str__(self):
+        return f"{self.bucket} ({self.article_id})"
+
+
+# ============================================================================
+# Trending Term Model
+# ============================================================================
+
+class TermBucket(models.Model):
+    """
+    Number of scraped articles mentioning a term within one time bucket.
+    Maintained incrementally by the trending keyword extractor.
+    """
+    
+    term = models.CharField(max_length=100)
+    bucket_start = models.DateTimeField()
+    count = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        verbose_name = 'Term Bucket'
+        verbose_name_plural = 'Term Buckets'
+        unique_together = ['term', 'bucket_start']
+        indexes = [
+            models.Index(fields=['bucket_start', 'term']),
+        ]
+    
+    def __str__(self):
+        return f"{self.term} @ {self.bucket_start:%Y-%m-%d %H:%M}: {self.count}"
+
+
+# ============================================================================
+# Scraped Image Model
+# ============================================================================
+
+class ScrapedImage(models.Model):
+    """
+    Probe result for one image URL found on scraped articles.
+    Shared by every article listing the URL, so each image is fetched once.
+    """
+    
+    class Status(models.TextChoices):
+        VALID = 'valid', 'Valid'
+        REJECTED = 'rejected', 'Rejected'
+        FAILED = 'failed', 'Failed'
+    
+    url = models.URLField(max_length=1000, unique=True)
+    status = models.CharField(max_length=20, choices=Status.choices)
+    reason = models.CharField(max_length=255, blank=True, help_text="Why the image was rejected or failed")
+    content_type = models.CharField(max_length=50, blank=True)
+    width = models.PositiveIntegerField(default=0)
+    height = models.PositiveIntegerField(default=0)
+    size_bytes = models.PositiveIntegerField(default=0)
+    phash = models.BigIntegerField(
+        null=True, blank=True,
+        db_index=True,
+        help_text="64-bit difference hash; equal for copies of the same picture"
+    )
+    checked_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = 'Scraped Image'
+        verbose_name_plural = 'Scraped Images'
+    
+    def __str__(self):
+        return f"{self.url} ({self.get_status_display()})"
 
+
+# ============================================================================
+# Scrape Frontier Model
+# ============================================================================
+
+class SeenURL(models.Model):
+    """
+    Article URLs already fetched for a news source configuration.
+    Consulted before fetching so repeat scrapes skip known articles,
+    including ones that were downloaded but did not match any keyword.
+    """
+    
+    source_config = models.ForeignKey(
+        NewsSourceConfig,
+        on_delete=models.CASCADE,
+        related_name='seen_urls'
+    )
+    url_hash = models.CharField(
+        max_length=40,
+        help_text="SHA-1 of the normalized article URL"
+    )
+    first_seen_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        verbose_name = 'Seen URL'
+        verbose_name_plural = 'Seen URLs'
+        unique_together = ['source_config', 'url_hash']
+    
+    def __str__(self):
+        return f"{self.url_hash} ({self.source_config_id})"
+
+
+# ============================================================================
+# Scrape Job Model
+# ============================================================================
+
+class ScrapeJob(models.Model):
+    """
+    A background scrape of one news source configuration.
+    Tracks progress so the admin can poll instead of waiting on the request.
+    """
+    
+    class Status(models.TextChoices):
+        QUEUED = 'queued', 'Queued'
+        RUNNING = 'running', 'Running'
+        COMPLETED = 'completed', 'Completed'
+        FAILED = 'failed', 'Failed'
+    
+    ACTIVE_STATUSES = [Status.QUEUED, Status.RUNNING]
+    
+    # Primary Fields
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    source_config = models.ForeignKey(
+        NewsSourceConfig,
+        on_delete=models.CASCADE,
+        related_name='scrape_jobs'
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=Status.choices,
+        default=Status.QUEUED
+    )
+    celery_task_id = models.CharField(max_length=255, blank=True)
+    
+    # Progress
+    sites_total = models.IntegerField(default=0)
+    sites_done = models.IntegerField(default=0)
+    articles_found = models.IntegerField(default=0)
+    articles_saved = models.IntegerField(default=0)
+    duplicates = models.IntegerField(default=0)
+    
+    # Error Info
+    error_message = models.TextField(blank=True)
+    
+    # Metadata
+    created_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True, blank=True,
+        related_name='scrape_jobs'
+    )
+    
+    # Timestamps
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = 'Scrape Job'
+        verbose_name_plural = 'Scrape Jobs'
+        indexes = [
+            models.Index(fields=['source_config', '-created_at']),
+        ]
+        constraints = [
+            # Only one queued or running scrape per configuration
+            models.UniqueConstraint(
+                fields=['source_config'],
+                condition=models.Q(status__in=['queued', 'running']),
+                name='one_active_scrape_per_config',
+            ),
+        ]
+    
+    def __str__(self):
+        return f"{self.source_config.name} - {self.get_status_display()}"
+    
+    @property
+    def is_active(self):
+        return self.status in self.ACTIVE_STATUSES
+    
+    def mark_running(self, celery_task_id=''):
+        """Mark this job as started."""
+        self.status = self.Status.RUNNING
+        self.started_at = timezone.now()
+        if celery_task_id:
+            self.celery_task_id = celery_task_id
+        self.save(update_fields=['status', 'started_at', 'celery_task_id', 'updated_at'])
+    
+    def update_progress(self, **counts):
+        """Store progress counters without touching other fields."""
+        for field, value in counts.items():
+            setattr(self, field, value)
+        self.save(update_fields=list(counts) + ['updated_at'])
+    
+    def mark_completed(self, result):
+        """Mark this job as completed with final ingestion counts."""
+        self.status = self.Status.COMPLETED
+        self.articles_saved = result['created']
+        self.duplicates = result['duplicates']
+        self.articles_found = result['total']
+        self.completed_at = timezone.now()
+        self.save(update_fields=[
+            'status', 'articles_saved', 'duplicates', 'articles_found', 'completed_at', 'updated_at'
+        ])
+    
+    def mark_failed(self, error_message):
+        """Mark this job as failed."""
+        self.status = self.Status.FAILED
+        self.error_message = error_message
+        self.completed_at = timezone.now()
+        self.save(update_fields=['status', 'error_message', 'completed_at', 'updated_at'])
@@ -2,9 +2,337 @@
 Keyword Scraper Tool
 
 Task 3.1: Keyword Scraper Implementation
-- KeywordScraperTool class
-- Google Trends API integration
-- Manual keyword entry support
-- Trending topics detector (NewsAPI)
-- analyze_keyword() method (viability scoring)
+- TrendingKeywordExtractor class: trending topics detected in the
+  ScrapedArticle corpus, without an LLM call per candidate
+- Candidate terms per article: named entities (capitalized phrases) and
+  2-3 word phrases repeated in the article or shared by title and text
+- Rolling per-hour document counts (TermBucket), updated incrementally: each
+  tick only reads articles not yet indexed, so cost is O(new documents)
+- Burst score: Poisson z-score of the recent window's count against the
+  rate expected from the baseline window
+- propose_candidates() bulk-creates pending KeywordSource rows
 """
+
+import logging
+import math
+import re
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Sum
+from django.db.models.functions import Lower
+from django.utils import timezone
+
+from news.models import KeywordSource, ScrapedArticle, TermBucket
+
+logger = logging.getLogger(__name__)
+
+STOP_WORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been before being
+below between both but by can could did do does doing down during each few for from further had
+has have having he her here hers him his how i if in into is it its itself just me more most my
+new no nor not now of off on once only or other our out over own said same says she should so
+some such than that the their them then there these they this those through to too under until
+up us very was we were what when where which while who whom why will with would year years you
+your mr mrs ms one two three first last according told
+""".split())
+
+SENTENCE_SPLIT_RE = re.compile(r'[.!?;:\n—()"“”]+')
+WORD_RE = re.compile(r"[A-Za-z][A-Za-z0-9'&-]*")
+ENTITY_RE = re.compile(
+    r"\b(?:[A-Z][a-z]+|[A-Z]{2,})(?:[ -](?:of |de |al-)?(?:[A-Z][a-z]+|[A-Z]{2,})){0,3}\b"
+)
+
+MAX_TERM_LENGTH = 100
+MAX_TERMS_PER_ARTICLE = 50
+# Only the start of each article is read; trending terms appear early
+MAX_TEXT_CHARS = 6000
+
+
+def bucket_start(moment):
+    """Start of the hour-long bucket containing moment"""
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+def _phrases(text, max_words=3):
+    """Lowercase 2..max_words word phrases that do not cross sentences or start/end on a stop word"""
+    for sentence in SENTENCE_SPLIT_RE.split(text):
+        words = [word.lower().strip("'-") for word in WORD_RE.findall(sentence)]
+        for size in range(2, max_words + 1):
+            for i in range(len(words) - size + 1):
+                gram = words[i:i + size]
+                if gram[0] in STOP_WORDS or gram[-1] in STOP_WORDS or len(gram[0]) < 3 or len(gram[-1]) < 3:
+                    continue
+                yield ' '.join(gram)
+
+
+def _entities(text):
+    """Lowercase capitalized phrases; single words only when not opening a sentence"""
+    for sentence in SENTENCE_SPLIT_RE.split(text):
+        sentence = sentence.strip()
+        for match in ENTITY_RE.finditer(sentence):
+            entity = match.group()
+            words = entity.lower().split(' ')
+            while words and words[0] in STOP_WORDS:  # "The Federal Reserve"
+                words.pop(0)
+            if len(words) == 1 and match.start() == 0 and ' ' not in entity:
+                continue  # Sentence-initial capital, probably not a name
+            term = ' '.join(words)
+            if term in STOP_WORDS or len(term) < 3:
+                continue
+            yield term
+
+
+def article_terms(title, text):
+    """
+    Candidate trending terms for one article.
+
+    Args:
+        title (str): Article title
+        text (str): Summary and/or content
+
+    Returns:
+        set: Up to MAX_TERMS_PER_ARTICLE lowercase terms
+    """
+    text = text[:MAX_TEXT_CHARS]
+    counts = Counter(_entities(title))
+    counts.update(_entities(text))
+    title_phrases = set(_phrases(title))
+    phrase_counts = Counter(_phrases(text))
+
+    # A phrase has to recur: twice in the text, or in both title and text
+    for phrase, count in phrase_counts.items():
+        if phrase in title_phrases:
+            counts[phrase] += count + 2
+        elif count >= 2:
+            counts[phrase] += count
+
+    return {
+        term for term, _count in counts.most_common(MAX_TERMS_PER_ARTICLE)
+        if len(term) <= MAX_TERM_LENGTH
+    }
+
+
+class TrendingKeywordExtractor:
+    """
+    Incremental trending-term detector over scraped articles.
+
+    Usage:
+        extractor = TrendingKeywordExtractor()
+        extractor.index_new_articles()
+        created = extractor.propose_candidates()
+    """
+
+    def __init__(self, window_hours=None, baseline_days=None, min_articles=None,
+                 min_score=None, max_candidates=None):
+        """
+        Args:
+            window_hours (int): Recent window whose counts are tested for a burst
+            baseline_days (int): Preceding period the expected rate comes from;
+                older buckets are deleted
+            min_articles (int): Minimum articles mentioning a term in the window
+            min_score (float): Minimum burst z-score for a candidate
+            max_candidates (int): Maximum candidates proposed per run
+        """
+        self.window_hours = window_hours or settings.TRENDS_WINDOW_HOURS
+        self.baseline_days = baseline_days or settings.TRENDS_BASELINE_DAYS
+        self.min_articles = min_articles or settings.TRENDS_MIN_ARTICLES
+        self.min_score = settings.TRENDS_MIN_SCORE if min_score is None else min_score
+        self.max_candidates = max_candidates or settings.TRENDS_MAX_CANDIDATES
+
+    # ------------------------------------------------------------------
+    # Incremental counting
+    # ------------------------------------------------------------------
+
+    def index_new_articles(self, batch_size=500, max_articles=5000):
+        """
+        Add articles not yet indexed to the per-bucket term counts.
+
+        Args:
+            batch_size (int): Articles read and counted per transaction
+            max_articles (int): Upper bound for one run, so a large backlog is
+                worked off over several ticks
+
+        Returns:
+            int: Articles indexed
+        """
+        oldest = bucket_start(timezone.now() - timedelta(days=self.baseline_days))
+        indexed = 0
+        while indexed < max_articles:
+            with transaction.atomic():
+                batch = list(
+                    ScrapedArticle.objects
+                    .select_for_update(skip_locked=True)
+                    .filter(trend_indexed=False)
+                    .order_by('scraped_at')
+                    .values_list('pk', 'title', 'summary', 'content', 'scraped_at')[:batch_size]
+                )
+                if not batch:
+                    break
+
+                counts = Counter()
+                for _pk, title, summary, content, scraped_at in batch:
+                    start = bucket_start(scraped_at)
+                    if start < oldest:
+                        continue  # Too old to matter for the baseline
+                    for term in article_terms(title, summary or content):
+                        counts[(term, start)] += 1
+
+                self._add_counts(counts)
+                ScrapedArticle.objects.filter(pk__in=[row[0] for row in batch]).update(trend_indexed=True)
+                indexed += len(batch)
+
+        if indexed:
+            logger.info(f"Indexed {indexed} articles for trending terms")
+        return indexed
+
+    @staticmethod
+    def _add_counts(counts):
+        """
+        Increment TermBucket rows, creating missing ones.
+
+        Concurrent runs (or an overlapping tick) may touch the same rows, so
+        missing rows are inserted at 0 ignoring conflicts and counts are
+        added with F() updates rather than written back from a read.
+        """
+        if not counts:
+            return
+        TermBucket.objects.bulk_create(
+            [TermBucket(term=term, bucket_start=start) for term, start in counts],
+            ignore_conflicts=True,
+            batch_size=500,
+        )
+        row_ids = {
+            (term, start): pk
+            for pk, term, start in TermBucket.objects.filter(
+                bucket_start__in={start for _term, start in counts},
+                term__in={term for term, _start in counts},
+            ).values_list('pk', 'term', 'bucket_start')
+        }
+        # Most terms occur once per batch, so grouping by increment keeps UPDATEs few
+        by_increment = defaultdict(list)
+        for key, count in counts.items():
+            by_increment[count].append(row_ids[key])
+        for count, pks in by_increment.items():
+            for start in range(0, len(pks), 500):
+                TermBucket.objects.filter(pk__in=pks[start:start + 500]).update(count=F('count') + count)
+
+    def prune(self):
+        """Delete buckets older than the baseline period"""
+        oldest = bucket_start(timezone.now() - timedelta(days=self.baseline_days))
+        deleted, _ = TermBucket.objects.filter(bucket_start__lt=oldest).delete()
+        return deleted
+
+    # ------------------------------------------------------------------
+    # Burst detection
+    # ------------------------------------------------------------------
+
+    def trending_terms(self, now=None):
+        """
+        Terms whose recent article count is unusually high.
+
+        Returns:
+            list: Dicts with term, recent, expected and score, highest score first
+        """
+        now = now or timezone.now()
+        window_start = bucket_start(now) - timedelta(hours=self.window_hours - 1)
+        baseline_start = bucket_start(now - timedelta(days=self.baseline_days))
+        baseline_hours = max((window_start - baseline_start).total_seconds() / 3600, 1)
+
+        recent = dict(
+            TermBucket.objects.filter(bucket_start__gte=window_start)
+            .values('term').annotate(total=Sum('count'))
+            .filter(total__gte=self.min_articles)
+            .values_list('term', 'total')
+        )
+        if not recent:
+            return []
+
+        baseline = {}
+        terms = list(recent)
+        for start in range(0, len(terms), 500):
+            baseline.update(
+                TermBucket.objects.filter(
+                    term__in=terms[start:start + 500],
+                    bucket_start__gte=baseline_start,
+                    bucket_start__lt=window_start,
+                )
+                .values('term').annotate(total=Sum('count'))
+                .values_list('term', 'total')
+            )
+
+        trending = []
+        for term, count in recent.items():
+            expected = baseline.get(term, 0) / baseline_hours * self.window_hours
+            # Poisson z-score; +1 keeps never-seen terms from scoring infinitely
+            score = (count - expected) / math.sqrt(expected + 1)
+            if score >= self.min_score:
+                trending.append({
+                    'term': term,
+                    'recent': count,
+                    'expected': round(expected, 2),
+                    'score': round(score, 2),
+                })
+
+        trending.sort(key=lambda item: (-item['score'], -item['recent']))
+        return self._drop_overlaps(trending)
+
+    @staticmethod
+    def _drop_overlaps(trending):
+        """Keep the best-scoring of terms that contain one another ("rate cut" / "interest rate cut")"""
+        kept = []
+        for item in trending:
+            term = f" {item['term']} "
+            if any(term in f" {other['term']} " or f" {other['term']} " in term for other in kept):
+                continue
+            kept.append(item)
+        return kept
+
+    def propose_candidates(self):
+        """
+        Create pending KeywordSource rows for trending terms not already known.
+
+        Returns:
+            list: The KeywordSource candidates created
+        """
+        trending = self.trending_terms()
+        if not trending:
+            return []
+
+        known = set(
+            KeywordSource.objects.annotate(keyword_lower=Lower('keyword'))
+            .filter(keyword_lower__in=[item['term'] for item in trending])
+            .values_list('keyword_lower', flat=True)
+        )
+        candidates = [
+            KeywordSource(
+                keyword=item['term'],
+                source=KeywordSource.Source.SCRAPED_TRENDS,
+                status=KeywordSource.Status.PENDING,
+                category='',
+                viability_score=min(100, round(item['score'] * 10, 2)),
+                notes=(
+                    f"Trending in scraped news: {item['recent']} articles in the last "
+                    f"{self.window_hours}h vs {item['expected']} expected (burst score {item['score']})"
+                ),
+            )
+            for item in trending if item['term'] not in known
+        ][:self.max_candidates]
+
+        KeywordSource.objects.bulk_create(candidates, ignore_conflicts=True)
+        if candidates:
+            logger.info(f"Proposed {len(candidates)} trending keywords: {', '.join(c.keyword for c in candidates)}")
+        return candidates
+
+    def run(self):
+        """One tick: index new articles, prune old buckets, propose candidates"""
+        indexed = self.index_new_articles()
+        pruned = self.prune()
+        candidates = self.propose_candidates()
+        return {
+            'indexed': indexed,
+            'pruned': pruned,
+            'proposed': [candidate.keyword for candidate in candidates],
+        }
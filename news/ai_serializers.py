@@ -28,7 +28,7 @@ from django.contrib.auth import get_user_model
 from django.utils import timezone
 from .ai_models import (
     KeywordSource, AIArticle, AIGenerationConfig, AIWorkflowLog,
-    NewsSourceConfig, ScrapedArticle
+    NewsSourceConfig, ScrapedArticle, ScrapeJob
 )
 from .models import News
 
@@ -582,9 +582,13 @@ class NewsSourceConfigSerializer(serializers.ModelSerializer):
             'id', 'name', 'keywords', 'source_websites', 'category',
             'max_articles_per_scrape', 'scrape_frequency_hours', 'status',
             'notes', 'created_by', 'created_by_name', 'created_at', 
-            'updated_at', 'last_scraped_at'
+            'updated_at', 'last_scraped_at', 'next_scrape_at',
+            'adaptive_interval_minutes', 'new_article_rate'
+        ]
+        read_only_fields = [
+            'id', 'created_at', 'updated_at', 'last_scraped_at', 'created_by_name',
+            'next_scrape_at', 'adaptive_interval_minutes', 'new_article_rate'
         ]
-        read_only_fields = ['id', 'created_at', 'updated_at', 'last_scraped_at', 'created_by_name']
     
     def create(self, validated_data):
         # Set created_by from request user
@@ -603,24 +607,52 @@ class ScrapedArticleSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'source_config', 'source_config_name', 'title', 'content', 
             'summary', 'source_url', 'source_website', 'author', 'published_date',
-            'matched_keywords', 'image_urls', 'reference_urls', 'category', 'tags',
+            'matched_keywords', 'relevance_score', 'image_urls', 'reference_urls', 'category', 'tags',
             'status', 'reviewed_by', 'reviewed_by_name', 'reviewed_at', 
-            'rejection_reason', 'ai_article', 'ai_article_id', 'scraped_at', 'updated_at'
+            'rejection_reason', 'ai_article', 'ai_article_id', 'duplicate_of', 'images_verified',
+            'scraped_at', 'updated_at'
         ]
         read_only_fields = [
-            'id', 'source_config_name', 'reviewed_by', 'reviewed_by_name', 
-            'reviewed_at', 'ai_article', 'ai_article_id', 'scraped_at', 'updated_at'
+            'id', 'source_config_name', 'relevance_score', 'reviewed_by', 'reviewed_by_name', 
+            'reviewed_at', 'ai_article', 'ai_article_id', 'duplicate_of', 'images_verified',
+            'scraped_at', 'updated_at'
         ]
 
 
 class ScrapedArticleListSerializer(serializers.ModelSerializer):
     """Lightweight serializer for scraped article lists."""
     source_config_name = serializers.CharField(source='source_config.name', read_only=True)
+    duplicate_count = serializers.IntegerField(read_only=True, default=0)
     
     class Meta:
         model = ScrapedArticle
         fields = [
             'id', 'title', 'source_website', 'source_url', 'category',
-            'status', 'matched_keywords', 'source_config_name', 'scraped_at'
+            'status', 'matched_keywords', 'relevance_score', 'source_config_name',
+            'duplicate_of', 'duplicate_count', 'scraped_at'
+        ]
+        read_only_fields = fields
+
+
+class ScrapeJobSerializer(serializers.ModelSerializer):
+    """Serializer for background scrape job status."""
+    source_config_name = serializers.CharField(source='source_config.name', read_only=True)
+    progress = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = ScrapeJob
+        fields = [
+            'id', 'source_config', 'source_config_name', 'status', 'progress',
+            'sites_total', 'sites_done', 'articles_found', 'articles_saved',
+            'duplicates', 'error_message', 'created_at', 'started_at',
+            'completed_at', 'updated_at'
         ]
-        read_only_fields = fields
\ No newline at end of file
+        read_only_fields = fields
+    
+    def get_progress(self, obj):
+        """Percentage of source websites finished"""
+        if obj.status == ScrapeJob.Status.COMPLETED:
+            return 100
+        if not obj.sites_total:
+            return 0
+        return int(obj.sites_done * 100 / obj.sites_total)
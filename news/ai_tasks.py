@@ -7,6 +7,12 @@ Task 4.1: Celery Setup Implementation
 - @shared_task retry_failed_stage(ai_article_id, stage)
 - Task progress tracking
 - Error handling and retries
+- @shared_task scrape_news_source(job_id) + enqueue_scrape_job(job)
+- @shared_task schedule_news_scrapes() (Celery beat tick)
+- @shared_task verify_scraped_images() (Celery beat tick)
+- @shared_task discover_trending_keywords() (Celery beat tick)
+- @shared_task flush_counters() (Celery beat tick)
+- @shared_task index_related_article(news_id) + enqueue_related_index(news_id)
 """
 
 import logging
@@ -231,3 +237,172 @@ def batch_generate_articles(keyword_ids: list) -> Dict[str, Any]:
     except Exception as exc:
         logger.error(f"Batch generation failed: {exc}")
         raise
+
+
+@shared_task(bind=True)
+def scrape_news_source(self, job_id: str) -> Dict[str, Any]:
+    """
+    Run a tracked scrape for a news source configuration.
+    
+    Progress is written to the ScrapeJob while the crawl runs.
+    
+    Args:
+        job_id: UUID of the ScrapeJob to run
+        
+    Returns:
+        Dictionary with ingestion counts
+    """
+    from news.ai_models import ScrapeJob
+    from news.scraping_ingest import run_scrape
+    
+    job = ScrapeJob.objects.select_related('source_config').get(id=job_id)
+    job.mark_running(celery_task_id=self.request.id or '')
+    logger.info(f"Starting scrape job {job_id} for {job.source_config.name}")
+    
+    try:
+        result = run_scrape(job.source_config, job=job)
+    except Exception as exc:
+        logger.error(f"Scrape job {job_id} failed: {exc}", exc_info=True)
+        job.mark_failed(str(exc))
+        raise
+    
+    job.mark_completed(result)
+    logger.info(f"Scrape job {job_id} completed: {result['created']} new articles")
+    return result
+
+
+def _probe_broker():
+    """Connect to the broker once without backoff, so a missing broker fails fast"""
+    from news.celery import app
+    
+    with app.connection_for_write() as conn:
+        conn.ensure_connection(max_retries=1, interval_start=0, interval_step=0, timeout=2)
+
+
+def enqueue_scrape_job(job) -> str:
+    """
+    Queue a ScrapeJob on Celery, or run it on a background thread when no
+    broker is reachable (e.g. local development without Celery).
+    
+    Returns:
+        'celery' or 'thread'
+    """
+    try:
+        _probe_broker()
+        scrape_news_source.apply_async(args=[str(job.id)], retry=False)
+        return 'celery'
+    except Exception as exc:
+        logger.warning(f"Celery unavailable ({exc}); running scrape job {job.id} in a thread")
+    
+    import threading
+    from django.db import connection
+    
+    def run_job():
+        try:
+            scrape_news_source(str(job.id))
+        except Exception:
+            pass  # Already logged and recorded on the job
+        finally:
+            connection.close()
+    
+    thread = threading.Thread(target=run_job, daemon=True)
+    thread.start()
+    return 'thread'
+
+
+@shared_task
+def schedule_news_scrapes() -> Dict[str, Any]:
+    """
+    Celery beat tick: start scrapes for configs that are due.
+    
+    Returns:
+        Dictionary with the IDs of the jobs started
+    """
+    from news.scraping_scheduler import dispatch_due_scrapes
+    
+    job_ids = dispatch_due_scrapes()
+    return {'started': len(job_ids), 'job_ids': job_ids}
+
+
+@shared_task
+def verify_scraped_images() -> Dict[str, Any]:
+    """
+    Celery beat tick: probe the images of newly scraped articles and keep
+    only the best distinct ones.
+    
+    Returns:
+        Dictionary with the number of articles verified
+    """
+    from news.scraping_images import ImageVerifier
+    
+    return {'verified': ImageVerifier().run()}
+
+
+@shared_task
+def discover_trending_keywords() -> Dict[str, Any]:
+    """
+    Celery beat tick: count terms in newly scraped articles and propose
+    trending ones as pending keywords.
+    
+    Returns:
+        Dictionary with articles indexed, buckets pruned and keywords proposed
+    """
+    from news.ai_pipeline.tools.keyword_scraper import TrendingKeywordExtractor
+    
+    return TrendingKeywordExtractor().run()
+
+
+@shared_task
+def flush_counters() -> Dict[str, Any]:
+    """
+    Celery beat tick: write pending share and ad counter increments to the
+    database. Only sees the Redis store (COUNTER_REDIS_URL); in-process
+    stores are flushed by their own processes.
+    
+    Returns:
+        Dictionary of rows updated per counter
+    """
+    from news.counters import flush
+    
+    return flush()
+
+
+@shared_task
+def index_related_article(news_id: int) -> Dict[str, Any]:
+    """
+    Re-index one article's terms and update the related-article lists it
+    belongs to (queued by News.save).
+    
+    Returns:
+        Dictionary with the number of neighbours stored
+    """
+    from news.models import News
+    from news.related import index_article
+    
+    news = News.objects.filter(pk=news_id).first()
+    if news is None:
+        return {'neighbours': 0}  # Deleted since the save
+    return {'neighbours': index_article(news)}
+
+
+def enqueue_related_index(news_id: int) -> str:
+    """
+    Queue index_related_article, or run it in this process when the broker
+    cannot be reached. Errors are logged, never raised: the save that
+    triggered it has already committed.
+    
+    Returns:
+        'celery' or 'inline'
+    """
+    try:
+        _probe_broker()
+        index_related_article.apply_async(args=[news_id], retry=False)
+        return 'celery'
+    except Exception as exc:
+        logger.warning(f"Celery unavailable ({exc}); indexing related articles of {news_id} inline")
+    
+    try:
+        index_related_article(news_id)
+    except Exception as exc:
+        logger.error(f"Could not index related articles of {news_id}: {exc}")
+    return 'inline'
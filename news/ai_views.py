@@ -22,6 +22,7 @@ Task 1.3: API Views Implementation
 from django.utils import timezone
 from django.db.models import Q, Count, Avg
 from django.shortcuts import get_object_or_404
+from django.core.exceptions import ValidationError as DjangoValidationError
 from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
@@ -37,7 +38,8 @@ from .ai_models import (
     AIGenerationConfig,
     AIWorkflowLog,
     NewsSourceConfig,
-    ScrapedArticle
+    ScrapedArticle,
+    ScrapeJob
 )
 from .ai_serializers import (
     KeywordSourceSerializer,
@@ -49,8 +51,10 @@ from .ai_serializers import (
     AIWorkflowLogSerializer,
     NewsSourceConfigSerializer,
     ScrapedArticleSerializer,
-    ScrapedArticleListSerializer
+    ScrapedArticleListSerializer,
+    ScrapeJobSerializer
 )
+from .pagination import KeysetPagination, wants_cursor
 
 # Import Celery task (will be created in Phase 4)
 # from .ai_tasks import generate_article_pipeline, retry_failed_stage
@@ -697,18 +701,29 @@ class AIArticleViewSet(viewsets.ModelViewSet):
             'published_at': article.published_at.isoformat()
         })
     
+    def _cursor_page(self, articles, ordering):
+        """One keyset page of a queue, without counting the whole queue"""
+        paginator = KeysetPagination(ordering=ordering)
+        page = paginator.paginate_queryset(articles, self.request, view=self)
+        serializer = AIArticleListSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+    
     @action(detail=False, methods=['get'])
     def queue(self, request):
         """
         Get current generation queue.
         
         GET /api/ai-articles/queue/
+        GET /api/ai-articles/queue/?pagination=cursor - Keyset pages, oldest first
         Returns articles that are queued or currently generating.
         """
         articles = self.get_queryset().filter(
             status__in=[AIArticle.Status.QUEUED, AIArticle.Status.GENERATING]
         ).order_by('created_at')
         
+        if wants_cursor(request):
+            return self._cursor_page(articles, ('created_at', 'id'))
+        
         serializer = AIArticleListSerializer(articles, many=True)
         return Response({
             'count': articles.count(),
@@ -721,6 +736,7 @@ class AIArticleViewSet(viewsets.ModelViewSet):
         Get articles ready for review.
         
         GET /api/ai-articles/review_queue/
+        GET /api/ai-articles/review_queue/?pagination=cursor - Keyset pages, oldest first
         Returns completed articles awaiting human review.
         """
         articles = self.get_queryset().filter(
@@ -728,6 +744,9 @@ class AIArticleViewSet(viewsets.ModelViewSet):
             workflow_stage=AIArticle.WorkflowStage.COMPLETED
         ).order_by('generation_completed_at')
         
+        if wants_cursor(request):
+            return self._cursor_page(articles, ('generation_completed_at', 'id'))
+        
         serializer = AIArticleListSerializer(articles, many=True)
         return Response({
             'count': articles.count(),
@@ -922,55 +941,81 @@ class NewsSourceConfigViewSet(viewsets.ModelViewSet):
         """Set created_by to current user."""
         serializer.save(created_by=self.request.user)
     
+    def perform_update(self, serializer):
+        """Forget previously seen URLs when the keywords change."""
+        old_keywords = serializer.instance.keywords
+        config = serializer.save()
+        if config.keywords != old_keywords:
+            from .scraping_frontier import URLFrontier
+            URLFrontier(config).reset()
+    
     @action(detail=True, methods=['post'])
     def trigger_scrape(self, request, pk=None):
         """
-        Manually trigger scraping for this configuration.
+        Start a background scrape for this configuration.
         
         POST /api/news-sources/{id}/trigger_scrape/
+        
+        Returns 202 with the job; poll scrape_status for progress.
+        Returns 409 if a scrape is already queued or running.
         """
         config = self.get_object()
         
+        from django.db import IntegrityError, transaction
+        from .ai_tasks import enqueue_scrape_job
+        from .scraping_scheduler import reap_stale_jobs
+        
+        # A job from a dead worker must not block a new scrape
+        reap_stale_jobs(config.scrape_jobs.all())
+        
         try:
-            from .scraping_utils import scrape_articles_for_config
-            
-            # Scrape articles from configured websites
-            scraped_data = scrape_articles_for_config(config)
-            
-            # Create ScrapedArticle records
-            created_count = 0
-            for article_data in scraped_data:
-                try:
-                    # Check if article already exists (by URL)
-                    if not ScrapedArticle.objects.filter(source_url=article_data['source_url']).exists():
-                        ScrapedArticle.objects.create(
-                            source_config=config,
-                            **article_data
-                        )
-                        created_count += 1
-                except Exception as e:
-                    logger.error(f"Error saving article: {str(e)}")
-                    continue
-            
-            # Update last scraped timestamp
-            config.last_scraped_at = timezone.now()
-            config.save(update_fields=['last_scraped_at'])
-            
+            with transaction.atomic():
+                job = ScrapeJob.objects.create(source_config=config, created_by=request.user)
+        except IntegrityError:
+            active_job = config.scrape_jobs.filter(status__in=ScrapeJob.ACTIVE_STATUSES).first()
             return Response({
-                'detail': f'Scraping completed! Found and saved {created_count} new articles.',
+                'detail': 'A scrape is already running for this configuration.',
                 'config_id': str(config.id),
-                'config_name': config.name,
-                'articles_created': created_count,
-                'total_found': len(scraped_data)
-            })
-            
-        except Exception as e:
-            logger.error(f"Scraping error: {str(e)}")
-            return Response({
-                'detail': f'Scraping failed: {str(e)}',
-                'config_id': str(config.id),
-                'config_name': config.name
-            }, status=500)
+                'job': ScrapeJobSerializer(active_job).data if active_job else None
+            }, status=status.HTTP_409_CONFLICT)
+        
+        runner = enqueue_scrape_job(job)
+        logger.info(f"Scrape job {job.id} for {config.name} started via {runner}")
+        
+        return Response({
+            'detail': 'Scraping started.',
+            'config_id': str(config.id),
+            'config_name': config.name,
+            'job_id': str(job.id),
+            'job': ScrapeJobSerializer(job).data
+        }, status=status.HTTP_202_ACCEPTED)
+    
+    @action(detail=True, methods=['get'])
+    def scrape_status(self, request, pk=None):
+        """
+        Get progress of a scrape job for this configuration.
+        
+        GET /api/news-sources/{id}/scrape_status/?job_id={job_id}
+        Without job_id, returns the most recent job.
+        """
+        config = self.get_object()
+        jobs = config.scrape_jobs.all()
+        job_id = request.query_params.get('job_id')
+        try:
+            job = jobs.filter(id=job_id).first() if job_id else jobs.first()
+        except DjangoValidationError:
+            return Response(
+                {'detail': 'Invalid job_id.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        if job is None:
+            return Response(
+                {'detail': 'No scrape job found.'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        return Response(ScrapeJobSerializer(job).data)
 
 
 # ============================================================================
@@ -985,14 +1030,24 @@ class ScrapedArticleViewSet(viewsets.ModelViewSet):
     
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    filterset_fields = ['status', 'category', 'source_config']
+    filterset_fields = ['status', 'category', 'source_config', 'duplicate_of']
     search_fields = ['title', 'content', 'matched_keywords']
+    ordering_fields = ['scraped_at', 'published_date', 'relevance_score']
     ordering = ['-scraped_at']
     
     def get_queryset(self):
-        return ScrapedArticle.objects.select_related(
+        queryset = ScrapedArticle.objects.select_related(
             'source_config', 'reviewed_by', 'ai_article'
         ).all()
+        if self.action == 'list':
+            # One representative per near-duplicate cluster unless asked for
+            # every copy (?show_duplicates=true) or a cluster (?duplicate_of=)
+            queryset = queryset.annotate(duplicate_count=Count('duplicates'))
+            params = self.request.query_params
+            show_duplicates = params.get('show_duplicates', '').lower() in ('1', 'true', 'yes')
+            if not show_duplicates and 'duplicate_of' not in params:
+                queryset = queryset.filter(duplicate_of__isnull=True)
+        return queryset
     
     def get_serializer_class(self):
         if self.action == 'list':
@@ -1005,7 +1060,10 @@ class ScrapedArticleViewSet(viewsets.ModelViewSet):
         Approve scraped article and send to AI generation pipeline.
         
         POST /api/scraped-articles/{id}/approve/
-        Body: {"auto_generate": true}
+        Body: {"auto_generate": true, "force": false}
+        
+        Returns 409 if another copy of the same story was already approved,
+        unless force is set. Pending copies are merged into this article.
         """
         try:
             article = self.get_object()
@@ -1016,7 +1074,20 @@ class ScrapedArticleViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_400_BAD_REQUEST
                 )
             
+            duplicate = article.approved_duplicate()
+            if duplicate and not request.data.get('force', False):
+                return Response(
+                    {
+                        'detail': 'This story was already approved from another source.',
+                        'duplicate_of': str(duplicate.id),
+                        'duplicate_title': duplicate.title,
+                        'ai_article_id': str(duplicate.ai_article_id) if duplicate.ai_article_id else None,
+                    },
+                    status=status.HTTP_409_CONFLICT
+                )
+            
             article.approve(request.user)
+            merged = article.merge_duplicates(request.user)
             
             # Optionally auto-queue for generation
             auto_generate = request.data.get('auto_generate', True)
@@ -1053,10 +1124,11 @@ class ScrapedArticleViewSet(viewsets.ModelViewSet):
                 return Response({
                     'detail': 'Article approved and generation queued.',
                     'ai_article_id': str(ai_article.id),
-                    'scraped_article_id': str(article.id)
+                    'scraped_article_id': str(article.id),
+                    'merged_duplicates': merged
                 })
             
-            return Response({'detail': 'Article approved successfully.'})
+            return Response({'detail': 'Article approved successfully.', 'merged_duplicates': merged})
             
         except Exception as e:
             logger.error(f"Error approving article {pk}: {str(e)}", exc_info=True)
@@ -1111,11 +1183,18 @@ class ScrapedArticleViewSet(viewsets.ModelViewSet):
             
             approved_count = 0
             ai_article_ids = []
+            skipped_duplicates = []
             errors = []
             
             for article in articles:
                 try:
+                    # Only the first copy of a story is approved; the rest merge into it
+                    if article.approved_duplicate():
+                        skipped_duplicates.append(str(article.id))
+                        continue
+                    
                     article.approve(request.user)
+                    article.merge_duplicates(request.user)
                     approved_count += 1
                     
                     if auto_generate:
@@ -1154,7 +1233,8 @@ class ScrapedArticleViewSet(viewsets.ModelViewSet):
             response_data = {
                 'detail': f'Approved {approved_count} articles.',
                 'approved_count': approved_count,
-                'ai_article_ids': ai_article_ids if auto_generate else []
+                'ai_article_ids': ai_article_ids if auto_generate else [],
+                'skipped_duplicates': skipped_duplicates
             }
             
             if errors:
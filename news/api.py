@@ -4,11 +4,20 @@ from rest_framework.response import Response
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.parsers import MultiPartParser, FormParser
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Count, Q
+from django.conf import settings
+from django.db.models import Count, Max, Q, Sum
+from django.http import Http404
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 
+from .ad_index import ad_index, read_views, write_views
+from .conditional import ConditionalGetMixin, conditional_response
+from .counters import AD_COUNTER, increment
+from .fieldsets import FieldsetMixin, requested_names
 from .models import News, TeamMember, Comment, ShareCount, Subscriber, JobOpening, JobApplication, Advertisement
+from .pagination import KeysetPagination, wants_cursor
+from .response_cache import NEWS_TAG, TEAM_TAG, author_tag, cached, items_of, news_list_tags, news_tags
+from .search import FullTextSearchFilter, search_backend
 from .serializers import (
     NewsListSerializer, NewsDetailSerializer, NewsCreateUpdateSerializer,
     TeamMemberSerializer, CommentSerializer, CommentListSerializer,
@@ -24,18 +33,54 @@ class StandardResultsSetPagination(PageNumberPagination):
     max_page_size = 100
 
 
-class NewsViewSet(viewsets.ModelViewSet):
+# Article list items show comment/share counts and author details
+NEWS_VERSION_AGGREGATES = {
+    'comments': Sum('approved_comment_count'),
+    'shares': Sum('share_total'),
+    'authors_modified': Max('author__updated_at'),
+}
+
+
+def news_version_fields(fields):
+    """Version fields of articles: counters, and the author's profile when authors are shown"""
+    if fields is None or 'author' in fields:
+        return ('approved_comment_count', 'share_total', 'author.updated_at')
+    return ('approved_comment_count', 'share_total')
+
+
+class NewsViewSet(FieldsetMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """
     ViewSet for News model
     Provides CRUD operations and custom actions for news articles
+    List, detail and by_category answer 304 when the client's copy is current,
+    are served from the response cache (news.response_cache) and accept
+    ?fields= and ?expand= (news.fieldsets)
     """
-    queryset = News.objects.filter(visibility='public').select_related('author').prefetch_related('comments', 'shares')
+    queryset = News.objects.filter(visibility='public')
     pagination_class = StandardResultsSetPagination
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, FullTextSearchFilter]
     filterset_fields = ['category', 'author']
-    search_fields = ['title', 'content', 'excerpt', 'tags']
-    ordering_fields = ['created_at', 'updated_at', 'title']
+    search_fields = ['title', 'content', 'excerpt', 'tags']  # Indexed by news.search
+    ordering_fields = ['created_at', 'updated_at', 'title', 'approved_comment_count', 'share_total']
     ordering = ['-created_at']
+    version_aggregates = NEWS_VERSION_AGGREGATES
+    
+    @property
+    def version_fields(self):
+        return news_version_fields(self.fieldset()['fields'])
+    
+    @property
+    def paginator(self):
+        """Page numbers, or keyset pagination with ?pagination=cursor"""
+        if not hasattr(self, '_paginator'):
+            self._paginator = KeysetPagination() if wants_cursor(self.request) else self.pagination_class()
+        return self._paginator
+    
+    def get_cache_tags(self, request, data):
+        """Response cache tags: the articles shown and, for lists, their scope"""
+        if self.action == 'retrieve':
+            return news_tags([data])
+        return news_list_tags(request.query_params) | news_tags(items_of(data))
     
     def get_serializer_class(self):
         """Return appropriate serializer based on action"""
@@ -56,36 +101,41 @@ class NewsViewSet(viewsets.ModelViewSet):
         if category:
             queryset = queryset.filter(category=category)
         
-        return queryset
+        if self.action in ('list', 'by_category'):
+            return self.optimize_queryset(queryset, NewsListSerializer)
+        return queryset.with_counts()
     
+    @cached
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+    
+    @cached
     def retrieve(self, request, *args, **kwargs):
         """Override retrieve to accept slug instead of pk"""
-        # Try to get by slug first
         slug = kwargs.get('pk')
-        try:
-            # Use filter().first() to handle duplicate slugs - get most recent
-            instance = News.objects.filter(
-                visibility='public',
-                slug=slug
-            ).select_related('author').prefetch_related('comments', 'shares').order_by('-created_at').first()
-            
-            if not instance:
-                raise News.DoesNotExist
-                
-        except News.DoesNotExist:
-            # If not found by slug, try by pk
-            try:
-                instance = News.objects.filter(visibility='public').select_related('author').prefetch_related('comments', 'shares').get(pk=slug)
-            except (News.DoesNotExist, ValueError):
-                return Response(
-                    {'error': 'News article not found'},
-                    status=status.HTTP_404_NOT_FOUND
-                )
+        public = News.objects.filter(visibility='public')
+        version_fields = ('pk', 'updated_at', 'approved_comment_count', 'share_total', 'author__updated_at')
+        
+        # Try to get by slug first (most recent on duplicate slugs), then by pk
+        version = public.filter(slug=slug).order_by('-created_at').values(*version_fields).first()
+        if version is None and slug.isdigit():
+            version = public.filter(pk=slug).values(*version_fields).first()
+        if version is None:
+            return Response(
+                {'error': 'News article not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        def build_response():
+            instance = self.optimize_queryset(public).get(pk=version['pk'])
+            serializer = self.get_serializer(instance)
+            return Response(serializer.data)
         
-        serializer = self.get_serializer(instance)
-        return Response(serializer.data)
+        version['last_modified'] = version.pop('updated_at')
+        return conditional_response(request, version, build_response)
     
     @action(detail=False, methods=['get'])
+    @cached
     def by_category(self, request, category=None):
         """Get news articles by category"""
         category = request.query_params.get('category')
@@ -96,22 +146,20 @@ class NewsViewSet(viewsets.ModelViewSet):
             )
         
         queryset = self.get_queryset().filter(category=category)
-        page = self.paginate_queryset(queryset)
         
-        if page is not None:
-            serializer = NewsListSerializer(page, many=True, context={'request': request})
-            return self.get_paginated_response(serializer.data)
-        
-        serializer = NewsListSerializer(queryset, many=True, context={'request': request})
-        return Response({
-            'category': category,
-            'count': queryset.count(),
-            'results': serializer.data
-        })
+        return self.conditional_list(
+            request, queryset,
+            lambda items: NewsListSerializer(
+                items, many=True, context={'request': request}, **self.fieldset()
+            ).data
+        )
     
     @action(detail=False, methods=['get'])
     def search(self, request):
-        """Search news articles"""
+        """
+        Search news articles, best match first.
+        Each result carries a highlighted 'snippet' of its content.
+        """
         query = request.query_params.get('q', '')
         if not query:
             return Response(
@@ -119,17 +167,16 @@ class NewsViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        queryset = self.get_queryset().filter(
-            Q(title__icontains=query) |
-            Q(content__icontains=query) |
-            Q(excerpt__icontains=query) |
-            Q(tags__icontains=query)
-        )
+        backend = search_backend()
+        queryset = backend.search(self.get_queryset(), query)
         
         page = self.paginate_queryset(queryset)
         
         if page is not None:
             serializer = NewsListSerializer(page, many=True, context={'request': request})
+            snippets = backend.highlight(page, query)
+            for item in serializer.data:
+                item['snippet'] = snippets.get(item['id'], '')
             return self.get_paginated_response(serializer.data)
         
         serializer = NewsListSerializer(queryset, many=True, context={'request': request})
@@ -177,58 +224,86 @@ class NewsViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Get or create share count for this platform
-        share_count, created = ShareCount.objects.get_or_create(
-            news=news,
-            platform=platform,
-            defaults={'count': 0}
-        )
-        
-        # Increment count
-        share_count.count += 1
-        share_count.save()
-        
-        # Get all shares for this news
-        all_shares = news.shares.all()
-        total_shares = sum(share.count for share in all_shares)
+        platform_shares = news.record_share(platform)
         
         return Response({
             'platform': platform,
-            'count': share_count.count,
-            'total_shares': total_shares,
-            'platform_shares': {share.platform: share.count for share in all_shares}
+            'count': platform_shares.get(platform, 0),
+            'total_shares': sum(platform_shares.values()),
+            'platform_shares': platform_shares
         })
 
 
-class TeamMemberViewSet(viewsets.ReadOnlyModelViewSet):
+class TeamMemberViewSet(FieldsetMixin, ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet for TeamMember model
     Provides list and detail views for team members
+    Reads answer 304 when the client's copy is current (articles versioned
+    like news lists) and accept ?fields= and ?expand= (news.fieldsets)
     """
-    queryset = TeamMember.objects.filter(is_active=True).prefetch_related('articles')
+    queryset = TeamMember.objects.filter(is_active=True)
     serializer_class = TeamMemberSerializer
     filter_backends = [filters.OrderingFilter]
     ordering_fields = ['order', 'name', 'joined_date']
     ordering = ['order', 'name']
     
+    @property
+    def version_aggregates(self):
+        """Members show their article counts; articles are versioned as news lists"""
+        if self.action == 'articles':
+            return NEWS_VERSION_AGGREGATES
+        return {'articles': Count('articles')}
+    
+    @property
+    def version_fields(self):
+        if self.action == 'articles':
+            return news_version_fields(self.fieldset()['fields'])
+        return ('num_articles',)
+    
+    @property
+    def paginator(self):
+        """Member pages, or article pages (keyset with ?pagination=cursor) for articles"""
+        if self.action != 'articles':
+            return super().paginator
+        if not hasattr(self, '_paginator'):
+            self._paginator = KeysetPagination() if wants_cursor(self.request) else StandardResultsSetPagination()
+        return self._paginator
+    
+    def get_cache_tags(self, request, data):
+        """Response cache tags: the members shown, and articles for articles"""
+        if self.action == 'list':
+            return {TEAM_TAG} | {author_tag(member['id']) for member in items_of(data)}
+        if self.action == 'articles':
+            return {author_tag(self.kwargs['pk'])} | news_tags(items_of(data))
+        return {author_tag(data['id'])}
+    
+    def get_queryset(self):
+        return self.optimize_queryset(self.queryset)
+    
+    @cached
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+    
+    @cached
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+    
     @action(detail=True, methods=['get'])
+    @cached
     def articles(self, request, pk=None):
         """Get all articles written by this team member"""
         team_member = self.get_object()
-        articles = News.objects.filter(
+        articles = self.optimize_queryset(News.objects.filter(
             author=team_member,
             visibility='public'
-        ).order_by('-created_at')
+        ), NewsListSerializer).order_by('-created_at')
         
-        paginator = StandardResultsSetPagination()
-        page = paginator.paginate_queryset(articles, request)
-        
-        if page is not None:
-            serializer = NewsListSerializer(page, many=True, context={'request': request})
-            return paginator.get_paginated_response(serializer.data)
-        
-        serializer = NewsListSerializer(articles, many=True, context={'request': request})
-        return Response(serializer.data)
+        return self.conditional_list(
+            request, articles,
+            lambda items: NewsListSerializer(
+                items, many=True, context={'request': request}, **self.fieldset()
+            ).data
+        )
 
 
 class CommentViewSet(viewsets.ModelViewSet):
@@ -346,33 +421,54 @@ class CategoryViewSet(viewsets.ViewSet):
     Provides category list with article counts
     """
     
+    def get_cache_tags(self, request, data):
+        """Counts change with any article"""
+        return {NEWS_TAG}
+    
+    @cached
     def list(self, request):
-        """Get all categories with article counts"""
+        """
+        Get all categories with article counts
+        ?fields= selects category fields; counts are skipped unless shown
+        """
+        fields = requested_names(request, 'fields')
+        public = News.objects.filter(visibility='public')
+        if fields is None or 'count' in fields:
+            version = public.aggregate(count=Count('id'), last_modified=Max('updated_at'))
+        else:
+            version = {}  # Names and descriptions only change with the code
+        return conditional_response(request, version, lambda: self._category_list(public, fields))
+    
+    def _category_list(self, public, fields=None):
         categories = []
+        with_counts = fields is None or 'count' in fields
         
         # Get counts for each category
-        category_counts = News.objects.filter(
-            visibility='public'
-        ).values('category').annotate(
-            count=Count('id')
-        )
-        
-        # Create dictionary for quick lookup
-        count_dict = {item['category']: item['count'] for item in category_counts}
+        count_dict = {}
+        if with_counts:
+            category_counts = public.values('category').annotate(
+                count=Count('id')
+            )
+            
+            # Create dictionary for quick lookup
+            count_dict = {item['category']: item['count'] for item in category_counts}
         
         # Build response with all categories
         for category_code, category_name in News.CATEGORY_CHOICES:
-            categories.append({
+            category = {
                 'name': category_code,
                 'display_name': category_name,
                 'count': count_dict.get(category_code, 0),
                 'description': f'{category_name} news and updates'
-            })
-        
-        return Response({
-            'categories': categories,
-            'total': sum(cat['count'] for cat in categories)
-        })
+            }
+            if fields is not None:
+                category = {key: value for key, value in category.items() if key == 'name' or key in fields}
+            categories.append(category)
+        
+        data = {'categories': categories}
+        if with_counts:
+            data['total'] = sum(count_dict.get(category_code, 0) for category_code, _ in News.CATEGORY_CHOICES)
+        return Response(data)
 
 
 class JobOpeningViewSet(viewsets.ModelViewSet):
@@ -435,7 +531,8 @@ class JobApplicationViewSet(viewsets.ModelViewSet):
 class AdvertisementViewSet(viewsets.ReadOnlyModelViewSet):
     """
     ViewSet for Advertisements - Public read-only access
-    Provides active advertisements for display
+    Provides active advertisements for display, served from the in-memory
+    ad index (news.ad_index) so a page view does not query the database
     """
     serializer_class = AdvertisementSerializer
     
@@ -456,17 +553,72 @@ class AdvertisementViewSet(viewsets.ReadOnlyModelViewSet):
         
         return queryset.order_by('order', '-created_at')
     
+    def _ad_data(self, entry):
+        data = dict(entry['data'])
+        if data.get('image'):
+            data['image'] = self.request.build_absolute_uri(data['image'])
+        return data
+    
+    def _live_ad(self, pk):
+        """Index entry of a live ad, or 404"""
+        entry = ad_index().get(int(pk)) if str(pk).isdigit() else None
+        if entry is None:
+            raise Http404
+        return entry
+    
+    def list(self, request, *args, **kwargs):
+        """Active advertisements, served from the in-memory ad index"""
+        entries = ad_index().active(request.query_params.get('position') or None)
+        page = self.paginate_queryset(entries)
+        if page is not None:
+            return self.get_paginated_response([self._ad_data(entry) for entry in page])
+        return Response([self._ad_data(entry) for entry in entries])
+    
+    @action(detail=False, methods=['get'])
+    def slots(self, request):
+        """
+        One ad for each slot of a page, chosen by rotation.
+        
+        Query params:
+            slots: Comma-separated positions, e.g. ?slots=header,sidebar,inline,inline
+        """
+        positions = [slot.strip() for slot in request.query_params.get('slots', '').split(',') if slot.strip()]
+        valid_positions = {choice[0] for choice in Advertisement.POSITION_CHOICES}
+        invalid = sorted(set(positions) - valid_positions)
+        if not positions or invalid:
+            return Response(
+                {'error': f'Invalid slots: {", ".join(invalid)}' if invalid else 'slots is required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(positions) > settings.AD_MAX_SLOTS:
+            return Response(
+                {'error': f'At most {settings.AD_MAX_SLOTS} slots per request'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        index = ad_index()
+        views = read_views(request)
+        picked = index.pick(positions, views)
+        response = Response({
+            'slots': [
+                {'position': position, 'ad': self._ad_data(entry) if entry else None}
+                for position, entry in zip(positions, picked)
+            ]
+        })
+        write_views(response, views, index)
+        return response
+    
     @action(detail=True, methods=['post'])
     def track_impression(self, request, pk=None):
         """Track advertisement impression"""
-        advertisement = self.get_object()
-        advertisement.increment_impressions()
+        self._live_ad(pk)
+        increment(AD_COUNTER, f"{pk}:impressions")
         return Response({'status': 'impression tracked'})
     
     @action(detail=True, methods=['post'])
     def track_click(self, request, pk=None):
         """Track advertisement click"""
-        advertisement = self.get_object()
-        advertisement.increment_clicks()
-        return Response({'status': 'click tracked', 'redirect_url': advertisement.link_url})
+        entry = self._live_ad(pk)
+        increment(AD_COUNTER, f"{pk}:clicks")
+        return Response({'status': 'click tracked', 'redirect_url': entry['link_url']})
 
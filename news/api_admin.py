@@ -19,6 +19,7 @@ from .serializers import (
     NewsListSerializer, AdvertisementAdminSerializer
 )
 from .permissions import IsAdmin
+from .search import search_backend
 
 
 # ============================================================================
@@ -133,7 +134,7 @@ def dashboard_stats(request):
     active_subscribers = Subscriber.objects.filter(is_active=True).count()
     
     # Recent activity
-    recent_news = News.objects.order_by('-created_at')[:5]
+    recent_news = News.objects.with_counts().order_by('-created_at')[:5]
     recent_comments = Comment.objects.order_by('-created_at')[:5]
     
     # Category breakdown
@@ -153,8 +154,8 @@ def dashboard_stats(request):
     
     # Top shared articles
     top_shared = []
-    for news in News.objects.all()[:20]:
-        total_shares = sum(share.count for share in news.shares.all())
+    for news in News.objects.filter(share_total__gt=0).order_by('-share_total')[:5]:
+        total_shares = news.share_total
         if total_shares > 0:
             top_shared.append({
                 'news': {
@@ -191,7 +192,7 @@ def dashboard_stats(request):
 
 class NewsAdminViewSet(viewsets.ModelViewSet):
     """Admin viewset for managing news articles"""
-    queryset = News.objects.all().select_related('author').prefetch_related('comments', 'shares')
+    queryset = News.objects.with_counts()
     serializer_class = NewsAdminSerializer
     permission_classes = [IsAdmin]
     parser_classes = [MultiPartParser, FormParser, JSONParser]
@@ -210,14 +211,10 @@ class NewsAdminViewSet(viewsets.ModelViewSet):
         if visibility:
             queryset = queryset.filter(visibility=visibility)
         
-        # Search
+        # Search (ranked, best match first)
         search = self.request.query_params.get('search', None)
         if search:
-            queryset = queryset.filter(
-                Q(title__icontains=search) | 
-                Q(content__icontains=search) |
-                Q(excerpt__icontains=search)
-            )
+            queryset = search_backend().search(queryset, search)
         
         return queryset
     
@@ -254,7 +251,7 @@ class NewsAdminViewSet(viewsets.ModelViewSet):
 
 class TeamAdminViewSet(viewsets.ModelViewSet):
     """Admin viewset for managing team members"""
-    queryset = TeamMember.objects.all().order_by('order', 'name')
+    queryset = TeamMember.objects.with_article_counts().order_by('order', 'name')
     serializer_class = TeamMemberAdminSerializer
     permission_classes = [IsAdmin]
     parser_classes = [MultiPartParser, FormParser, JSONParser]
@@ -263,7 +260,7 @@ class TeamAdminViewSet(viewsets.ModelViewSet):
     def articles(self, request, pk=None):
         """Get articles by this team member"""
         team_member = self.get_object()
-        articles = News.objects.filter(author=team_member).order_by('-created_at')
+        articles = News.objects.filter(author=team_member).with_counts().order_by('-created_at')
         
         # Pagination
         page_size = int(request.query_params.get('page_size', 10))
@@ -306,8 +303,7 @@ class CommentsAdminViewSet(viewsets.ModelViewSet):
     def approve(self, request, pk=None):
         """Approve a comment"""
         comment = self.get_object()
-        comment.is_approved = True
-        comment.save()
+        comment.set_approved(True)
         
         serializer = self.get_serializer(comment)
         return Response({
@@ -320,8 +316,7 @@ class CommentsAdminViewSet(viewsets.ModelViewSet):
     def unapprove(self, request, pk=None):
         """Unapprove a comment"""
         comment = self.get_object()
-        comment.is_approved = False
-        comment.save()
+        comment.set_approved(False)
         
         serializer = self.get_serializer(comment)
         return Response({
@@ -501,8 +496,8 @@ def analytics(request):
     
     # Most commented articles
     most_commented = []
-    for news in News.objects.all():
-        comment_count = Comment.objects.filter(news=news, is_approved=True).count()
+    for news in News.objects.filter(approved_comment_count__gt=0).order_by('-approved_comment_count')[:5]:
+        comment_count = news.approved_comment_count
         if comment_count > 0:
             most_commented.append({
                 'news': {
@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class NewsConfig(AppConfig):
+    name = 'news'
+
+    def ready(self):
+        # Connect the response cache invalidation signals
+        from . import response_cache  # noqa: F401
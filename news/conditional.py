@@ -0,0 +1,179 @@
+"""
+Conditional GET for Public API Endpoints
+
+Clients that already hold the current version of a response get a bodiless
+304 Not Modified instead of the full JSON:
+- The version of a list is one aggregate query over the filtered queryset:
+  row count, newest updated_at and any extra aggregates a view declares
+  (e.g. engagement counter sums); the version of a single object comes from
+  its own fields
+- In cursor pagination mode (news.pagination) the page is fetched first and
+  its objects give the version, so no query spans the whole list
+- ETag: weak hash of the version, the request path and query string (page,
+  filters, ordering) and whether the user is staff (staff may see drafts)
+- Last-Modified: the newest updated_at
+- The check runs before pages are fetched and serialized; on a match the
+  view does nothing else
+
+Responses carry Cache-Control: no-cache, so browsers keep them but
+revalidate each time. Counter increments still waiting in news.counters
+are not part of the version until they are flushed.
+"""
+
+import hashlib
+from calendar import timegm
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from rest_framework.pagination import CursorPagination
+from rest_framework.response import Response
+
+
+def make_validators(request, version):
+    """
+    ETag and Last-Modified for a response version.
+
+    Args:
+        request (HttpRequest): The request (its path and query are hashed in)
+        version (dict): Values that change whenever the response would;
+            last_modified (datetime or None) becomes the Last-Modified date
+
+    Returns:
+        tuple: (etag, last_modified timestamp or None)
+    """
+    last_modified = version.get('last_modified')
+    timestamp = timegm(last_modified.utctimetuple()) if last_modified else None
+    is_staff = bool(request.user and request.user.is_authenticated and request.user.is_staff)
+    seed = '|'.join([
+        request.get_full_path(),
+        str(is_staff),
+        *(f"{key}={value!r}" for key, value in sorted(version.items())),
+    ])
+    return f'W/"{hashlib.md5(seed.encode()).hexdigest()}"', timestamp
+
+
+def conditional_response(request, version, build_response):
+    """
+    304 when the client's copy matches version, otherwise build_response().
+
+    Args:
+        request (HttpRequest): GET or HEAD request
+        version (dict): See make_validators
+        build_response (callable): Returns the full response; not called on a match
+
+    Returns:
+        HttpResponse: Response with ETag and Last-Modified set
+    """
+    etag, last_modified = make_validators(request, version)
+    return validated_response(request, etag, last_modified, build_response)
+
+
+def validated_response(request, etag, last_modified, build_response):
+    """
+    conditional_response for validators computed earlier (e.g. kept with a
+    cached response, see news.response_cache).
+
+    Args:
+        request (HttpRequest): GET or HEAD request
+        etag (str): ETag of the current version
+        last_modified (int): Last-Modified timestamp, or None
+        build_response (callable): Returns the full response; not called on a match
+
+    Returns:
+        HttpResponse: Response with ETag and Last-Modified set
+    """
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = build_response()
+    if response.status_code in (200, 304):
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+        patch_cache_control(response, no_cache=True)
+        if request.user and request.user.is_authenticated:
+            patch_cache_control(response, private=True)
+    return response
+
+
+class ConditionalGetMixin:
+    """
+    ETag/Last-Modified and 304 handling for a viewset's list and retrieve.
+
+    Attributes:
+        version_field (str): Timestamp field giving Last-Modified
+        version_aggregates (dict): Extra aggregates folded into a list's
+            version, for data the serializer reads from other tables
+        version_fields (tuple): Extra object attributes folded into a
+            single object's version (dotted paths allowed)
+    """
+
+    version_field = 'updated_at'
+    version_aggregates = {}
+    version_fields = ()
+
+    def get_list_version(self, queryset):
+        return queryset.order_by().aggregate(
+            count=Count('pk'),
+            last_modified=Max(self.version_field),
+            **self.version_aggregates,
+        )
+
+    def get_object_version(self, instance):
+        version = {'pk': instance.pk, 'last_modified': getattr(instance, self.version_field)}
+        for path in self.version_fields:
+            value = instance
+            for attribute in path.split('.'):
+                value = getattr(value, attribute, None)
+            version[path] = value
+        return version
+
+    def get_page_version(self, page):
+        versions = [self.get_object_version(instance) for instance in page]
+        return {
+            'items': versions,
+            'last_modified': max((version['last_modified'] for version in versions), default=None),
+        }
+
+    def conditional_list(self, request, queryset, serialize):
+        """
+        Paginated list response with conditional GET.
+
+        Args:
+            request (Request): The request
+            queryset (QuerySet): Filtered, ordered queryset to paginate
+            serialize (callable): Objects -> serialized data
+
+        Returns:
+            Response: 304, or the paginated response
+        """
+        if isinstance(self.paginator, CursorPagination):
+            page = self.paginate_queryset(queryset)
+            version = self.get_page_version(page)
+        else:
+            page, version = None, self.get_list_version(queryset)
+
+        def build_response():
+            items = page if page is not None else self.paginate_queryset(queryset)
+            if items is None:
+                return Response(serialize(queryset))
+            return self.get_paginated_response(serialize(items))
+
+        return conditional_response(request, version, build_response)
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_list(
+            request, self.filter_queryset(self.get_queryset()),
+            lambda items: self.get_serializer(items, many=True).data,
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        return conditional_response(
+            request, self.get_object_version(instance),
+            lambda: self.get_response_for(instance),
+        )
+
+    def get_response_for(self, instance):
+        """Full retrieve response for an object already looked up"""
+        return Response(self.get_serializer(instance).data)
@@ -0,0 +1,312 @@
+"""
+Write-Behind Counters for Shares and Ad Impressions/Clicks
+
+Ad impressions are counted on every page view, so they are not written to
+the database one UPDATE at a time. Increments accumulate in a counter store
+and are flushed periodically as one batched F() UPDATE per table:
+- Redis (COUNTER_REDIS_URL set): HINCRBY into one hash per counter, shared by
+  every web process; the flush_counters beat task writes them out every
+  COUNTER_FLUSH_SECONDS
+- In-process (COUNTER_REDIS_URL empty, e.g. development): a dict per
+  process, which the beat task (another process) cannot see. Each process
+  flushes its own increments: on the increment that finds
+  COUNTER_FLUSH_SECONDS passed since its last flush, from a timer thread
+  COUNTER_FLUSH_SECONDS after the first increment of an idle process, and
+  at exit. A failed flush is logged and never fails the request
+
+Reads that need to be current (share buttons, ad statistics) add pending()
+to the stored value. Deltas are removed from the store only after the
+database transaction commits; a flush that fails keeps them for the next one.
+With Redis, a crash between the commit and the cleanup can count a batch
+twice; reconcile_engagement_counts repairs share totals if that matters.
+
+Counters and their keys:
+- AD_COUNTER: "<advertisement id>:<clicks|impressions>"
+- SHARE_COUNTER: "<news id>:<platform>" (ShareCount.count and News.share_total)
+"""
+
+import atexit
+import logging
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Case, F, IntegerField, Value, When
+from django.utils import timezone
+
+from .models import Advertisement, News, ShareCount
+from .response_cache import invalidate_articles
+
+logger = logging.getLogger(__name__)
+
+AD_COUNTER = 'ad'
+SHARE_COUNTER = 'share'
+
+REDIS_PREFIX = 'news:counters:'
+REDIS_LOCK_TIMEOUT = 60
+
+
+# ============================================================================
+# Stores
+# ============================================================================
+
+class LocalCounterStore:
+    """Pending increments held in this process only"""
+
+    name = 'local'
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._deltas = defaultdict(Counter)
+        self._timer = None
+        self.last_flush = time.monotonic()
+
+    def incr(self, counter, key, amount):
+        with self._lock:
+            self._deltas[counter][key] += amount
+            self._start_timer()
+
+    def _start_timer(self):
+        # Caller holds the lock
+        if self._timer is None:
+            self._timer = threading.Timer(settings.COUNTER_FLUSH_SECONDS, _flush_on_timer)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def timer_fired(self):
+        """After a timed flush: start another timer if deltas are still pending"""
+        with self._lock:
+            self._timer = None
+            if any(self._deltas.values()):
+                self._start_timer()
+
+    def get(self, counter, keys):
+        with self._lock:
+            deltas = self._deltas[counter]
+            return {key: deltas[key] for key in keys if deltas.get(key)}
+
+    @contextmanager
+    def draining(self, counter):
+        """Hand over the pending deltas; they are restored if the block raises"""
+        with self._lock:
+            deltas, self._deltas[counter] = self._deltas[counter], Counter()
+        try:
+            yield dict(deltas)
+        except Exception:
+            with self._lock:
+                self._deltas[counter].update(deltas)
+            raise
+
+
+class RedisCounterStore:
+    """Pending increments in Redis hashes, shared by all processes"""
+
+    name = 'redis'
+
+    def __init__(self, url):
+        import redis
+
+        self.redis = redis.Redis.from_url(url)
+        self.ResponseError = redis.ResponseError
+
+    def incr(self, counter, key, amount):
+        self.redis.hincrby(REDIS_PREFIX + counter, key, amount)
+
+    def get(self, counter, keys):
+        if not keys:
+            return {}
+        with self.redis.pipeline(transaction=False) as pipe:
+            pipe.hmget(REDIS_PREFIX + counter, keys)
+            pipe.hmget(REDIS_PREFIX + counter + ':flushing', keys)
+            current, flushing = pipe.execute()
+        totals = {
+            key: int(a or 0) + int(b or 0)
+            for key, a, b in zip(keys, current, flushing)
+        }
+        return {key: total for key, total in totals.items() if total}
+
+    @contextmanager
+    def draining(self, counter):
+        """
+        Move the hash aside, hand its deltas over, and delete it once the
+        block succeeds. A batch left behind by a failed flush is retried
+        before new increments are taken.
+        """
+        key = REDIS_PREFIX + counter
+        flushing = key + ':flushing'
+        with self.redis.lock(key + ':lock', timeout=REDIS_LOCK_TIMEOUT):
+            if not self.redis.exists(flushing):
+                try:
+                    self.redis.rename(key, flushing)
+                except self.ResponseError:
+                    pass  # No increments since the last flush
+            deltas = {
+                field.decode(): int(value)
+                for field, value in self.redis.hgetall(flushing).items()
+            }
+            yield deltas
+            self.redis.delete(flushing)
+
+
+_store = None
+
+
+def counter_store():
+    """The counter store configured by COUNTER_REDIS_URL"""
+    global _store
+    if _store is None:
+        if settings.COUNTER_REDIS_URL:
+            _store = RedisCounterStore(settings.COUNTER_REDIS_URL)
+        else:
+            _store = LocalCounterStore()
+            atexit.register(_flush_at_exit)
+        logger.info(f"Counter store: {_store.name}")
+    return _store
+
+
+# ============================================================================
+# Public API
+# ============================================================================
+
+def increment(counter, key, amount=1):
+    """
+    Count amount against key; written to the database by the next flush.
+
+    Args:
+        counter (str): AD_COUNTER or SHARE_COUNTER
+        key (str): Counter key (see the module docstring)
+        amount (int): Increment
+    """
+    store = counter_store()
+    store.incr(counter, key, amount)
+    if isinstance(store, LocalCounterStore) and (
+        time.monotonic() - store.last_flush >= settings.COUNTER_FLUSH_SECONDS
+    ):
+        try:
+            flush()
+        except Exception as e:
+            # The deltas stay pending for the next flush
+            logger.error(f"Could not flush counters: {e}")
+
+
+def pending(counter, keys):
+    """
+    Increments not yet written to the database.
+
+    Args:
+        counter (str): AD_COUNTER or SHARE_COUNTER
+        keys (list): Counter keys
+
+    Returns:
+        dict: Key -> pending increment, for keys with one
+    """
+    return counter_store().get(counter, list(keys))
+
+
+def _case(deltas, field='pk'):
+    """CASE expression giving each row's delta (0 for rows not listed)"""
+    return Case(
+        *[When(**{field: pk}, then=Value(amount)) for pk, amount in deltas.items()],
+        default=Value(0),
+        output_field=IntegerField(),
+    )
+
+
+def _apply_ad_deltas(deltas):
+    per_field = defaultdict(dict)
+    for key, amount in deltas.items():
+        pk, field = key.split(':', 1)
+        if field in Advertisement.COUNTER_FIELDS and amount:
+            per_field[field][int(pk)] = amount
+    if not per_field:
+        return 0
+    pks = set().union(*per_field.values())
+    return Advertisement.objects.filter(pk__in=pks).update(**{
+        field: F(field) + _case(amounts) for field, amounts in per_field.items()
+    })
+
+
+def _apply_share_deltas(deltas):
+    per_share = Counter()
+    for key, amount in deltas.items():
+        news_id, platform = key.split(':', 1)
+        per_share[(int(news_id), platform)] += amount
+    # Shares of articles deleted since are dropped
+    news_ids = set(
+        News.objects.filter(pk__in={news_id for news_id, _ in per_share}).values_list('pk', flat=True)
+    )
+    per_share = {share: amount for share, amount in per_share.items() if share[0] in news_ids and amount}
+    if not per_share:
+        return 0
+
+    ShareCount.objects.bulk_create(
+        [ShareCount(news_id=news_id, platform=platform) for news_id, platform in per_share],
+        ignore_conflicts=True,
+    )
+    share_ids = {
+        (news_id, platform): pk
+        for pk, news_id, platform in ShareCount.objects.filter(news_id__in=news_ids)
+        .values_list('pk', 'news_id', 'platform')
+    }
+    ShareCount.objects.filter(pk__in=[share_ids[share] for share in per_share]).update(
+        count=F('count') + _case({share_ids[share]: amount for share, amount in per_share.items()}),
+        last_shared=timezone.now(),
+    )
+
+    totals = Counter()
+    for (news_id, _platform), amount in per_share.items():
+        totals[news_id] += amount
+    News.objects.filter(pk__in=totals).update(share_total=F('share_total') + _case(totals))
+    invalidate_articles(totals, engagement=True)
+    return len(per_share)
+
+
+APPLIERS = {
+    AD_COUNTER: _apply_ad_deltas,
+    SHARE_COUNTER: _apply_share_deltas,
+}
+
+
+def flush():
+    """
+    Write pending increments to the database.
+
+    Returns:
+        dict: Counter -> rows updated
+    """
+    store = counter_store()
+    if isinstance(store, LocalCounterStore):
+        store.last_flush = time.monotonic()
+
+    flushed = {}
+    for counter, apply_deltas in APPLIERS.items():
+        with store.draining(counter) as deltas:
+            if not deltas:
+                continue
+            with transaction.atomic():
+                flushed[counter] = apply_deltas(deltas)
+    if flushed:
+        logger.info(f"Flushed counters: {flushed}")
+    return flushed
+
+
+def _flush_on_timer():
+    """Flush the local store of an idle process (runs in a timer thread)"""
+    store = counter_store()
+    try:
+        flush()
+    except Exception as e:
+        logger.error(f"Could not flush counters: {e}")
+    finally:
+        connection.close()
+        store.timer_fired()
+
+
+def _flush_at_exit():
+    try:
+        flush()
+    except Exception as e:
+        logger.error(f"Could not flush counters at exit: {e}")
@@ -0,0 +1,128 @@
+"""
+Sparse Fieldsets for the Public API
+
+Home-page widgets need a few fields of each article (id, title, slug,
+image, date) but list responses carry every field, the full author profile
+with its article count, tags and counters. Read endpoints of the news, team
+and category APIs accept:
+- ?fields=id,title,slug,image,created_at: only these fields; id is always
+  included and unknown names are ignored. A blank ?fields= counts as absent
+  (the response cache ignores blank params too)
+- ?expand=author: the full nested author. With ?fields= the author is
+  otherwise in its compact form (id, name, photo)
+Without either parameter responses are unchanged.
+
+The queryset follows the serializer: with ?fields= it loads only() the
+columns the selected fields read, otherwise it defer()s the columns the
+default representation never reads (e.g. article content on lists).
+Relations are prefetched only when shown, and author article counts are
+only computed when article_count is shown.
+"""
+
+from django.db.models import Prefetch
+from rest_framework import serializers
+
+
+def requested_names(request, param):
+    """Comma-separated names in a query param, or None when absent or blank"""
+    names = [name.strip() for name in request.query_params.get(param, '').split(',') if name.strip()]
+    return names or None
+
+
+class SparseFieldsMixin:
+    """
+    Model serializer accepting fields= and expand= keyword arguments.
+
+    Meta attributes:
+        field_sources (dict): Serializer field -> model fields it reads, for
+            fields whose source is not a model field of the same name
+        compact_fields (dict): Nested field -> serializer class used with
+            fields= unless the field is expanded
+        always_load (tuple): Model fields loaded even when not shown (read
+            by pagination or response versions)
+    """
+
+    def __init__(self, *args, fields=None, expand=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.sparse = fields is not None
+        if not self.sparse:
+            return
+        keep = set(fields) | {'id'}
+        for name in list(self.fields):
+            if name not in keep:
+                self.fields.pop(name)
+        for name, compact_class in getattr(self.Meta, 'compact_fields', {}).items():
+            if name in self.fields and name not in (expand or ()):
+                self.fields[name] = compact_class(read_only=True)
+
+    def model_columns(self):
+        """Concrete model fields read by the selected fields"""
+        meta = self.Meta.model._meta
+        concrete = {field.name for field in meta.concrete_fields}
+        sources = getattr(self.Meta, 'field_sources', {})
+        columns = {meta.pk.name, *getattr(self.Meta, 'always_load', ())}
+        for name, field in self.fields.items():
+            if name in sources:
+                columns.update(sources[name])
+            elif field.source.split('.')[0] in concrete:
+                columns.add(field.source.split('.')[0])
+        return columns
+
+    def optimize_queryset(self, queryset):
+        """
+        queryset loading only what this serializer reads.
+
+        Args:
+            queryset (QuerySet): Queryset of Meta.model, without prefetches
+                of the relations this serializer shows
+
+        Returns:
+            QuerySet: With only()/defer() and prefetches of shown relations
+        """
+        meta = self.Meta.model._meta
+        columns = self.model_columns()
+        if self.sparse:
+            queryset = queryset.only(*columns)
+        else:
+            queryset = queryset.defer(*[
+                field.name for field in meta.concrete_fields if field.name not in columns
+            ])
+
+        relations = {field.name: field for field in meta.get_fields() if field.is_relation}
+        for field in self.fields.values():
+            relation = relations.get(field.source)
+            if relation is None:
+                continue
+            nested = field.child if isinstance(field, serializers.ListSerializer) else field
+            if isinstance(nested, SparseFieldsMixin):
+                queryset = queryset.prefetch_related(Prefetch(
+                    field.source, queryset=nested.optimize_queryset(relation.related_model.objects.all())
+                ))
+            else:
+                queryset = queryset.prefetch_related(field.source)
+        return queryset
+
+
+class FieldsetMixin:
+    """
+    Viewset mixin passing ?fields= and ?expand= to SparseFieldsMixin
+    serializers and optimizing querysets for them.
+    """
+
+    def fieldset(self):
+        """Serializer keyword arguments for the requested fields"""
+        return {
+            'fields': requested_names(self.request, 'fields'),
+            'expand': requested_names(self.request, 'expand'),
+        }
+
+    def get_serializer(self, *args, **kwargs):
+        if issubclass(self.get_serializer_class(), SparseFieldsMixin) and self.request.method in ('GET', 'HEAD'):
+            for key, value in self.fieldset().items():
+                kwargs.setdefault(key, value)
+        return super().get_serializer(*args, **kwargs)
+
+    def optimize_queryset(self, queryset, serializer_class=None):
+        """queryset loading only what the serializer reads for this request"""
+        serializer_class = serializer_class or self.get_serializer_class()
+        return serializer_class(**self.fieldset()).optimize_queryset(queryset)
@@ -3,20 +3,25 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from django.shortcuts import get_object_or_404
+from .conditional import ConditionalGetMixin, conditional_response
 from .legal_models import LegalPage
 from .legal_serializers import LegalPageSerializer, LegalPageListSerializer
 from .permissions import IsAdmin
+from .response_cache import LEGAL_TAG, cached
 
 
-class LegalPageViewSet(viewsets.ModelViewSet):
+class LegalPageViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing legal/administrative pages
     
     Admin endpoints require authentication
     Public endpoints are available without authentication
+    Reads answer 304 when the client's copy is current and are served from
+    the response cache (news.response_cache)
     """
     queryset = LegalPage.objects.all()
     serializer_class = LegalPageSerializer
+    version_field = 'last_updated'
     
     def get_permissions(self):
         """
@@ -59,7 +64,20 @@ class LegalPageViewSet(viewsets.ModelViewSet):
         
         return queryset
     
+    def get_cache_tags(self, request, data):
+        """Legal pages are few and rarely edited, so one tag covers them all"""
+        return {LEGAL_TAG}
+    
+    @cached
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+    
+    @cached
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+    
     @action(detail=False, methods=['get'], url_path='slug/(?P<slug>[^/.]+)')
+    @cached
     def get_by_slug(self, request, slug=None):
         """Get a legal page by its slug"""
         try:
@@ -68,8 +86,9 @@ class LegalPageViewSet(viewsets.ModelViewSet):
             else:
                 page = LegalPage.objects.get(slug=slug, status='published')
             
-            serializer = self.get_serializer(page)
-            return Response(serializer.data)
+            return conditional_response(
+                request, self.get_object_version(page), lambda: self.get_response_for(page)
+            )
         except LegalPage.DoesNotExist:
             return Response(
                 {'detail': 'Page not found'},
@@ -77,6 +96,7 @@ class LegalPageViewSet(viewsets.ModelViewSet):
             )
     
     @action(detail=False, methods=['get'], url_path='type/(?P<page_type>[^/.]+)')
+    @cached
     def get_by_type(self, request, page_type=None):
         """Get a legal page by its type"""
         try:
@@ -85,8 +105,9 @@ class LegalPageViewSet(viewsets.ModelViewSet):
             else:
                 page = LegalPage.objects.get(page_type=page_type, status='published')
             
-            serializer = self.get_serializer(page)
-            return Response(serializer.data)
+            return conditional_response(
+                request, self.get_object_version(page), lambda: self.get_response_for(page)
+            )
         except LegalPage.DoesNotExist:
             return Response(
                 {'detail': 'Page not found'},
@@ -0,0 +1,359 @@
+"""
+Scraper Throughput Benchmark
+
+Measures the scraping pipeline against local stand-in websites:
+- Parse benchmarks: homepage link extraction, lxml and BeautifulSoup article
+  extraction and keyword matching, in ms per page and pages/sec
+- End-to-end scrape_articles_for_config runs at several concurrency levels,
+  with simulated network latency, reporting wall time, pages/sec and peak
+  Python memory
+
+Pages come from a generated corpus, or from saved HTML files (--corpus DIR,
+containing homepages/*.html and articles/*.html). Saved pages are used for the
+parse benchmarks; end-to-end runs always serve generated sites, whose links
+resolve.
+
+Usage:
+    python manage.py benchmark_scraper
+    python manage.py benchmark_scraper --concurrency 1,4,16 --latency 100 --json results.json
+"""
+
+import json
+import random
+import resource
+import shutil
+import tempfile
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import override_settings
+
+KEYWORDS = ['artificial intelligence', 'climate policy', 'central bank']
+
+WORDS = (
+    'government report market week officials said growth data new policy analysts expect '
+    'company city year people first million research plans public local national state '
+    'investors prices energy health school court election minister support results team'
+).split()
+
+
+# ============================================================================
+# Generated corpus
+# ============================================================================
+
+def _paragraph(rng, topic=None):
+    words = [rng.choice(WORDS) for _ in range(rng.randint(40, 80))]
+    if topic:
+        words.insert(rng.randrange(len(words)), topic)
+    return ' '.join(words).capitalize() + '.'
+
+
+def generate_article(rng, site, index):
+    """A news article page of roughly 30 KB with the usual page furniture"""
+    topic = KEYWORDS[index % len(KEYWORDS)] if index % 2 == 0 else None
+    title = f"{site.title()} story {index}: {topic or rng.choice(WORDS)} update"
+    paragraphs = ''.join(f'<p>{_paragraph(rng, topic if i % 4 == 0 else None)}</p>' for i in range(25))
+    nav = ''.join(f'<li><a href="/section/{word}">{word}</a></li>' for word in WORDS[:30])
+    scripts = ''.join(f'<script>var tracker{i} = "{"x" * 800}";</script>' for i in range(20))
+    ld = json.dumps({
+        '@context': 'https://schema.org', '@type': 'NewsArticle', 'headline': title,
+        'datePublished': '2025-09-01T10:00:00Z', 'author': {'@type': 'Person', 'name': 'Staff Writer'},
+    })
+    return (
+        f'<!DOCTYPE html><html><head><meta charset="utf-8"><title>{title}</title>'
+        f'<meta property="og:title" content="{title}">'
+        f'<meta property="article:published_time" content="2025-09-01T10:00:00Z">'
+        f'<meta property="og:image" content="/img/{index}.jpg">'
+        f'<script type="application/ld+json">{ld}</script>{scripts}</head>'
+        f'<body><header><nav><ul>{nav}</ul></nav></header>'
+        f'<main><article><h1>{title}</h1>{paragraphs}</article>'
+        f'<aside>{"".join(f"<div class=related><a href=/x/{i}>Related {i}</a></div>" for i in range(40))}</aside></main>'
+        f'<footer>{nav}</footer></body></html>'
+    ).encode('utf-8')
+
+
+def article_path(index):
+    return f'/news/2025/09/story-{index}-{"-".join(WORDS[index % 10:index % 10 + 4])}'
+
+
+def generate_homepage(rng, site, articles, feed=False):
+    """A homepage linking every article, between plenty of non-article links"""
+    links = []
+    for index in range(articles):
+        links.append(f'<div class="card"><a href="{article_path(index)}">Story {index}</a>'
+                     f'<a href="/tag/{rng.choice(WORDS)}">tag</a></div>')
+    feed_link = '<link rel="alternate" type="application/rss+xml" href="/feed.xml">' if feed else ''
+    nav = ''.join(f'<a href="/section/{word}">{word}</a>' for word in WORDS)
+    scripts = ''.join(f'<script>var s{i} = "{"x" * 2000}";</script>' for i in range(10))
+    return (
+        f'<!DOCTYPE html><html><head><title>{site}</title>{feed_link}{scripts}</head>'
+        f'<body><nav>{nav}</nav>{"".join(links)}<footer>{nav}</footer></body></html>'
+    ).encode('utf-8')
+
+
+def generate_feed(site, articles):
+    items = ''.join(
+        f'<item><title>{site.title()} story {index}: {KEYWORDS[index % len(KEYWORDS)] if index % 2 == 0 else "update"}</title>'
+        f'<link>{article_path(index)}</link><description>Summary of story {index}</description>'
+        f'<pubDate>Mon, 01 Sep 2025 10:00:00 GMT</pubDate></item>'
+        for index in range(articles)
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel>{items}</channel></rss>'.encode('utf-8')
+
+
+def generate_site(seed, site, articles, feed=False):
+    """Path -> body for one generated website"""
+    rng = random.Random(seed)
+    pages = {'/': generate_homepage(rng, site, articles, feed)}
+    for index in range(articles):
+        pages[article_path(index)] = generate_article(rng, site, index)
+    if feed:
+        pages['/feed.xml'] = generate_feed(site, articles)
+    return pages
+
+
+def load_corpus(directory):
+    """(homepages, articles) as lists of (url, body) from saved HTML files"""
+    root = Path(directory)
+    homepages = [(f'https://saved.example/{p.stem}/', p.read_bytes()) for p in sorted(root.glob('homepages/*.html'))]
+    articles = [(f'https://saved.example/{p.stem}', p.read_bytes()) for p in sorted(root.glob('articles/*.html'))]
+    if not homepages and not articles:
+        raise CommandError(f"No homepages/*.html or articles/*.html found in {directory}")
+    return homepages, articles
+
+
+# ============================================================================
+# Stand-in web server
+# ============================================================================
+
+class _SiteHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        if server.latency:
+            time.sleep(server.latency)
+        body = server.pages.get(self.path)
+        if body is None:
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        content_type = 'application/rss+xml' if self.path.endswith('.xml') else 'text/html; charset=utf-8'
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class StandInSite:
+    """One generated website served from memory on its own port (so its own host)"""
+
+    def __init__(self, pages, latency):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), _SiteHandler)
+        self.server.daemon_threads = True
+        self.server.pages = pages
+        self.server.latency = latency
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self.server.server_port}/'
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+# ============================================================================
+# Command
+# ============================================================================
+
+class Command(BaseCommand):
+    help = 'Benchmark scraper parsing and end-to-end config scrapes against local stand-in sites'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sites', type=int, default=8, help='Generated websites to serve')
+        parser.add_argument('--articles', type=int, default=20, help='Articles per generated website')
+        parser.add_argument('--concurrency', default='1,4,16', help='Comma-separated SCRAPER_MAX_CONCURRENCY levels')
+        parser.add_argument('--latency', type=float, default=50, help='Simulated server latency in ms')
+        parser.add_argument('--repeat', type=int, default=3, help='Passes over the corpus for parse benchmarks')
+        parser.add_argument('--corpus', help='Directory of saved homepages/*.html and articles/*.html')
+        parser.add_argument('--feeds', action='store_true', help='Advertise RSS feeds on generated sites')
+        parser.add_argument('--skip-parse', action='store_true', help='Only run end-to-end scrapes')
+        parser.add_argument('--skip-crawl', action='store_true', help='Only run parse benchmarks')
+        parser.add_argument('--json', dest='json_path', help='Also write results to this JSON file')
+
+    def handle(self, *args, **options):
+        try:
+            levels = [int(level) for level in options['concurrency'].split(',') if level.strip()]
+        except ValueError:
+            raise CommandError('--concurrency must be a comma-separated list of integers')
+
+        sites = {
+            f'site{i}': generate_site(i, f'site{i}', options['articles'], options['feeds'])
+            for i in range(options['sites'])
+        }
+        results = {'options': {k: v for k, v in options.items() if k in (
+            'sites', 'articles', 'latency', 'repeat', 'corpus', 'feeds')}}
+
+        if not options['skip_parse']:
+            if options['corpus']:
+                homepages, articles = load_corpus(options['corpus'])
+            else:
+                homepages = [(f'https://{name}.example/', pages['/']) for name, pages in sites.items()]
+                articles = [
+                    (f'https://{name}.example{path}', body)
+                    for name, pages in sites.items() for path, body in pages.items()
+                    if path.startswith('/news/')
+                ]
+            results['parse'] = self.benchmark_parsing(homepages, articles, options['repeat'])
+
+        if not options['skip_crawl']:
+            results['crawl'] = self.benchmark_crawl(sites, levels, options['latency'] / 1000)
+
+        if options['json_path']:
+            with open(options['json_path'], 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2)
+            self.stdout.write(f"Results written to {options['json_path']}")
+
+    # ------------------------------------------------------------------
+    # Parse benchmarks
+    # ------------------------------------------------------------------
+
+    def _time(self, label, func, pages, repeat):
+        tracemalloc.start()
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for url, body in pages:
+                func(body, url)
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        count = len(pages) * repeat
+        result = {
+            'pages': count,
+            'ms_per_page': round(elapsed * 1000 / count, 3) if count else 0,
+            'pages_per_sec': round(count / elapsed, 1) if elapsed else 0,
+            'peak_mb': round(peak / 1e6, 2),
+        }
+        self.stdout.write(
+            f"  {label:<28} {result['ms_per_page']:>9.3f} ms/page {result['pages_per_sec']:>10.1f} pages/s "
+            f"{result['peak_mb']:>8.2f} MB peak"
+        )
+        return result
+
+    def benchmark_parsing(self, homepages, articles, repeat):
+        from news.scraping_extract import extract_article, extract_links, lxml_html
+        from news.scraping_matcher import KeywordMatcher
+        from news.scraping_utils import NewsArticleScraper
+
+        size = sum(len(body) for _url, body in articles) / max(len(articles), 1)
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"Parsing: {len(homepages)} homepages, {len(articles)} articles (avg {size / 1024:.0f} KB) x{repeat}"
+        ))
+        results = {}
+        if homepages:
+            results['homepage_links'] = self._time(
+                'homepage links', lambda body, url: extract_links(body, url, 10), homepages, repeat
+            )
+        if articles:
+            if lxml_html is not None:
+                results['article_lxml'] = self._time('article (lxml)', extract_article, articles, repeat)
+            scraper = NewsArticleScraper()
+            results['article_soup'] = self._time(
+                'article (BeautifulSoup)', scraper.parse_article_html, articles, max(1, repeat // 3)
+            )
+            parse = extract_article if lxml_html is not None else scraper.parse_article_html
+            parsed = [(url, parse(body, url)) for url, body in articles]
+            matcher = KeywordMatcher(KEYWORDS)
+            results['keyword_match'] = self._time(
+                'keyword matching', lambda data, url: matcher.match_article(data), parsed, repeat
+            )
+        return results
+
+    # ------------------------------------------------------------------
+    # End-to-end scrapes
+    # ------------------------------------------------------------------
+
+    def _scrape_once(self, urls, concurrency, cache_dir):
+        from news.models import NewsSourceConfig
+        from news.scraping_policy import domain_policies
+        from news.scraping_utils import scrape_articles_for_config
+
+        domain_policies.clear()
+        with override_settings(
+            SCRAPER_MAX_CONCURRENCY=concurrency,
+            SCRAPER_PER_HOST_CONNECTIONS=max(1, concurrency // 2),
+            SCRAPER_POLITENESS_DELAY=0.0,
+            SCRAPER_HTTP_CACHE_DIR=cache_dir,
+        ), transaction.atomic():
+            # Rolled back so benchmark configs and frontier rows never persist
+            config = NewsSourceConfig.objects.create(
+                name='Scraper benchmark', keywords=KEYWORDS, source_websites=urls,
+                max_articles_per_scrape=100,
+            )
+            stats = {}
+            start = time.perf_counter()
+            articles = scrape_articles_for_config(config, on_progress=lambda s, _a: stats.update(s))
+            elapsed = time.perf_counter() - start
+            transaction.set_rollback(True)
+        return elapsed, stats, len(articles)
+
+    def benchmark_crawl(self, sites, levels, latency):
+        servers = [StandInSite(pages, latency) for pages in sites.values()]
+        urls = [server.url for server in servers]
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"End-to-end scrape: {len(urls)} sites, {latency * 1000:.0f} ms latency"
+        ))
+        results = []
+        try:
+            # Warm-up: starts the parse process pool and imports everything
+            warmup_dir = tempfile.mkdtemp(prefix='scraper-bench-')
+            try:
+                self._scrape_once(urls, max(levels), warmup_dir)
+            finally:
+                shutil.rmtree(warmup_dir, ignore_errors=True)
+
+            for concurrency in levels:
+                cache_dir = tempfile.mkdtemp(prefix='scraper-bench-')
+                tracemalloc.start()
+                try:
+                    elapsed, stats, accepted = self._scrape_once(urls, concurrency, cache_dir)
+                finally:
+                    peak = tracemalloc.get_traced_memory()[1]
+                    tracemalloc.stop()
+                    shutil.rmtree(cache_dir, ignore_errors=True)
+                pages = stats.get('pages_fetched', 0)
+                result = {
+                    'concurrency': concurrency,
+                    'seconds': round(elapsed, 3),
+                    'pages_fetched': pages,
+                    'pages_per_sec': round(pages / elapsed, 1) if elapsed else 0,
+                    'articles_accepted': accepted,
+                    'fetch_errors': stats.get('fetch_errors', 0),
+                    'peak_mb': round(peak / 1e6, 2),
+                }
+                results.append(result)
+                self.stdout.write(
+                    f"  concurrency {concurrency:>3}: {result['seconds']:>7.2f} s "
+                    f"{pages:>5} pages {result['pages_per_sec']:>8.1f} pages/s "
+                    f"{accepted:>4} accepted {result['peak_mb']:>8.2f} MB peak"
+                )
+        finally:
+            for server in servers:
+                server.close()
+
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        self.stdout.write(f"  process max RSS: {max_rss:.0f} MB (parse worker processes not included)")
+        return results
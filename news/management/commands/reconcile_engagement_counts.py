@@ -0,0 +1,69 @@
+"""
+Reconcile News Engagement Counters
+
+News.approved_comment_count and News.share_total are kept up to date with
+F() updates. Changes that bypass them (queryset.update(), bulk deletes,
+edits to ShareCount rows, raw SQL) leave them out of step; this command
+recounts from Comment and ShareCount and repairs articles that drifted.
+
+Usage:
+    python manage.py reconcile_engagement_counts
+    python manage.py reconcile_engagement_counts --dry-run
+"""
+
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+from news.models import Comment, News, ShareCount
+from news.response_cache import invalidate_articles
+
+
+def actual_counts():
+    """Subqueries counting approved comments and summing shares per article"""
+    comments = (
+        Comment.objects.filter(news=OuterRef('pk'), is_approved=True)
+        .order_by().values('news').annotate(n=Count('pk')).values('n')
+    )
+    shares = (
+        ShareCount.objects.filter(news=OuterRef('pk'))
+        .order_by().values('news').annotate(total=Sum('count')).values('total')
+    )
+    return {
+        'approved_comment_count': Coalesce(Subquery(comments), 0),
+        'share_total': Coalesce(Subquery(shares), 0),
+    }
+
+
+class Command(BaseCommand):
+    help = 'Recount approved comments and shares per article and repair drifted counters'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Report drift without fixing it')
+
+    def handle(self, *args, **options):
+        expected = actual_counts()
+        drifted = News.objects.annotate(
+            actual_comments=expected['approved_comment_count'],
+            actual_shares=expected['share_total'],
+        ).filter(
+            ~Q(approved_comment_count=F('actual_comments')) | ~Q(share_total=F('actual_shares'))
+        ).values_list('pk', 'title', 'approved_comment_count', 'actual_comments', 'share_total', 'actual_shares')
+
+        drifted = list(drifted)
+        for pk, title, comments, actual_comments, shares, actual_shares in drifted:
+            self.stdout.write(
+                f'#{pk} {title[:60]}: comments {comments} -> {actual_comments}, shares {shares} -> {actual_shares}'
+            )
+
+        if not drifted:
+            self.stdout.write(self.style.SUCCESS('All engagement counters are correct'))
+            return
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING(f'{len(drifted)} articles have drifted (dry run, nothing changed)'))
+            return
+
+        # Recomputed inside the UPDATE, so increments made since the check are kept
+        fixed = News.objects.filter(pk__in=[row[0] for row in drifted]).update(**actual_counts())
+        invalidate_articles([row[0] for row in drifted], engagement=True)
+        self.stdout.write(self.style.SUCCESS(f'Repaired counters on {fixed} articles'))
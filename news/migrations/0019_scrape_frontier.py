@@ -0,0 +1,54 @@
+# Generated by Django 5.2.8 on 2026-10-19 10:33
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def remove_duplicate_scraped_articles(apps, schema_editor):
+    """
+    Keep one ScrapedArticle per source_url before adding the unique index.
+    Prefers the row linked to an AI article, then the earliest scraped.
+    """
+    ScrapedArticle = apps.get_model('news', 'ScrapedArticle')
+    duplicate_urls = (
+        ScrapedArticle.objects.values('source_url')
+        .annotate(n=models.Count('id'))
+        .filter(n__gt=1)
+        .values_list('source_url', flat=True)
+    )
+    for url in list(duplicate_urls):
+        rows = ScrapedArticle.objects.filter(source_url=url).order_by(
+            models.F('ai_article').asc(nulls_last=True), 'scraped_at'
+        )
+        keep = rows.first()
+        rows.exclude(pk=keep.pk).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0018_add_groq_provider'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_scraped_articles, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='scrapedarticle',
+            name='source_url',
+            field=models.URLField(max_length=1000, unique=True),
+        ),
+        migrations.CreateModel(
+            name='SeenURL',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('url_hash', models.CharField(help_text='SHA-1 of the normalized article URL', max_length=40)),
+                ('first_seen_at', models.DateTimeField(auto_now_add=True)),
+                ('source_config', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='seen_urls', to='news.newssourceconfig')),
+            ],
+            options={
+                'verbose_name': 'Seen URL',
+                'verbose_name_plural': 'Seen URLs',
+                'unique_together': {('source_config', 'url_hash')},
+            },
+        ),
+    ]
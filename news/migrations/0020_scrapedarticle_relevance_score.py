@@ -0,0 +1,24 @@
+# Generated by Django 5.2.8 on 2026-10-19 10:37
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0019_scrape_frontier'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scrapedarticle',
+            name='relevance_score',
+            field=models.FloatField(default=0, help_text='Keyword relevance (title hits weighted higher)'),
+        ),
+        migrations.AddIndex(
+            model_name='scrapedarticle',
+            index=models.Index(fields=['status', '-relevance_score'], name='news_scrape_status_20d8ac_idx'),
+        ),
+    ]
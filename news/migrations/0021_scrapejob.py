@@ -0,0 +1,44 @@
+# Generated by Django 5.2.8 on 2026-10-19 10:39
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0020_scrapedarticle_relevance_score'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScrapeJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed')], default='queued', max_length=20)),
+                ('celery_task_id', models.CharField(blank=True, max_length=255)),
+                ('sites_total', models.IntegerField(default=0)),
+                ('sites_done', models.IntegerField(default=0)),
+                ('articles_found', models.IntegerField(default=0)),
+                ('articles_saved', models.IntegerField(default=0)),
+                ('duplicates', models.IntegerField(default=0)),
+                ('error_message', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='scrape_jobs', to=settings.AUTH_USER_MODEL)),
+                ('source_config', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='scrape_jobs', to='news.newssourceconfig')),
+            ],
+            options={
+                'verbose_name': 'Scrape Job',
+                'verbose_name_plural': 'Scrape Jobs',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['source_config', '-created_at'], name='news_scrape_source__429768_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('status__in', ['queued', 'running'])), fields=('source_config',), name='one_active_scrape_per_config')],
+            },
+        ),
+    ]
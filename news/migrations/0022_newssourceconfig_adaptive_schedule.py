@@ -0,0 +1,28 @@
+# Generated by Django 5.2.8 on 2026-10-19 10:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0021_scrapejob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='newssourceconfig',
+            name='adaptive_interval_minutes',
+            field=models.FloatField(blank=True, help_text='Current polling interval, adapted to the new-article rate', null=True),
+        ),
+        migrations.AddField(
+            model_name='newssourceconfig',
+            name='new_article_rate',
+            field=models.FloatField(default=0, help_text='Smoothed new articles per hour'),
+        ),
+        migrations.AddField(
+            model_name='newssourceconfig',
+            name='next_scrape_at',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+    ]
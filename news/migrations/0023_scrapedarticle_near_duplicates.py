@@ -0,0 +1,36 @@
+# Generated by Django 5.2.8 on 2026-10-19 10:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0022_newssourceconfig_adaptive_schedule'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scrapedarticle',
+            name='content_signature',
+            field=models.BinaryField(blank=True, help_text='MinHash signature of the title and content', null=True),
+        ),
+        migrations.AddField(
+            model_name='scrapedarticle',
+            name='duplicate_of',
+            field=models.ForeignKey(blank=True, help_text="First article of this story's cluster; empty for cluster representatives", null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='duplicates', to='news.scrapedarticle'),
+        ),
+        migrations.CreateModel(
+            name='MinHashBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.BigIntegerField(db_index=True)),
+                ('article', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='minhash_buckets', to='news.scrapedarticle')),
+            ],
+            options={
+                'verbose_name': 'MinHash Bucket',
+                'verbose_name_plural': 'MinHash Buckets',
+            },
+        ),
+    ]
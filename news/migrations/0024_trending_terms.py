@@ -0,0 +1,38 @@
+# Generated by Django 5.2.8 on 2026-10-19 10:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0023_scrapedarticle_near_duplicates'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scrapedarticle',
+            name='trend_indexed',
+            field=models.BooleanField(db_index=True, default=False, help_text='Terms counted by the trending keyword extractor'),
+        ),
+        migrations.AlterField(
+            model_name='keywordsource',
+            name='source',
+            field=models.CharField(choices=[('manual', 'Manual Entry'), ('google_trends', 'Google Trends'), ('news_api', 'News API'), ('twitter_trends', 'Twitter Trends'), ('internal', 'Internal Analytics'), ('scraped_trends', 'Trending in Scraped News')], default='manual', max_length=50),
+        ),
+        migrations.CreateModel(
+            name='TermBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=100)),
+                ('bucket_start', models.DateTimeField()),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Term Bucket',
+                'verbose_name_plural': 'Term Buckets',
+                'indexes': [models.Index(fields=['bucket_start', 'term'], name='news_termbu_bucket__537986_idx')],
+                'unique_together': {('term', 'bucket_start')},
+            },
+        ),
+    ]
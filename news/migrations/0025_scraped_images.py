@@ -0,0 +1,37 @@
+# Generated by Django 5.2.8 on 2026-10-19 10:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0024_trending_terms'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScrapedImage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('url', models.URLField(max_length=1000, unique=True)),
+                ('status', models.CharField(choices=[('valid', 'Valid'), ('rejected', 'Rejected'), ('failed', 'Failed')], max_length=20)),
+                ('reason', models.CharField(blank=True, help_text='Why the image was rejected or failed', max_length=255)),
+                ('content_type', models.CharField(blank=True, max_length=50)),
+                ('width', models.PositiveIntegerField(default=0)),
+                ('height', models.PositiveIntegerField(default=0)),
+                ('size_bytes', models.PositiveIntegerField(default=0)),
+                ('phash', models.BigIntegerField(blank=True, db_index=True, help_text='64-bit difference hash; equal for copies of the same picture', null=True)),
+                ('checked_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Scraped Image',
+                'verbose_name_plural': 'Scraped Images',
+            },
+        ),
+        migrations.AddField(
+            model_name='scrapedarticle',
+            name='images_verified',
+            field=models.BooleanField(db_index=True, default=False, help_text='image_urls checked and reduced to the best images (see scraping_images)'),
+        ),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 5.2.8 on 2026-10-19 11:00
+
+import django.contrib.postgres.search
+from django.db import migrations
+from django.db.utils import OperationalError
+from django.utils.html import strip_tags
+
+
+def create_search_index(apps, schema_editor):
+    """
+    PostgreSQL: GIN index on news_news.search_vector, filled from existing articles.
+    SQLite: FTS5 table news_news_fts, filled the same way. Without FTS5
+    support the table is skipped and news.search falls back to icontains.
+    """
+    connection = schema_editor.connection
+    if connection.vendor == 'postgresql':
+        schema_editor.execute(
+            'CREATE INDEX news_news_search_vector_gin ON news_news USING gin (search_vector)'
+        )
+        schema_editor.execute(
+            "UPDATE news_news SET search_vector = "
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(tags, '')), 'B') || "
+            "setweight(to_tsvector('english', coalesce(excerpt, '')), 'B') || "
+            "setweight(to_tsvector('english', coalesce(content, '')), 'C')"
+        )
+    elif connection.vendor == 'sqlite':
+        try:
+            schema_editor.execute(
+                "CREATE VIRTUAL TABLE news_news_fts USING fts5("
+                "title, tags, excerpt, content, tokenize = 'porter unicode61 remove_diacritics 2')"
+            )
+        except OperationalError:
+            return  # SQLite built without FTS5
+        News = apps.get_model('news', 'News')
+        rows = [
+            (pk, title, tags, excerpt, strip_tags(content))
+            for pk, title, tags, excerpt, content
+            in News.objects.values_list('pk', 'title', 'tags', 'excerpt', 'content').iterator()
+        ]
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                'INSERT INTO news_news_fts (rowid, title, tags, excerpt, content) VALUES (%s, %s, %s, %s, %s)',
+                rows,
+            )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS news_news_search_vector_gin')
+    elif schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute('DROP TABLE IF EXISTS news_news_fts')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0025_scraped_images'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='news',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, help_text='Full-text index (PostgreSQL only, see news.search)', null=True),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.8 on 2026-10-19 11:03
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def fill_engagement_counters(apps, schema_editor):
+    News = apps.get_model('news', 'News')
+    Comment = apps.get_model('news', 'Comment')
+    ShareCount = apps.get_model('news', 'ShareCount')
+    comments = (
+        Comment.objects.filter(news=OuterRef('pk'), is_approved=True)
+        .order_by().values('news').annotate(n=Count('pk')).values('n')
+    )
+    shares = (
+        ShareCount.objects.filter(news=OuterRef('pk'))
+        .order_by().values('news').annotate(total=Sum('count')).values('total')
+    )
+    News.objects.update(
+        approved_comment_count=Coalesce(Subquery(comments), 0),
+        share_total=Coalesce(Subquery(shares), 0),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0026_news_full_text_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='news',
+            name='approved_comment_count',
+            field=models.PositiveIntegerField(db_index=True, default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='news',
+            name='share_total',
+            field=models.PositiveIntegerField(db_index=True, default=0, editable=False),
+        ),
+        migrations.RunPython(fill_engagement_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.8 on 2026-10-19 11:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0027_news_engagement_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='advertisement',
+            name='frequency_cap',
+            field=models.PositiveSmallIntegerField(default=0, help_text='Maximum times one visitor sees this ad per day (0 = unlimited)'),
+        ),
+        migrations.AddField(
+            model_name='advertisement',
+            name='weight',
+            field=models.PositiveSmallIntegerField(default=1, help_text='Relative share of impressions among ads in the same position (0 = never shown)'),
+        ),
+    ]
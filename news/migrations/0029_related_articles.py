@@ -0,0 +1,43 @@
+# Generated by Django 5.2.8 on 2026-10-19 11:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0028_advertisement_rotation'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NewsTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(db_index=True, max_length=64)),
+                ('weight', models.FloatField()),
+                ('news', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='terms', to='news.news')),
+            ],
+            options={
+                'verbose_name': 'News Term',
+                'verbose_name_plural': 'News Terms',
+                'unique_together': {('news', 'term')},
+            },
+        ),
+        migrations.CreateModel(
+            name='RelatedArticle',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField(help_text="Cosine similarity of the articles' term vectors")),
+                ('news', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='related_links', to='news.news')),
+                ('related', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='similar_to', to='news.news')),
+            ],
+            options={
+                'verbose_name': 'Related Article',
+                'verbose_name_plural': 'Related Articles',
+                'indexes': [models.Index(fields=['news', '-score'], name='news_relate_news_id_ce7265_idx')],
+                'unique_together': {('news', 'related')},
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.8 on 2026-10-19 11:14
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0030_teammember_updated_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='aiarticle',
+            index=models.Index(fields=['status', 'created_at', 'id'], name='news_aiarti_status_d0dadb_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='aiarticle',
+            index=models.Index(fields=['status', 'generation_completed_at', 'id'], name='news_aiarti_status_a8984b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='news',
+            index=models.Index(fields=['visibility', '-created_at', '-id'], name='news_news_visibil_65970d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='news',
+            index=models.Index(fields=['category', 'visibility', '-created_at', '-id'], name='news_news_categor_92b0af_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='news',
+            index=models.Index(fields=['author', 'visibility', '-created_at', '-id'], name='news_news_author__84083b_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-19 11:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0031_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scrapedarticle',
+            name='images_claimed_at',
+            field=models.DateTimeField(blank=True, help_text='When an image verification run claimed the article; the claim lapses after CELERY_TASK_TIME_LIMIT', null=True),
+        ),
+    ]
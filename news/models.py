@@ -1,6 +1,20 @@
-from django.db import models
+from collections import Counter
+
+from django.db import models, transaction
+from django.db.models import Count, F, OuterRef, Prefetch, Subquery
+from django.db.models.functions import Coalesce
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from django.utils.functional import cached_property
+from django.contrib.postgres.search import SearchVectorField
 from django.core.validators import FileExtensionValidator
 
+class TeamMemberQuerySet(models.QuerySet):
+    def with_article_counts(self):
+        """Annotate num_articles (read by the team member serializers)"""
+        return self.annotate(num_articles=Count('articles'))
+
+
 class TeamMember(models.Model):
     ROLE_CHOICES = [
         ('editor_in_chief', 'Editor-in-Chief'),
@@ -24,6 +38,9 @@ class TeamMember(models.Model):
     is_active = models.BooleanField(default=True, help_text="Is this team member currently active?")
     order = models.IntegerField(default=0, help_text="Display order (lower numbers appear first)")
     joined_date = models.DateField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    objects = TeamMemberQuerySet.as_manager()
     
     class Meta:
         ordering = ['order', 'name']
@@ -34,6 +51,22 @@ class TeamMember(models.Model):
         return f"{self.name} - {self.get_role_display()}"
 
 
+class NewsQuerySet(models.QuerySet):
+    def with_counts(self):
+        """
+        Annotate num_comments (approved or not) and prefetch authors with
+        num_articles, so list serializers need no per-article queries.
+        Approved comments and shares are the stored approved_comment_count
+        and share_total. Don't combine with select_related('author').
+        """
+        comments = Comment.objects.filter(news=OuterRef('pk')).order_by().values('news')
+        return self.annotate(
+            num_comments=Coalesce(Subquery(comments.annotate(n=Count('pk')).values('n')), 0),
+        ).prefetch_related(
+            Prefetch('author', queryset=TeamMember.objects.with_article_counts())
+        )
+
+
 class News(models.Model):
     CATEGORY_CHOICES = [
         ('business', 'Business'),
@@ -61,15 +94,40 @@ class News(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     image = models.ImageField(upload_to='news_images/', blank=True, null=True)
+    search_vector = SearchVectorField(null=True, editable=False, help_text="Full-text index (PostgreSQL only, see news.search)")
+    
+    # Engagement counters, changed only with F() updates (Comment, record_share);
+    # reconcile_engagement_counts repairs drift
+    approved_comment_count = models.PositiveIntegerField(default=0, editable=False, db_index=True)
+    share_total = models.PositiveIntegerField(default=0, editable=False, db_index=True)
+    
+    objects = NewsQuerySet.as_manager()
+    
+    COUNTER_FIELDS = ('approved_comment_count', 'share_total')
     
     class Meta:
         ordering = ['-created_at']
+        # Keyset pagination (news.pagination) seeks on (-created_at, -id)
+        indexes = [
+            models.Index(fields=['visibility', '-created_at', '-id']),
+            models.Index(fields=['category', 'visibility', '-created_at', '-id']),
+            models.Index(fields=['author', 'visibility', '-created_at', '-id']),
+        ]
         verbose_name = 'News Article'
         verbose_name_plural = 'News Articles'
     
     def __str__(self):
         return self.title
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Category and author as stored, so the response cache can invalidate
+        # the lists an edit moves the article out of (news.response_cache)
+        instance._category_in_db = instance.__dict__.get('category')
+        instance._author_in_db = instance.__dict__.get('author_id')
+        return instance
+    
     def save(self, *args, **kwargs):
         # Auto-generate slug from title if not provided
         if not self.slug:
@@ -81,13 +139,83 @@ class News(models.Model):
             while News.objects.filter(slug=self.slug).exclude(pk=self.pk).exists():
                 self.slug = f"{original_slug}-{counter}"
                 counter += 1
+        
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None and not self._state.adding:
+            # A full save must not write back counter values loaded earlier
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.COUNTER_FIELDS
+            ]
         super().save(*args, **kwargs)
+        
+        # Keep the full-text index current
+        from .search import SEARCH_FIELDS, search_backend
+        if update_fields is None or set(update_fields) & set(SEARCH_FIELDS):
+            search_backend().index(self)
+        
+        # Keep the related-articles index current, off the request path
+        from .related import RELATED_FIELDS
+        if update_fields is None or set(update_fields) & set(RELATED_FIELDS):
+            from .ai_tasks import enqueue_related_index
+            pk = self.pk
+            transaction.on_commit(lambda: enqueue_related_index(pk))
+    
+    def related_articles(self, queryset=None, limit=3):
+        """
+        Public articles most similar to this one (see news.related); the
+        newest in the same category until this article has been indexed.
+        
+        Args:
+            queryset (QuerySet): News queryset to select from (e.g. with_counts())
+            limit (int): Number of articles
+        
+        Returns:
+            list: News instances, most similar first
+        """
+        queryset = News.objects.all() if queryset is None else queryset
+        queryset = queryset.filter(visibility='public')
+        related = list(queryset.filter(similar_to__news=self).order_by('-similar_to__score')[:limit])
+        if not related:
+            related = list(
+                queryset.filter(category=self.category).exclude(pk=self.pk).order_by('-created_at')[:limit]
+            )
+        return related
     
     def get_tags_list(self):
         """Return tags as a list"""
         if self.tags:
             return [tag.strip() for tag in self.tags.split(',') if tag.strip()]
         return []
+    
+    def record_share(self, platform):
+        """
+        Count one share of this article on platform (written by the next
+        counter flush, see news.counters).
+        
+        Returns:
+            dict: Shares per platform, as platform_shares()
+        """
+        from .counters import SHARE_COUNTER, increment
+        increment(SHARE_COUNTER, f"{self.pk}:{platform}")
+        return self.platform_shares()
+    
+    def platform_shares(self):
+        """Shares per platform, including increments not yet flushed"""
+        from .counters import SHARE_COUNTER, pending
+        shares = Counter(dict(self.shares.values_list('platform', 'count')))
+        for key, amount in pending(
+            SHARE_COUNTER, [f"{self.pk}:{platform}" for platform, _ in ShareCount.PLATFORM_CHOICES]
+        ).items():
+            shares[key.split(':', 1)[1]] += amount
+        return dict(shares)
+
+
+@receiver(post_delete, sender=News)
+def remove_from_search_index(sender, instance, **kwargs):
+    # Also runs for queryset deletes, which bypass Model.delete
+    from .search import search_backend
+    search_backend().remove(instance.pk)
 
 
 class Comment(models.Model):
@@ -105,6 +233,62 @@ class Comment(models.Model):
     
     def __str__(self):
         return f"Comment by {self.name} on {self.news.title}"
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Approval as stored, so save() can tell whether it changed
+        instance._approved_in_db = instance.__dict__.get('is_approved')
+        return instance
+    
+    def save(self, *args, **kwargs):
+        was_approved = False if self._state.adding else getattr(self, '_approved_in_db', None)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if was_approved is not None and was_approved != self.is_approved:
+                News.objects.filter(pk=self.news_id).update(
+                    approved_comment_count=F('approved_comment_count') + (1 if self.is_approved else -1)
+                )
+        self._approved_in_db = self.is_approved
+    
+    def delete(self, *args, **kwargs):
+        was_approved = getattr(self, '_approved_in_db', self.is_approved)
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            if was_approved:
+                News.objects.filter(pk=self.news_id).update(approved_comment_count=F('approved_comment_count') - 1)
+        return result
+    
+    @classmethod
+    def set_approval(cls, queryset, approved):
+        """
+        Approve or unapprove comments, adjusting each article's
+        approved_comment_count only for comments whose state changes.
+        
+        Returns:
+            int: Number of comments changed
+        """
+        with transaction.atomic():
+            changed = list(
+                queryset.exclude(is_approved=approved).select_for_update().values_list('pk', 'news_id')
+            )
+            if not changed:
+                return 0
+            cls.objects.filter(pk__in=[pk for pk, _news_id in changed]).update(is_approved=approved)
+            per_news = Counter(news_id for _pk, news_id in changed)
+            for news_id, count in per_news.items():
+                News.objects.filter(pk=news_id).update(
+                    approved_comment_count=F('approved_comment_count') + (count if approved else -count)
+                )
+            from .response_cache import invalidate_articles
+            invalidate_articles(per_news, engagement=True)
+        return len(changed)
+    
+    def set_approved(self, approved):
+        """Approve or unapprove this comment; see set_approval"""
+        Comment.set_approval(Comment.objects.filter(pk=self.pk), approved)
+        self.is_approved = approved
+        self._approved_in_db = approved
 
 
 class ShareCount(models.Model):
@@ -129,6 +313,40 @@ class ShareCount(models.Model):
         return f"{self.news.title} - {self.platform}: {self.count}"
 
 
+class NewsTerm(models.Model):
+    """
+    One key term of a public article with its normalized TF-IDF weight.
+    Maintained by news.related; articles sharing terms are compared.
+    """
+    news = models.ForeignKey(News, on_delete=models.CASCADE, related_name='terms')
+    term = models.CharField(max_length=64, db_index=True)
+    weight = models.FloatField()
+    
+    class Meta:
+        unique_together = ['news', 'term']
+        verbose_name = 'News Term'
+        verbose_name_plural = 'News Terms'
+    
+    def __str__(self):
+        return f"{self.term} ({self.news_id}): {self.weight:.3f}"
+
+
+class RelatedArticle(models.Model):
+    """One of an article's nearest neighbours by content similarity (news.related)"""
+    news = models.ForeignKey(News, on_delete=models.CASCADE, related_name='related_links')
+    related = models.ForeignKey(News, on_delete=models.CASCADE, related_name='similar_to')
+    score = models.FloatField(help_text="Cosine similarity of the articles' term vectors")
+    
+    class Meta:
+        unique_together = ['news', 'related']
+        indexes = [models.Index(fields=['news', '-score'])]
+        verbose_name = 'Related Article'
+        verbose_name_plural = 'Related Articles'
+    
+    def __str__(self):
+        return f"{self.news_id} -> {self.related_id}: {self.score:.3f}"
+
+
 class Subscriber(models.Model):
     """Newsletter subscriber model"""
     email = models.EmailField(unique=True)
@@ -260,6 +478,10 @@ class Advertisement(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     order = models.IntegerField(default=0, help_text="Display order (lower numbers appear first)")
+    weight = models.PositiveSmallIntegerField(default=1, help_text="Relative share of impressions among ads in the same position (0 = never shown)")
+    frequency_cap = models.PositiveSmallIntegerField(default=0, help_text="Maximum times one visitor sees this ad per day (0 = unlimited)")
+    
+    COUNTER_FIELDS = ('clicks', 'impressions')
     
     class Meta:
         ordering = ['order', '-created_at']
@@ -269,21 +491,50 @@ class Advertisement(models.Model):
     def __str__(self):
         return f"{self.title} - {self.get_position_display()}"
     
+    def save(self, *args, **kwargs):
+        if kwargs.get('update_fields') is None and not self._state.adding:
+            # Counters are written by news.counters; a full save must not
+            # write back the values loaded earlier
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.COUNTER_FIELDS
+            ]
+        super().save(*args, **kwargs)
+        from .ad_index import invalidate
+        transaction.on_commit(invalidate)
+    
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        from .ad_index import invalidate
+        transaction.on_commit(invalidate)
+        return result
+    
     def increment_impressions(self):
-        """Increment the impressions counter"""
-        self.impressions += 1
-        self.save(update_fields=['impressions'])
+        """Increment the impressions counter (written by the next counter flush)"""
+        from .counters import AD_COUNTER, increment
+        increment(AD_COUNTER, f"{self.pk}:impressions")
     
     def increment_clicks(self):
-        """Increment the clicks counter"""
-        self.clicks += 1
-        self.save(update_fields=['clicks'])
+        """Increment the clicks counter (written by the next counter flush)"""
+        from .counters import AD_COUNTER, increment
+        increment(AD_COUNTER, f"{self.pk}:clicks")
+    
+    @cached_property
+    def live_counts(self):
+        """Clicks and impressions including increments not yet flushed"""
+        from .counters import AD_COUNTER, pending
+        deltas = pending(AD_COUNTER, [f"{self.pk}:{field}" for field in self.COUNTER_FIELDS])
+        return {
+            field: getattr(self, field) + deltas.get(f"{self.pk}:{field}", 0)
+            for field in self.COUNTER_FIELDS
+        }
     
     @property
     def click_through_rate(self):
         """Calculate CTR (Click-Through Rate)"""
-        if self.impressions > 0:
-            return (self.clicks / self.impressions) * 100
+        counts = self.live_counts
+        if counts['impressions'] > 0:
+            return (counts['clicks'] / counts['impressions']) * 100
         return 0
 
 
@@ -293,6 +544,7 @@ from .legal_models import LegalPage
 # Import AI Content Generation models
 from .ai_models import (
     KeywordSource, AIArticle, AIGenerationConfig, AIWorkflowLog,
-    NewsSourceConfig, ScrapedArticle
+    NewsSourceConfig, ScrapedArticle, MinHashBucket, TermBucket, ScrapedImage,
+    SeenURL, ScrapeJob
 )
 
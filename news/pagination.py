@@ -0,0 +1,38 @@
+"""
+Keyset (Cursor) Pagination
+
+Page-number pagination runs COUNT(*) and OFFSET on every page, so deep
+pages and infinite scroll slow down as the archive grows. In cursor mode a
+page is selected by the position of the previous one instead:
+- WHERE created_at < <last seen> ORDER BY created_at DESC, id DESC LIMIT n,
+  answered from a composite index, so page 1000 costs the same as page 1
+- No total count; responses carry next/previous links (opaque ?cursor=)
+- The order is fixed, so ?ordering= (and search ranking) is ignored
+
+Clients opt in with ?pagination=cursor on the first request and follow the
+next links from there; without it endpoints keep page numbers.
+"""
+
+from rest_framework.pagination import CursorPagination
+
+
+def wants_cursor(request):
+    """Whether the client asked for cursor pagination"""
+    return request.query_params.get('pagination') == 'cursor' or 'cursor' in request.query_params
+
+
+class KeysetPagination(CursorPagination):
+    """Cursor pagination on a fixed (timestamp, id) order"""
+
+    ordering = ('-created_at', '-id')
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+    def __init__(self, ordering=None):
+        if ordering is not None:
+            self.ordering = ordering
+
+    def get_ordering(self, request, queryset, view):
+        # The cursor encodes a position in this order; ?ordering= cannot change it
+        return self.ordering
@@ -0,0 +1,263 @@
+"""
+Related Articles by Content Similarity
+
+Replaces "latest three in the same category" with articles that share
+vocabulary:
+- Each public article is reduced to its RELATED_TERMS key terms: words of
+  the title, tags and content (title and tag words count TITLE_WEIGHT
+  times), weighted by TF-IDF and L2-normalized, stored as NewsTerm rows
+- Similarity is the cosine of two term vectors; candidates are the
+  articles sharing at least one key term, found through the term index
+- Each article keeps its RELATED_ARTICLES_K nearest neighbours as
+  RelatedArticle rows, so the detail view reads them with one query
+
+Updates are incremental: saving an article (News.save) queues the
+index_related_article task once the save commits, which re-indexes it,
+replaces its neighbour list, recomputes the lists of the articles that
+listed it (so they are refilled rather than left short) and inserts it
+into the lists of the articles it is now close to where it outranks an
+entry. Document frequencies come from the stored key terms,
+so weights drift as the corpus grows; rebuild_related_articles recomputes
+everything from full document frequencies.
+"""
+
+import logging
+import math
+import re
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils.html import strip_tags
+
+from .ai_pipeline.tools.keyword_scraper import STOP_WORDS
+from .models import News, NewsTerm, RelatedArticle
+from .response_cache import ALL_TAG, invalidate, invalidate_articles
+
+logger = logging.getLogger(__name__)
+
+# Fields feeding the term vector; saves touching none of them skip re-indexing
+RELATED_FIELDS = ('title', 'tags', 'content', 'visibility')
+
+WORD_RE = re.compile(r"[a-z][a-z0-9]+(?:['-][a-z0-9]+)*")
+TITLE_WEIGHT = 3
+MIN_WORD_LENGTH = 3
+MAX_TERM_LENGTH = 64
+
+# Neighbours scoring less than this share too little to be called related
+MIN_SCORE = 0.05
+
+
+def normalize(word):
+    """Lowercase word with possessives and plural s removed"""
+    word = word.lower()
+    if word.endswith("'s"):
+        word = word[:-2]
+    if len(word) > 4 and word.endswith('ies'):
+        word = word[:-3] + 'y'
+    elif len(word) > 3 and word.endswith('s') and not word.endswith(('ss', 'us', 'is')):
+        word = word[:-1]
+    return word
+
+
+def term_counts(title, tags, content):
+    """
+    Weighted term counts of one article.
+
+    Returns:
+        Counter: Term -> count (title and tag words count TITLE_WEIGHT times)
+    """
+    counts = Counter()
+    sources = (
+        (title, TITLE_WEIGHT),
+        ((tags or '').replace(',', ' '), TITLE_WEIGHT),
+        (strip_tags(content or ''), 1),
+    )
+    for text, weight in sources:
+        for word in WORD_RE.findall((text or '').lower()):
+            term = normalize(word)
+            if len(term) >= MIN_WORD_LENGTH and len(term) <= MAX_TERM_LENGTH and term not in STOP_WORDS:
+                counts[term] += weight
+    return counts
+
+
+def term_vector(counts, document_frequency, total_documents):
+    """
+    Key terms of an article.
+
+    Args:
+        counts (Counter): term_counts() of the article
+        document_frequency (dict): Term -> articles containing it
+        total_documents (int): Articles in the corpus
+
+    Returns:
+        dict: At most RELATED_TERMS terms -> weight, L2-normalized
+    """
+    weights = {
+        term: (1 + math.log(count)) * (
+            math.log((1 + total_documents) / (1 + document_frequency.get(term, 0))) + 1
+        )
+        for term, count in counts.items()
+    }
+    top = sorted(weights.items(), key=lambda item: -item[1])[:settings.RELATED_TERMS]
+    norm = math.sqrt(sum(weight * weight for _, weight in top)) or 1.0
+    return {term: weight / norm for term, weight in top}
+
+
+def _nearest(scores, exclude=None):
+    """Best RELATED_ARTICLES_K (article ID, score) pairs"""
+    ranked = sorted(
+        ((pk, score) for pk, score in scores.items() if score >= MIN_SCORE and pk != exclude),
+        key=lambda item: -item[1],
+    )
+    return ranked[:settings.RELATED_ARTICLES_K]
+
+
+def _neighbour_links(vectors, postings):
+    """
+    Neighbour lists from term vectors.
+
+    Args:
+        vectors (dict): Article ID -> {term: weight} of the articles to list
+        postings (dict): Term -> [(article ID, weight)] over the candidates
+
+    Returns:
+        list: Unsaved RelatedArticle rows
+    """
+    links = []
+    for pk, vector in vectors.items():
+        scores = Counter()
+        for term, weight in vector.items():
+            for other, other_weight in postings[term]:
+                scores[other] += weight * other_weight
+        links.extend(
+            RelatedArticle(news_id=pk, related_id=other, score=score)
+            for other, score in _nearest(scores, exclude=pk)
+        )
+    return links
+
+
+def _recompute_lists(pks):
+    """Replace the neighbour lists of the given articles from the stored term vectors"""
+    if not pks:
+        return
+    vectors = defaultdict(dict)
+    for news_id, term, weight in NewsTerm.objects.filter(news_id__in=pks).values_list('news_id', 'term', 'weight'):
+        vectors[news_id][term] = weight
+    postings = defaultdict(list)
+    terms = {term for vector in vectors.values() for term in vector}
+    for news_id, term, weight in NewsTerm.objects.filter(term__in=terms).values_list('news_id', 'term', 'weight'):
+        postings[term].append((news_id, weight))
+    RelatedArticle.objects.filter(news_id__in=pks).delete()
+    RelatedArticle.objects.bulk_create(_neighbour_links(vectors, postings))
+    invalidate_articles(pks)
+
+
+def index_article(news):
+    """
+    Re-index one article and update the neighbour lists it belongs to.
+
+    Args:
+        news (News): Saved article
+
+    Returns:
+        int: Neighbours stored for the article
+    """
+    with transaction.atomic():
+        # Lists showing this article are recomputed once it is re-indexed
+        listed_by = set(
+            RelatedArticle.objects.filter(related=news).values_list('news_id', flat=True)
+        )
+        NewsTerm.objects.filter(news=news).delete()
+        RelatedArticle.objects.filter(Q(news=news) | Q(related=news)).delete()
+        counts = term_counts(news.title, news.tags, news.content) if news.visibility == 'public' else None
+        if not counts:
+            _recompute_lists(listed_by)
+            return 0
+
+        document_frequency = dict(
+            NewsTerm.objects.filter(term__in=list(counts)).values('term')
+            .annotate(n=Count('id')).values_list('term', 'n')
+        )
+        total = News.objects.filter(visibility='public').count()
+        vector = term_vector(counts, document_frequency, total)
+        NewsTerm.objects.bulk_create([
+            NewsTerm(news=news, term=term, weight=weight) for term, weight in vector.items()
+        ])
+
+        scores = Counter()
+        for news_id, term, weight in (
+            NewsTerm.objects.filter(term__in=list(vector)).exclude(news=news)
+            .values_list('news_id', 'term', 'weight')
+        ):
+            scores[news_id] += vector[term] * weight
+        nearest = _nearest(scores)
+        RelatedArticle.objects.bulk_create([
+            RelatedArticle(news=news, related_id=pk, score=score) for pk, score in nearest
+        ])
+
+        _recompute_lists(listed_by)
+
+        # Insert this article into the other neighbours' lists where it ranks
+        neighbour_ids = [pk for pk, _ in nearest if pk not in listed_by]
+        existing = defaultdict(list)
+        for link_id, news_id, score in (
+            RelatedArticle.objects.filter(news_id__in=neighbour_ids)
+            .values_list('id', 'news_id', 'score')
+        ):
+            existing[news_id].append((score, link_id))
+        added, dropped = [], []
+        for pk, score in nearest:
+            if pk in listed_by:
+                continue
+            links = existing[pk]
+            if len(links) < settings.RELATED_ARTICLES_K:
+                added.append(RelatedArticle(news_id=pk, related=news, score=score))
+            elif score > min(links)[0]:
+                added.append(RelatedArticle(news_id=pk, related=news, score=score))
+                dropped.append(min(links)[1])
+        RelatedArticle.objects.filter(pk__in=dropped).delete()
+        RelatedArticle.objects.bulk_create(added)
+        # Responses that showed this article are invalidated by its own save
+        invalidate_articles([link.news_id for link in added])
+    return len(nearest)
+
+
+def rebuild():
+    """
+    Recompute every term vector and neighbour list.
+
+    Returns:
+        int: Articles indexed
+    """
+    counts = {
+        pk: term_counts(title, tags, content)
+        for pk, title, tags, content in News.objects.filter(visibility='public')
+        .values_list('pk', 'title', 'tags', 'content').iterator()
+    }
+    document_frequency = Counter(term for article_counts in counts.values() for term in article_counts)
+    vectors = {
+        pk: term_vector(article_counts, document_frequency, len(counts))
+        for pk, article_counts in counts.items() if article_counts
+    }
+
+    postings = defaultdict(list)
+    for pk, vector in vectors.items():
+        for term, weight in vector.items():
+            postings[term].append((pk, weight))
+
+    links = _neighbour_links(vectors, postings)
+
+    with transaction.atomic():
+        NewsTerm.objects.all().delete()
+        RelatedArticle.objects.all().delete()
+        NewsTerm.objects.bulk_create(
+            [NewsTerm(news_id=pk, term=term, weight=weight)
+             for pk, vector in vectors.items() for term, weight in vector.items()],
+            batch_size=1000,
+        )
+        RelatedArticle.objects.bulk_create(links, batch_size=1000)
+    invalidate(ALL_TAG)
+    logger.info(f"Rebuilt related articles: {len(vectors)} articles, {len(links)} links")
+    return len(vectors)
@@ -0,0 +1,282 @@
+"""
+Tag-Based Response Cache for Public Read Endpoints
+
+Public reads outnumber writes by orders of magnitude, so the data of
+responses from the news, category, team and legal endpoints is kept in the
+Django cache (CACHES) and reused until something it shows changes:
+- Keyed by host, path and normalized query params (sorted, blank values and
+  page=1 dropped); staff requests (which may see drafts) bypass the cache
+- Each entry carries tags naming what it shows: article:<id>, author:<id>,
+  category:<code>, and list tags for lists whose membership any article can
+  change (news, team, legal, engagement for lists ordered by counters)
+- Invalidating a tag stores the time; entries built before the latest
+  invalidation of any of their tags are stale. A tag missing from the cache
+  (evicted, or never seen) counts as invalidated now when an entry is read,
+  and as invalidated when the build started when an entry is stored
+- Invalidation only reaches other processes through a shared cache, so
+  RESPONSE_CACHE_TTL defaults to 0 (off) unless CACHE_REDIS_URL is set
+- The ETag and Last-Modified of news.conditional are kept with the data, so
+  a hit answers If-None-Match with 304 without touching the database
+
+post_save/post_delete signals on News, Comment, ShareCount, TeamMember and
+LegalPage invalidate the affected tags once the transaction commits; code
+that bypasses signals (counter flushes, bulk approval, admin bulk actions,
+index rebuilds) calls invalidate() itself. Anything else is corrected when
+entries expire after RESPONSE_CACHE_TTL seconds.
+"""
+
+import hashlib
+import logging
+import time
+from functools import wraps
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils.http import parse_http_date_safe
+from rest_framework.response import Response
+
+from .conditional import validated_response
+from .legal_models import LegalPage
+from .models import Comment, News, ShareCount, TeamMember
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'response:'
+TAG_PREFIX = 'response-tag:'
+
+ALL_TAG = 'all'  # Carried by every entry
+NEWS_TAG = 'news'  # Article lists not narrowed to a category or author
+ENGAGEMENT_TAG = 'engagement'  # Article lists ordered by comment or share counts
+TEAM_TAG = 'team'
+LEGAL_TAG = 'legal'
+
+
+def article_tag(pk):
+    return f"article:{pk}"
+
+
+def author_tag(pk):
+    return f"author:{pk}"
+
+
+def category_tag(category):
+    return f"category:{category}"
+
+
+# ============================================================================
+# Tags of serialized data
+# ============================================================================
+
+def items_of(data):
+    """Objects of a serialized list, paginated or not"""
+    if isinstance(data, dict):
+        return data.get('results', [])
+    return data
+
+
+def news_tags(items):
+    """Tags of serialized articles: the articles, their authors and related articles"""
+    tags = set()
+    for item in items:
+        tags.add(article_tag(item['id']))
+        if item.get('author'):
+            tags.add(author_tag(item['author']['id']))
+        tags |= news_tags(item.get('related_news') or [])
+    return tags
+
+
+def news_list_tags(params):
+    """
+    Tags for a list's membership and order.
+
+    Args:
+        params (QueryDict): Query params of the list (category, author, ordering)
+
+    Returns:
+        set: Category/author tags for a narrowed list, else NEWS_TAG; plus
+            ENGAGEMENT_TAG when ordered by a counter field
+    """
+    tags = set()
+    if params.get('category'):
+        tags.add(category_tag(params['category']))
+    if params.get('author'):
+        tags.add(author_tag(params['author']))
+    if not tags:
+        tags.add(NEWS_TAG)
+    ordering = [field.strip().lstrip('-') for field in params.get('ordering', '').split(',')]
+    if set(ordering) & set(News.COUNTER_FIELDS):
+        tags.add(ENGAGEMENT_TAG)
+    return tags
+
+
+# ============================================================================
+# Cache
+# ============================================================================
+
+def cache_key(request):
+    """Cache key of a request: host, path and normalized query params"""
+    params = sorted(
+        (
+            (key, value) for key, values in request.query_params.lists() for value in values
+            if value != '' and not (key == 'page' and value == '1')
+        ),
+        key=lambda item: item[0],
+    )
+    seed = f"{request.scheme}://{request.get_host()}{request.path}?{urlencode(params)}"
+    return KEY_PREFIX + hashlib.md5(seed.encode()).hexdigest()
+
+
+def _is_current(entry):
+    """Whether no tag of entry was invalidated after it was built"""
+    keys = [TAG_PREFIX + tag for tag in entry['tags']]
+    invalidated = cache.get_many(keys)
+    missing = [key for key in keys if key not in invalidated]
+    if missing:
+        now = time.time()
+        for key in missing:
+            cache.add(key, now, None)
+        return False
+    return max(invalidated.values(), default=0) <= entry['built_at']
+
+
+def _store(key, response, tags, built_at):
+    tags = set(tags) | {ALL_TAG}
+    keys = [TAG_PREFIX + tag for tag in tags]
+    # A tag first seen now starts out as invalidated when the build started:
+    # this entry is current, entries built earlier are not (see _is_current)
+    known = cache.get_many(keys)
+    for tag_key in keys:
+        if tag_key not in known:
+            cache.add(tag_key, built_at, None)
+    cache.set(key, {
+        'data': response.data,
+        'etag': response.get('ETag'),
+        'last_modified': parse_http_date_safe(response.get('Last-Modified', '')),
+        'tags': sorted(tags),
+        'built_at': built_at,
+    }, settings.RESPONSE_CACHE_TTL)
+
+
+def cacheable(request):
+    """Whether responses to request may be read from and stored in the cache"""
+    user = request.user
+    return (
+        settings.RESPONSE_CACHE_TTL > 0
+        and request.method in ('GET', 'HEAD')
+        and not (user and user.is_authenticated and user.is_staff)
+    )
+
+
+def cached_response(request, build_response, get_tags):
+    """
+    Cached response for request, or build_response() stored under get_tags.
+
+    Args:
+        request (Request): The request
+        build_response (callable): Returns the full response (may be a 304)
+        get_tags (callable): (request, data) -> tags of a 200 response's data
+
+    Returns:
+        Response: From the cache (304 when the client's copy matches) or built
+    """
+    if not cacheable(request):
+        return build_response()
+
+    key = cache_key(request)
+    try:
+        entry = cache.get(key)
+        if entry is not None and _is_current(entry):
+            if entry['etag'] is None:
+                return Response(entry['data'])
+            return validated_response(
+                request, entry['etag'], entry['last_modified'], lambda: Response(entry['data'])
+            )
+    except Exception as e:
+        logger.warning(f"Response cache read failed for {request.path}: {e}")
+        return build_response()
+
+    built_at = time.time()
+    response = build_response()
+    if response.status_code == 200 and getattr(response, 'data', None) is not None:
+        try:
+            _store(key, response, get_tags(request, response.data), built_at)
+        except Exception as e:
+            logger.warning(f"Response cache write failed for {request.path}: {e}")
+    return response
+
+
+def cached(method):
+    """
+    Serve a viewset method from the response cache, tagged by the viewset's
+    get_cache_tags(request, data).
+    """
+    @wraps(method)
+    def wrapper(self, request, *args, **kwargs):
+        return cached_response(
+            request, lambda: method(self, request, *args, **kwargs), self.get_cache_tags
+        )
+    return wrapper
+
+
+# ============================================================================
+# Invalidation
+# ============================================================================
+
+def invalidate(*tags):
+    """Mark entries carrying any of tags stale once the current transaction commits"""
+    tags = {tag for tag in tags if tag}
+    if not tags:
+        return
+
+    def mark():
+        try:
+            now = time.time()
+            cache.set_many({TAG_PREFIX + tag: now for tag in tags}, None)
+        except Exception as e:
+            logger.error(f"Could not invalidate cached responses {sorted(tags)}: {e}")
+
+    transaction.on_commit(mark)
+
+
+def invalidate_articles(pks, engagement=False):
+    """
+    Invalidate responses showing the given articles.
+
+    Args:
+        pks (iterable): Article IDs
+        engagement (bool): Their comment or share counts changed
+    """
+    invalidate(*[article_tag(pk) for pk in pks], ENGAGEMENT_TAG if engagement else None)
+
+
+@receiver([post_save, post_delete], sender=News)
+def _news_changed(sender, instance, **kwargs):
+    # An edit can move the article out of its old category's and author's lists
+    categories = {instance.category, getattr(instance, '_category_in_db', None)}
+    authors = {instance.author_id, getattr(instance, '_author_in_db', None)}
+    invalidate(
+        article_tag(instance.pk), NEWS_TAG,
+        *[category_tag(category) for category in categories if category],
+        *[author_tag(author) for author in authors if author],
+    )
+    instance._category_in_db, instance._author_in_db = instance.category, instance.author_id
+
+
+@receiver([post_save, post_delete], sender=Comment)
+@receiver([post_save, post_delete], sender=ShareCount)
+def _engagement_changed(sender, instance, **kwargs):
+    invalidate_articles([instance.news_id], engagement=True)
+
+
+@receiver([post_save, post_delete], sender=TeamMember)
+def _team_member_changed(sender, instance, **kwargs):
+    invalidate(author_tag(instance.pk), TEAM_TAG)
+
+
+@receiver([post_save, post_delete], sender=LegalPage)
+def _legal_page_changed(sender, instance, **kwargs):
+    invalidate(LEGAL_TAG)
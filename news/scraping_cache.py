@@ -0,0 +1,97 @@
+"""
+On-disk HTTP Cache for News Scraping
+
+Stores per-URL validators so repeat scrapes can use conditional requests:
+- ETag and Last-Modified headers (sent back as If-None-Match / If-Modified-Since)
+- SHA-256 digest of the last body, for servers that ignore conditional headers
+- Article links extracted from homepages, reused when the page is unchanged
+- Feeds discovered on homepages, and entries parsed from feeds
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+def body_digest(body):
+    """SHA-256 hex digest of a response body"""
+    if isinstance(body, str):
+        body = body.encode('utf-8')
+    return hashlib.sha256(body).hexdigest()
+
+
+class HttpResponseCache:
+    """
+    File-backed cache of HTTP validators, one small JSON file per URL.
+
+    Files are sharded by the first two characters of the URL hash and written
+    atomically, so concurrent crawls on the same machine never see partial
+    entries.
+    """
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = Path(cache_dir or settings.SCRAPER_HTTP_CACHE_DIR)
+
+    def _path(self, url):
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        return self.cache_dir / key[:2] / f'{key}.json'
+
+    def get(self, url):
+        """
+        Get the cached entry for a URL.
+
+        Returns:
+            dict: Entry with etag, last_modified, digest, links, feeds, entries,
+                fetched_at; or None
+        """
+        path = self._path(url)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Discarding unreadable HTTP cache entry for {url}: {str(e)}")
+            return None
+
+    def set(self, url, etag='', last_modified='', digest='', links=None, feeds=None, entries=None):
+        """Store validators (and optionally extracted links, feeds or feed entries) for a URL."""
+        entry = {
+            'url': url,
+            'etag': etag or '',
+            'last_modified': last_modified or '',
+            'digest': digest or '',
+            'links': links or [],
+            'feeds': feeds or [],
+            'entries': entries or [],
+            'fetched_at': timezone.now().isoformat(),
+        }
+        path = self._path(url)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write HTTP cache entry for {url}: {str(e)}")
+        return entry
+
+    @staticmethod
+    def conditional_headers(entry):
+        """Build If-None-Match / If-Modified-Since headers from a cached entry."""
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
@@ -0,0 +1,545 @@
+"""
+Concurrent Crawler for News Source Scraping
+
+Replaces the serial homepage -> article loop in scrape_articles_for_config:
+- Global concurrency limit across all hosts
+- Per-host connection limits and politeness delays
+- Shared keep-alive sessions (one connection pool per host)
+- Parsing pipelined on its own worker pool so it never blocks fetching;
+  a process pool by default, so CPU-bound parsing runs in parallel
+- Conditional homepage requests via HttpResponseCache; unchanged homepages
+  reuse their cached links and skip parsing entirely
+- Sites that publish RSS/Atom feeds or news sitemaps are crawled from those
+  instead of their homepages; feed entries are keyword-filtered before any
+  article is fetched (entries with no title or summary, as in plain
+  sitemaps, are fetched and filtered once parsed), with homepage scraping as
+  the fallback
+- robots.txt, Crawl-delay, 429 back-off and a per-host circuit breaker via
+  the shared DomainPolicyCache; a host paused by Retry-After for longer than
+  SCRAPER_MAX_RETRY_WAIT (or past the crawl deadline) is dropped for this
+  crawl instead of waited on
+- Streamed downloads: non-HTML and oversized responses are dropped after
+  their headers
+"""
+
+import heapq
+import logging
+import multiprocessing
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from django.conf import settings
+
+from .scraping_extract import init_parse_worker, parse_article, parse_homepage
+from .scraping_feeds import cached_feeds, is_news_sitemap, parse_feed
+from .scraping_policy import RobotsDisallowed, domain_policies
+from .scraping_utils import FEED_CONTENT_TYPES, HTML_CONTENT_TYPES, ResponseRejected
+
+logger = logging.getLogger(__name__)
+
+# Parse process pools are kept for the life of the process so worker start-up
+# is paid once, not on every crawl. Keyed by pool size.
+_process_pools = {}
+_process_pools_lock = threading.Lock()
+
+
+def get_parse_process_pool(size):
+    """Shared spawn-based process pool for CPU-bound parsing"""
+    with _process_pools_lock:
+        pool = _process_pools.get(size)
+        if pool is None:
+            pool = ProcessPoolExecutor(
+                max_workers=size,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=init_parse_worker,
+            )
+            _process_pools[size] = pool
+        return pool
+
+
+def discard_parse_process_pool(size):
+    """Drop a broken shared pool so the next crawl starts a fresh one"""
+    with _process_pools_lock:
+        pool = _process_pools.pop(size, None)
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+class CrawlTask:
+    """A single unit of crawler work (homepage, feed or article)."""
+
+    HOMEPAGE = 'homepage'
+    FEED = 'feed'
+    ARTICLE = 'article'
+
+    def __init__(self, kind, url, site, discover=True):
+        self.kind = kind
+        self.url = url
+        self.site = site
+        self.host = urlparse(url).netloc.lower()
+        self.validators = None
+        # Homepages only: look for feeds instead of following links
+        self.discover = discover
+
+
+class HostState:
+    """Scheduling state for one host: queued work, open connections, pacing."""
+
+    def __init__(self, host, session):
+        self.host = host
+        self.session = session
+        self.queue = deque()
+        self.in_flight = 0
+        self.ready_at = 0.0
+
+
+class ConcurrentCrawler:
+    """
+    Crawls homepages and their articles for many websites in parallel.
+
+    All scheduling happens on the calling thread: it hands fetches to a
+    bounded fetch pool while respecting per-host limits, and hands downloaded
+    pages to a separate parse pool. Worker threads never sleep for politeness;
+    a host simply isn't dispatched until its next slot opens.
+    """
+
+    def __init__(self, scraper, max_concurrency=None, per_host_connections=None,
+                 politeness_delay=None, parse_workers=None, parse_processes=None, cache=None,
+                 policies=None):
+        """
+        Args:
+            scraper: NewsArticleScraper used for fetching and parsing
+            cache (HttpResponseCache): Optional validator cache for homepages
+            max_concurrency (int): Maximum simultaneous requests across all hosts
+            per_host_connections (int): Maximum simultaneous requests per host
+            politeness_delay (float): Minimum seconds between requests to one host
+            parse_workers (int): Size of the parse thread pool
+            parse_processes (int): Size of the parse process pool; 0 parses on threads
+            policies (DomainPolicyCache): Per-host robots/pacing state; defaults to
+                the process-wide cache so it carries over between crawls
+        """
+        self.scraper = scraper
+        self.max_concurrency = max_concurrency or settings.SCRAPER_MAX_CONCURRENCY
+        self.per_host_connections = per_host_connections or settings.SCRAPER_PER_HOST_CONNECTIONS
+        self.politeness_delay = (
+            settings.SCRAPER_POLITENESS_DELAY if politeness_delay is None else politeness_delay
+        )
+        self.parse_workers = parse_workers or settings.SCRAPER_PARSE_WORKERS
+        self.parse_processes = (
+            settings.SCRAPER_PARSE_PROCESSES if parse_processes is None else parse_processes
+        )
+        self.cache = cache
+        self.policies = domain_policies if policies is None else policies
+        self.user_agent = scraper.headers.get('User-Agent', '*')
+        self.hosts = {}
+        self.stats = {
+            'sites_total': 0,
+            'sites_done': 0,
+            'pages_fetched': 0,
+            'pages_unchanged': 0,
+            'fetch_errors': 0,
+            'urls_skipped': 0,
+            'feeds_fetched': 0,
+            'feed_entries': 0,
+            'entries_filtered': 0,
+            'robots_blocked': 0,
+            'responses_rejected': 0,
+            'breaker_skipped': 0,
+            'throttle_skipped': 0,
+            'articles_parsed': 0,
+            'articles_accepted': 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Sessions and host bookkeeping
+    # ------------------------------------------------------------------
+
+    def _new_session(self):
+        """Keep-alive session with a connection pool sized to the per-host limit."""
+        session = requests.Session()
+        session.headers.update(self.scraper.headers)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.per_host_connections)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def _host(self, host):
+        state = self.hosts.get(host)
+        if state is None:
+            state = HostState(host, self._new_session())
+            self.hosts[host] = state
+        return state
+
+    def _close_sessions(self):
+        for state in self.hosts.values():
+            state.session.close()
+
+    # ------------------------------------------------------------------
+    # Worker functions (run on pool threads)
+    # ------------------------------------------------------------------
+
+    def _fetch(self, task, session):
+        """Returns (body, validators); body is None for an unchanged homepage."""
+        if not self.policies.allowed(task.url, session, self.user_agent):
+            raise RobotsDisallowed(task.url)
+        accept = FEED_CONTENT_TYPES if task.kind == CrawlTask.FEED else HTML_CONTENT_TYPES
+        try:
+            if task.kind in (CrawlTask.HOMEPAGE, CrawlTask.FEED):
+                if self.cache is not None:
+                    result = self.scraper.fetch_conditional(
+                        task.url, self.cache, session=session, timeout=10, accept=accept
+                    )
+                else:
+                    result = self.scraper.fetch_html(task.url, session=session, timeout=10, accept=accept), None
+            else:
+                result = self.scraper.fetch_html(task.url, session=session), None
+        except ResponseRejected:
+            # The host answered fine; the page just isn't worth reading
+            self.policies.record_success(task.host)
+            raise
+        except requests.HTTPError as e:
+            response = e.response
+            if response is None:
+                self.policies.record_failure(task.host)
+            else:
+                self.policies.record_failure(
+                    task.host, response.status_code, response.headers.get('Retry-After')
+                )
+            raise
+        except requests.RequestException:
+            self.policies.record_failure(task.host)
+            raise
+        self.policies.record_success(task.host)
+        return result
+
+    def _use_processes(self):
+        # Daemonic processes (e.g. Celery prefork workers) cannot have children
+        return bool(self.parse_processes) and not multiprocessing.current_process().daemon
+
+    def _new_thread_parse_pool(self):
+        return ThreadPoolExecutor(max_workers=self.parse_workers, thread_name_prefix='crawl-parse')
+
+    @staticmethod
+    def _submit_parse(pool, task, html, links_per_site):
+        # Module-level functions only, so work can be pickled to a process pool
+        if task.kind == CrawlTask.HOMEPAGE:
+            return pool.submit(parse_homepage, html, task.url, links_per_site)
+        if task.kind == CrawlTask.FEED:
+            return pool.submit(parse_feed, html, task.url)
+        return pool.submit(parse_article, html, task.url)
+
+    # ------------------------------------------------------------------
+    # Main loop
+    # ------------------------------------------------------------------
+
+    def crawl(self, websites, on_article, max_articles=None, links_per_site=10, skip_urls=None,
+              entry_filter=None, on_progress=None, progress_interval=1.0, deadline=None):
+        """
+        Crawl websites and collect accepted articles.
+
+        Args:
+            websites (list): Homepage URLs (with scheme)
+            on_article (callable): Called with each parsed article dict on the
+                scheduling thread; return True to keep the article
+            max_articles (int): Stop once this many articles are accepted
+            links_per_site (int): Maximum article links to follow per homepage or feed
+            skip_urls (callable): Called with a list of newly discovered article
+                URLs on the scheduling thread; returns the subset not to fetch
+            entry_filter (callable): Called with each feed entry dict (url, title,
+                summary, published); return True to fetch the article. Entries
+                without title or summary (plain sitemap URLs) are always fetched
+                and judged by on_article
+            on_progress (callable): Called as on_progress(stats, accepted) on the
+                scheduling thread at most every progress_interval seconds, and
+                once more when the crawl ends
+            progress_interval (float): Minimum seconds between progress calls
+            deadline (float): time.monotonic() value after which hosts paused
+                by Retry-After are no longer waited for
+
+        Returns:
+            list: Accepted article data dictionaries
+        """
+        accepted = []
+        seen_urls = set()
+        site_pending = {}
+        homepage_links = {}  # site -> links from its homepage, for feed fallback
+        fallback_sites = set()
+        ready_heap = []  # (ready_at, host) for hosts waiting on politeness delay
+        futures = {}
+        in_flight = 0
+        stopped = False
+        last_progress = time.monotonic()
+
+        self.stats['sites_total'] = len(websites)
+
+        def enqueue(task):
+            state = self._host(task.host)
+            state.queue.append(task)
+            site_pending[task.site] = site_pending.get(task.site, 0) + 1
+
+        def finish(task):
+            site_pending[task.site] -= 1
+            if site_pending[task.site] == 0:
+                self.stats['sites_done'] += 1
+
+        def queue_links(task, links, limit=None):
+            if not links:
+                logger.warning(f"No articles found on {task.url}")
+                return
+            new_urls = [url for url in links if url not in seen_urls]
+            seen_urls.update(new_urls)
+            skipped = skip_urls(new_urls) if (skip_urls and new_urls) else set()
+            self.stats['urls_skipped'] += len(skipped)
+            fresh = [url for url in new_urls if url not in skipped]
+            for url in fresh[:limit]:
+                enqueue(CrawlTask(CrawlTask.ARTICLE, url, task.site))
+
+        def queue_feeds(task, feeds):
+            for url in feeds:
+                if url not in seen_urls:
+                    seen_urls.add(url)
+                    enqueue(CrawlTask(CrawlTask.FEED, url, task.site))
+
+        def fall_back(task):
+            """A feed failed: scrape the site's homepage links instead (once)"""
+            if task.site in fallback_sites:
+                return
+            fallback_sites.add(task.site)
+            logger.warning(f"Feed {task.url} unusable, falling back to homepage {task.site}")
+            if task.site in homepage_links:
+                queue_links(task, homepage_links[task.site])
+            else:
+                enqueue(CrawlTask(CrawlTask.HOMEPAGE, task.site, task.site, discover=False))
+
+        def homepage_feeds(task, feeds):
+            """Feeds linked from the homepage plus news sitemaps from robots.txt"""
+            if not task.discover:
+                return []
+            sitemaps = [url for url in self.policies.sitemaps(task.host) if is_news_sitemap(url)]
+            return list(dict.fromkeys(list(feeds) + sitemaps))
+
+        def handle_homepage(task, links, feeds):
+            homepage_links[task.site] = links
+            if feeds:
+                queue_feeds(task, feeds)
+            else:
+                queue_links(task, links)
+
+        def handle_feed(task, entries, sitemaps):
+            queue_feeds(task, sitemaps)
+            if not entries and not sitemaps:
+                fall_back(task)
+                return
+            self.stats['feed_entries'] += len(entries)
+            if entry_filter:
+                # Nothing to filter on before fetching, e.g. a plain sitemap <url>
+                matching = [
+                    entry for entry in entries
+                    if not (entry['title'] or entry['summary']) or entry_filter(entry)
+                ]
+                self.stats['entries_filtered'] += len(entries) - len(matching)
+            else:
+                matching = entries
+            if matching:
+                queue_links(task, [entry['url'] for entry in matching], limit=links_per_site)
+
+        for website in websites:
+            if website in seen_urls:
+                continue
+            seen_urls.add(website)
+            feeds = cached_feeds(self.cache.get(website)) if self.cache is not None else None
+            if feeds:
+                queue_feeds(CrawlTask(CrawlTask.HOMEPAGE, website, website), feeds)
+            else:
+                enqueue(CrawlTask(CrawlTask.HOMEPAGE, website, website))
+
+        fetch_pool = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix='crawl-fetch')
+        if self._use_processes():
+            parse_pool = get_parse_process_pool(self.parse_processes)
+        else:
+            parse_pool = self._new_thread_parse_pool()
+
+        max_wait = settings.SCRAPER_MAX_RETRY_WAIT
+
+        def drop_queue(state, stat, reason):
+            self.stats[stat] += len(state.queue)
+            logger.warning(f"Skipping {len(state.queue)} URLs on {state.host}: {reason}")
+            while state.queue:
+                finish(state.queue.popleft())
+
+        def dispatch():
+            nonlocal in_flight
+            now = time.monotonic()
+            for state in self.hosts.values():
+                if state.queue and self.policies.is_tripped(state.host):
+                    # Failing host: drop its remaining work for this crawl
+                    drop_queue(state, 'breaker_skipped', 'circuit breaker open')
+                    continue
+                not_before = self.policies.not_before(state.host)
+                if state.queue and (
+                    not_before - now > max_wait or (deadline is not None and not_before > deadline)
+                ):
+                    # Throttled for longer than this crawl will wait
+                    drop_queue(state, 'throttle_skipped', f"throttled for {not_before - now:.0f}s")
+                    continue
+                while (
+                    state.queue
+                    and in_flight < self.max_concurrency
+                    and state.in_flight < self.per_host_connections
+                ):
+                    ready_at = max(state.ready_at, not_before)
+                    if ready_at > now:
+                        heapq.heappush(ready_heap, (ready_at, state.host))
+                        break
+                    task = state.queue.popleft()
+                    state.in_flight += 1
+                    state.ready_at = now + self.policies.delay(state.host, self.politeness_delay, self.user_agent)
+                    in_flight += 1
+                    future = fetch_pool.submit(self._fetch, task, state.session)
+                    futures[future] = ('fetch', task)
+
+        try:
+            while not stopped:
+                dispatch()
+
+                if not futures:
+                    if not any(state.queue for state in self.hosts.values()):
+                        break
+                    # Only hosts waiting on their politeness delay remain
+                    next_ready = ready_heap[0][0] if ready_heap else time.monotonic()
+                    time.sleep(max(0.0, next_ready - time.monotonic()))
+                    ready_heap.clear()
+                    continue
+
+                timeout = None
+                if ready_heap:
+                    timeout = max(0.0, ready_heap[0][0] - time.monotonic())
+                done, _ = wait(list(futures), timeout=timeout, return_when=FIRST_COMPLETED)
+                ready_heap.clear()
+
+                for future in done:
+                    stage, task = futures.pop(future)
+
+                    if stage == 'fetch':
+                        in_flight -= 1
+                        self.hosts[task.host].in_flight -= 1
+                        try:
+                            html, validators = future.result()
+                        except RobotsDisallowed:
+                            self.stats['robots_blocked'] += 1
+                            logger.info(f"Disallowed by robots.txt: {task.url}")
+                            if task.kind == CrawlTask.FEED:
+                                fall_back(task)
+                            finish(task)
+                            continue
+                        except ResponseRejected as e:
+                            self.stats['responses_rejected'] += 1
+                            logger.info(str(e))
+                            if task.kind == CrawlTask.FEED:
+                                fall_back(task)
+                            finish(task)
+                            continue
+                        except Exception as e:
+                            self.stats['fetch_errors'] += 1
+                            log = logger.error if task.kind == CrawlTask.HOMEPAGE else logger.warning
+                            log(f"Error fetching {task.kind} {task.url}: {str(e)}")
+                            if task.kind == CrawlTask.FEED:
+                                fall_back(task)
+                            finish(task)
+                            continue
+                        self.stats['pages_fetched'] += 1
+                        if task.kind == CrawlTask.FEED:
+                            self.stats['feeds_fetched'] += 1
+                        if html is None:
+                            # Unchanged homepage or feed: reuse cached results, skip parsing
+                            self.stats['pages_unchanged'] += 1
+                            logger.debug(f"{task.kind.capitalize()} unchanged, reusing cached results: {task.url}")
+                            if task.kind == CrawlTask.FEED:
+                                handle_feed(task, validators.get('entries', []), [])
+                            else:
+                                handle_homepage(
+                                    task,
+                                    validators.get('links', [])[:links_per_site],
+                                    homepage_feeds(task, validators.get('feeds', [])),
+                                )
+                            finish(task)
+                            continue
+                        task.validators = validators
+                        try:
+                            parse_future = self._submit_parse(parse_pool, task, html, links_per_site)
+                        except BrokenProcessPool:
+                            logger.warning("Parse process pool is broken, parsing on threads for this crawl")
+                            discard_parse_process_pool(self.parse_processes)
+                            parse_pool = self._new_thread_parse_pool()
+                            parse_future = self._submit_parse(parse_pool, task, html, links_per_site)
+                        futures[parse_future] = ('parse', task)
+                        continue
+
+                    # Parse stage
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        logger.error(f"Error extracting {task.kind} from {task.url}: {str(e)}")
+                        if task.kind == CrawlTask.FEED:
+                            fall_back(task)
+                        finish(task)
+                        continue
+
+                    if task.kind == CrawlTask.HOMEPAGE:
+                        links, feeds = result
+                        feeds = homepage_feeds(task, feeds)
+                        if self.cache is not None and task.validators:
+                            self.cache.set(task.url, **dict(task.validators, links=links, feeds=feeds))
+                        handle_homepage(task, links, feeds)
+                    elif task.kind == CrawlTask.FEED:
+                        entries, sitemaps = result
+                        if self.cache is not None and task.validators:
+                            self.cache.set(task.url, **dict(task.validators, entries=entries))
+                        handle_feed(task, entries, sitemaps)
+                    else:
+                        self.stats['articles_parsed'] += 1
+                        if result and on_article(result):
+                            accepted.append(result)
+                            self.stats['articles_accepted'] += 1
+                            if max_articles and len(accepted) >= max_articles:
+                                logger.info(f"🎯 Reached max: {max_articles} articles")
+                                stopped = True
+                    finish(task)
+
+                    if stopped:
+                        break
+
+                if on_progress and time.monotonic() - last_progress >= progress_interval:
+                    on_progress(self.stats, accepted)
+                    last_progress = time.monotonic()
+        finally:
+            fetch_pool.shutdown(wait=False, cancel_futures=True)
+            if isinstance(parse_pool, ProcessPoolExecutor):
+                # Leave the shared pool running; just drop this crawl's queued work
+                for future, (stage, _task) in futures.items():
+                    if stage == 'parse':
+                        future.cancel()
+            else:
+                parse_pool.shutdown(wait=False, cancel_futures=True)
+            self._close_sessions()
+
+        if on_progress:
+            on_progress(self.stats, accepted)
+
+        logger.info(
+            f"Crawl finished: {self.stats['sites_done']}/{self.stats['sites_total']} sites, "
+            f"{self.stats['pages_fetched']} pages fetched ({self.stats['pages_unchanged']} unchanged, "
+            f"{self.stats['feeds_fetched']} feeds), {self.stats['entries_filtered']} feed entries filtered out, "
+            f"{self.stats['urls_skipped']} known URLs skipped, {self.stats['robots_blocked']} blocked by robots.txt, "
+            f"{self.stats['breaker_skipped']} skipped by circuit breaker, "
+            f"{self.stats['throttle_skipped']} skipped while throttled, "
+            f"{self.stats['responses_rejected']} responses rejected, {self.stats['fetch_errors']} errors, "
+            f"{self.stats['articles_accepted']} articles accepted"
+        )
+        return accepted
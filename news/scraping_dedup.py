@@ -0,0 +1,212 @@
+"""
+Near-Duplicate Clustering for Scraped Articles
+
+The same wire story arrives from many sources; clustering stops it from being
+approved (and generated) more than once:
+- Content is shingled into overlapping 4-word sequences
+- A 128-value MinHash signature estimates Jaccard similarity between articles
+- Signatures are split into 32 LSH bands of 4 values; each band hash is
+  stored as a MinHashBucket row, so candidates are found with one indexed
+  lookup instead of comparing against every article
+- Candidates within SCRAPER_DEDUP_WINDOW_DAYS whose estimated similarity is
+  at least SCRAPER_DEDUP_THRESHOLD join the candidate's cluster
+
+A cluster is represented by its first article; later copies point at it
+through ScrapedArticle.duplicate_of. Clustering runs incrementally on every
+ingest batch.
+"""
+
+import hashlib
+import logging
+import random
+import zlib
+from array import array
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import MinHashBucket, ScrapedArticle
+from .scraping_matcher import TOKEN_RE
+
+logger = logging.getLogger(__name__)
+
+NUM_PERM = 128
+BANDS = 32
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 4
+
+# Only the start of very long articles is shingled
+MAX_WORDS = 3000
+
+# Universal hash family h(x) = (a * x + b) mod PRIME over 32-bit shingle hashes
+PRIME = (1 << 61) - 1
+MAX_HASH = 0xFFFFFFFF
+_random = random.Random(20250901)  # Fixed seed: signatures are stored and compared across runs
+PERMUTATIONS = [(_random.randrange(1, PRIME), _random.randrange(0, PRIME)) for _ in range(NUM_PERM)]
+
+LOOKUP_BATCH_SIZE = 500
+
+
+def shingles(text):
+    """Set of 32-bit hashes of every SHINGLE_SIZE-word sequence in text"""
+    words = TOKEN_RE.findall(text.lower())[:MAX_WORDS]
+    if len(words) < SHINGLE_SIZE:
+        return {zlib.crc32(' '.join(words).encode('utf-8'))} if words else set()
+    return {
+        zlib.crc32(' '.join(words[i:i + SHINGLE_SIZE]).encode('utf-8'))
+        for i in range(len(words) - SHINGLE_SIZE + 1)
+    }
+
+
+def minhash(text):
+    """
+    MinHash signature of text.
+
+    Returns:
+        array: NUM_PERM unsigned 32-bit values, or None for empty text
+    """
+    hashes = shingles(text)
+    if not hashes:
+        return None
+    return array('I', (
+        min([(a * x + b) % PRIME for x in hashes]) & MAX_HASH
+        for a, b in PERMUTATIONS
+    ))
+
+
+def pack(signature):
+    return signature.tobytes()
+
+
+def unpack(data):
+    signature = array('I')
+    signature.frombytes(bytes(data))
+    return signature
+
+
+def similarity(first, second):
+    """Estimated Jaccard similarity of two signatures"""
+    return sum(1 for x, y in zip(first, second) if x == y) / NUM_PERM
+
+
+def band_buckets(signature):
+    """One signed 64-bit bucket key per band; the band number is part of the hash"""
+    data = pack(signature)
+    width = ROWS * signature.itemsize
+    return [
+        int.from_bytes(
+            hashlib.blake2b(bytes([band]) + data[band * width:(band + 1) * width], digest_size=8).digest(),
+            'big', signed=True,
+        )
+        for band in range(BANDS)
+    ]
+
+
+def article_text(article):
+    return f"{article.title}\n{article.content}"
+
+
+def sign_articles(articles):
+    """Set content_signature on unsaved ScrapedArticle instances"""
+    for article in articles:
+        signature = minhash(article_text(article))
+        article.content_signature = pack(signature) if signature is not None else None
+
+
+def _candidates(buckets_by_article):
+    """
+    Stored articles sharing at least one bucket with the given articles.
+
+    Returns:
+        dict: bucket -> set of article IDs within the dedup window
+    """
+    since = timezone.now() - timedelta(days=settings.SCRAPER_DEDUP_WINDOW_DAYS)
+    all_buckets = list({bucket for buckets in buckets_by_article.values() for bucket in buckets})
+    found = {}
+    for start in range(0, len(all_buckets), LOOKUP_BATCH_SIZE):
+        rows = MinHashBucket.objects.filter(
+            bucket__in=all_buckets[start:start + LOOKUP_BATCH_SIZE],
+            article__scraped_at__gte=since,
+        ).values_list('bucket', 'article_id')
+        for bucket, article_id in rows:
+            found.setdefault(bucket, set()).add(article_id)
+    return found
+
+
+def cluster_articles(articles):
+    """
+    Index newly stored articles and assign them to clusters.
+
+    Articles are matched against stored articles and against earlier articles
+    in the same batch. An article that matches joins the cluster of its most
+    similar match; otherwise it starts a new cluster.
+
+    Args:
+        articles (list): Saved ScrapedArticle instances with content_signature set
+
+    Returns:
+        int: Number of articles marked as duplicates
+    """
+    signatures = {}
+    buckets_by_article = {}
+    for article in articles:
+        if article.content_signature:
+            signatures[article.pk] = unpack(article.content_signature)
+            buckets_by_article[article.pk] = band_buckets(signatures[article.pk])
+    if not signatures:
+        return 0
+
+    stored = _candidates(buckets_by_article)
+    candidate_ids = {pk for ids in stored.values() for pk in ids} - set(signatures)
+    clusters = {}  # article ID -> cluster representative ID
+    for pk, signature, duplicate_of in (
+        ScrapedArticle.objects.filter(pk__in=candidate_ids)
+        .values_list('pk', 'content_signature', 'duplicate_of_id')
+        .iterator()
+    ):
+        if signature:
+            signatures[pk] = unpack(signature)
+            clusters[pk] = duplicate_of or pk
+
+    batch_buckets = {}
+    duplicates = []
+    for article in articles:
+        buckets = buckets_by_article.get(article.pk)
+        if buckets is None:
+            continue
+        candidates = set()
+        for bucket in buckets:
+            candidates.update(stored.get(bucket, ()))
+            candidates.update(batch_buckets.get(bucket, ()))
+        candidates.discard(article.pk)
+
+        best, best_score = None, 0.0
+        for candidate in candidates:
+            if candidate not in clusters:
+                continue
+            score = similarity(signatures[article.pk], signatures[candidate])
+            if score > best_score:
+                best, best_score = candidate, score
+
+        if best is not None and best_score >= settings.SCRAPER_DEDUP_THRESHOLD:
+            article.duplicate_of_id = clusters[best]
+            clusters[article.pk] = clusters[best]
+            duplicates.append(article)
+        else:
+            clusters[article.pk] = article.pk
+        for bucket in buckets:
+            batch_buckets.setdefault(bucket, set()).add(article.pk)
+
+    MinHashBucket.objects.bulk_create(
+        [
+            MinHashBucket(article_id=pk, bucket=bucket)
+            for pk, buckets in buckets_by_article.items()
+            for bucket in buckets
+        ],
+        batch_size=LOOKUP_BATCH_SIZE,
+    )
+    if duplicates:
+        ScrapedArticle.objects.bulk_update(duplicates, ['duplicate_of'], batch_size=LOOKUP_BATCH_SIZE)
+        logger.info(f"Clustered {len(duplicates)} of {len(signatures)} new articles as near-duplicates")
+    return len(duplicates)
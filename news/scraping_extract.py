@@ -0,0 +1,367 @@
+"""
+Fast HTML Extraction for News Scraping
+
+Lighter-weight replacements for the BeautifulSoup paths in NewsArticleScraper:
+- Link-only streaming pass over homepages (stdlib HTMLParser, stops early),
+  which also picks up advertised RSS/Atom feeds
+- lxml article parsing with single-pass <meta>/JSON-LD metadata extraction
+  and XPath fallbacks mirroring the original CSS selectors
+- Module-level, picklable entry points so the crawler can run parsing in a
+  process pool
+
+When lxml is not installed, article parsing falls back to
+NewsArticleScraper.parse_article_html (BeautifulSoup).
+"""
+
+import json
+import logging
+import re
+from datetime import datetime, timezone as dt_timezone
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlparse
+
+try:
+    from lxml import etree
+    from lxml import html as lxml_html
+except ImportError:  # pragma: no cover - optional dependency
+    etree = None
+    lxml_html = None
+
+logger = logging.getLogger(__name__)
+
+# <link rel="alternate"> types advertising a feed
+FEED_TYPES = {'application/rss+xml', 'application/atom+xml'}
+
+FEED_CHUNK_SIZE = 64 * 1024
+
+# Image candidates kept per article; scraping_images narrows them down later
+MAX_IMAGE_CANDIDATES = 10
+
+EXCLUDE_URL_PATTERNS = (
+    '/tag/', '/category/', '/author/', '/page/',
+    '/wp-content/', '/wp-includes/', '/static/',
+    '/assets/', '/images/', '/css/', '/js/',
+    '/login', '/register', '/search', '/contact',
+    '.jpg', '.png', '.gif', '.pdf', '.xml', '.json'
+)
+
+INCLUDE_URL_PATTERNS = (
+    '/article/', '/news/', '/post/', '/blog/',
+    '/story/', '/2024/', '/2025/',  # Year in URL often indicates article
+)
+
+# <meta> keys collected in the single metadata pass
+META_KEYS = {
+    'og:title', 'twitter:title', 'og:image',
+    'author', 'article:author',
+    'article:published_time', 'publish_date',
+}
+
+JSON_LD_ARTICLE_TYPES = {'Article', 'NewsArticle', 'BlogPosting', 'ReportageNewsArticle'}
+
+# XPath equivalents of the content selectors in NewsArticleScraper._extract_content
+CONTENT_QUERIES = (
+    '(//article)[1]',
+    "(//div[re:test(@class, 'article|content|post|entry', 'i')])[1]",
+    "(//div[re:test(@id, 'article|content|post|entry', 'i')])[1]",
+    '(//main)[1]',
+)
+REGEX_NS = {'re': 'http://exslt.org/regular-expressions'}
+CHARSET_RE = re.compile(rb'<meta[^>]+charset=["\']?([A-Za-z0-9_-]+)', re.I)
+
+
+def is_article_url(url):
+    """Check if URL looks like an article"""
+    url_lower = url.lower()
+
+    # Exclude if matches exclude patterns
+    if any(pattern in url_lower for pattern in EXCLUDE_URL_PATTERNS):
+        return False
+
+    # Include if matches common article patterns
+    if any(pattern in url_lower for pattern in INCLUDE_URL_PATTERNS):
+        return True
+
+    # Articles usually have 2+ path segments and some meaningful length
+    path = urlparse(url).path
+    segments = [s for s in path.split('/') if s]
+    return len(segments) >= 2 and len(path) > 20
+
+
+def decode_html(html):
+    """Decode a page body using its <meta charset>, defaulting to UTF-8"""
+    if isinstance(html, str):
+        return html
+    match = CHARSET_RE.search(html[:2048])
+    encoding = match.group(1).decode('ascii') if match else 'utf-8'
+    try:
+        return html.decode(encoding, errors='replace')
+    except LookupError:
+        return html.decode('utf-8', errors='replace')
+
+
+# ============================================================================
+# Homepage link extraction
+# ============================================================================
+
+class _LinkCollector(HTMLParser):
+    """Collects article-like <a href> targets and <link> feeds, nothing else"""
+
+    def __init__(self, base_url, max_results):
+        super().__init__(convert_charrefs=True)
+        self.base_url = base_url
+        self.max_results = max_results
+        self.links = []
+        self.feeds = []
+        self._seen = set()
+        self.done = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'link':
+            self._handle_feed_link(dict(attrs))
+            return
+        if tag != 'a' or self.done:
+            return
+        for name, value in attrs:
+            if name == 'href' and value:
+                url = urljoin(self.base_url, value.strip())
+                if url not in self._seen and is_article_url(url):
+                    self._seen.add(url)
+                    self.links.append(url)
+                    if len(self.links) >= self.max_results:
+                        self.done = True
+                return
+
+    def _handle_feed_link(self, attrs):
+        rel = (attrs.get('rel') or '').lower().split()
+        feed_type = (attrs.get('type') or '').lower().strip()
+        href = (attrs.get('href') or '').strip()
+        if 'alternate' in rel and feed_type in FEED_TYPES and href:
+            url = urljoin(self.base_url, href)
+            if url not in self.feeds:
+                self.feeds.append(url)
+
+
+def _collect_links(html, base_url, max_results):
+    text = decode_html(html)
+    collector = _LinkCollector(base_url, max_results)
+    for start in range(0, len(text), FEED_CHUNK_SIZE):
+        collector.feed(text[start:start + FEED_CHUNK_SIZE])
+        if collector.done:
+            break
+    return collector
+
+
+def extract_links(html, base_url, max_results=5):
+    """
+    Collect article links from a homepage without building a document tree.
+
+    The page is fed to the parser in chunks and parsing stops as soon as
+    max_results links have been found.
+
+    Args:
+        html (bytes|str): Homepage body
+        base_url (str): URL the page was fetched from
+        max_results (int): Maximum number of links to return
+
+    Returns:
+        list: Article URLs in document order
+    """
+    return _collect_links(html, base_url, max_results).links
+
+
+# ============================================================================
+# Article extraction
+# ============================================================================
+
+def _iter_json_ld(value):
+    """Yield every JSON-LD object, descending into lists and @graph"""
+    if isinstance(value, list):
+        for item in value:
+            yield from _iter_json_ld(item)
+    elif isinstance(value, dict):
+        yield value
+        if '@graph' in value:
+            yield from _iter_json_ld(value['@graph'])
+
+
+def _json_ld_article(text):
+    """Return the first Article-like JSON-LD object in a script body"""
+    try:
+        data = json.loads(text)
+    except (TypeError, ValueError):
+        return None
+    for obj in _iter_json_ld(data):
+        types = obj.get('@type')
+        types = types if isinstance(types, list) else [types]
+        if JSON_LD_ARTICLE_TYPES.intersection(t for t in types if isinstance(t, str)):
+            return obj
+    return None
+
+
+def _json_ld_name(value):
+    """Flatten a JSON-LD author/image value to a string"""
+    if isinstance(value, list):
+        value = value[0] if value else None
+    if isinstance(value, dict):
+        return value.get('name') or value.get('url') or ''
+    return value if isinstance(value, str) else ''
+
+
+def _parse_date(value):
+    """Parse an ISO 8601 date, returning an aware datetime or None"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.strip().replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=dt_timezone.utc)
+    return parsed
+
+
+def _text(element):
+    return element.text_content().strip()
+
+
+def _extract_metadata(doc):
+    """Single pass over <meta> and JSON-LD <script> tags"""
+    meta = {}
+    ld = None
+    for element in doc.iter('meta', 'script'):
+        if element.tag == 'meta':
+            key = (element.get('property') or element.get('name') or '').strip().lower()
+            if key in META_KEYS and key not in meta:
+                content = (element.get('content') or '').strip()
+                if content:
+                    meta[key] = content
+        elif ld is None and (element.get('type') or '').lower() == 'application/ld+json':
+            ld = _json_ld_article(element.text)
+    return meta, ld or {}
+
+
+def _extract_content(doc, ld):
+    """Main article text: known containers first, then JSON-LD, then any <p>"""
+    for query in CONTENT_QUERIES:
+        found = doc.xpath(query, namespaces=REGEX_NS)
+        if found:
+            text = ' '.join(_text(p) for p in found[0].iter('p'))
+            if len(text) > 200:  # Minimum content length
+                return text
+
+    body = ld.get('articleBody')
+    if isinstance(body, str) and len(body) > 200:
+        return body.strip()
+
+    return ' '.join(_text(p) for p in doc.xpath('(//p)[position() <= 10]'))
+
+
+def _extract_images(doc, meta, ld, base_url):
+    images = []
+    for src in (meta.get('og:image'), _json_ld_name(ld.get('image'))):
+        if src:
+            full_url = urljoin(base_url, src)
+            if full_url not in images:
+                images.append(full_url)
+    for img in doc.iter('img'):
+        src = img.get('src') or img.get('data-src')
+        if src and not src.startswith('data:'):
+            full_url = urljoin(base_url, src)
+            if full_url not in images:
+                images.append(full_url)
+    return images
+
+
+def _extract_author(doc, meta, ld):
+    author = meta.get('author') or meta.get('article:author') or _json_ld_name(ld.get('author'))
+    if author:
+        return author
+    for query in ("(//span[re:test(@class, 'author', 'i')])[1]", "(//a[@rel='author'])[1]"):
+        found = doc.xpath(query, namespaces=REGEX_NS)
+        if found:
+            return _text(found[0]) or 'Unknown'
+    return 'Unknown'
+
+
+def _extract_date(doc, meta, ld):
+    for value in (meta.get('article:published_time'), meta.get('publish_date'), ld.get('datePublished')):
+        parsed = _parse_date(value if isinstance(value, str) else None)
+        if parsed:
+            return parsed
+    for element in doc.iter('time'):
+        parsed = _parse_date(element.get('datetime') or element.text_content())
+        if parsed:
+            return parsed
+        break
+    return datetime.now(dt_timezone.utc)
+
+
+def extract_article(html, url):
+    """
+    Extract article data with lxml.
+
+    Produces the same dictionary as NewsArticleScraper.parse_article_html.
+
+    Args:
+        html (bytes|str): Article page body
+        url (str): URL the page was fetched from
+
+    Returns:
+        dict: Article data
+    """
+    if isinstance(html, str):
+        html = html.encode('utf-8')
+    doc = lxml_html.fromstring(html)
+
+    # Metadata lives in <head> and JSON-LD scripts, so read it before stripping
+    meta, ld = _extract_metadata(doc)
+    etree.strip_elements(doc, 'script', 'style', 'nav', 'footer', 'header', with_tail=False)
+
+    title = meta.get('og:title') or meta.get('twitter:title') or ld.get('headline')
+    if not title:
+        heading = doc.find('.//h1')
+        if heading is None:
+            heading = doc.find('.//title')
+        title = _text(heading) if heading is not None else 'Untitled Article'
+
+    content = _extract_content(doc, ld)
+    summary = content[:500] + "..." if len(content) > 500 else content
+
+    return {
+        'title': title.strip(),
+        'content': content,
+        'summary': summary,
+        'source_url': url,
+        'source_website': urlparse(url).netloc,
+        'author': _extract_author(doc, meta, ld),
+        'published_date': _extract_date(doc, meta, ld),
+        'image_urls': _extract_images(doc, meta, ld, url)[:MAX_IMAGE_CANDIDATES],
+    }
+
+
+# ============================================================================
+# Parse pool entry points
+# ============================================================================
+
+def parse_homepage(html, url, max_results):
+    """Parse pool entry point for homepages; returns (article links, feed URLs)"""
+    collector = _collect_links(html, url, max_results)
+    return collector.links, collector.feeds
+
+
+def parse_article(html, url):
+    """Parse pool entry point for articles; uses BeautifulSoup without lxml"""
+    if lxml_html is None:
+        from .scraping_utils import NewsArticleScraper
+        return NewsArticleScraper().parse_article_html(html, url)
+    return extract_article(html, url)
+
+
+def init_parse_worker():
+    """Process pool initializer: the soup fallback needs configured Django settings"""
+    if lxml_html is None:
+        import django
+        from django.apps import apps
+        if not apps.ready:
+            django.setup()
@@ -0,0 +1,190 @@
+"""
+Feed and Sitemap Discovery for News Scraping
+
+Cheaper article discovery than parsing homepages:
+- RSS / Atom feeds advertised with <link rel="alternate"> on the homepage
+- News sitemaps listed as Sitemap: lines in robots.txt (sitemap indexes are
+  followed one level down)
+- Feed entries carry canonical URLs, titles, summaries and publication
+  dates, so keywords can be matched before any article is downloaded
+
+Discovered feed URLs are kept on the homepage's HttpResponseCache entry for
+SCRAPER_FEED_DISCOVERY_TTL hours. ConcurrentCrawler falls back to homepage
+scraping for sites without feeds, or whose feeds fail.
+"""
+
+import html
+import logging
+import re
+from datetime import datetime, timedelta, timezone as dt_timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urljoin
+
+from django.conf import settings
+from django.utils import timezone
+
+try:
+    from lxml import etree
+except ImportError:  # pragma: no cover - optional dependency
+    etree = None
+    from xml.etree import ElementTree
+
+logger = logging.getLogger(__name__)
+
+TAG_RE = re.compile(r'<[^>]+>')
+WHITESPACE_RE = re.compile(r'\s+')
+
+
+def is_news_sitemap(url):
+    """robots.txt often lists every sitemap; only news sitemaps are small enough to poll"""
+    return 'news' in url.lower()
+
+
+def cached_feeds(entry):
+    """
+    Feed URLs recorded on a homepage cache entry, if still fresh.
+
+    Returns:
+        list: Feed URLs, or None when discovery has to run again
+    """
+    if not entry or not entry.get('feeds'):
+        return None
+    try:
+        discovered_at = datetime.fromisoformat(entry['fetched_at'])
+    except (KeyError, TypeError, ValueError):
+        return None
+    if timezone.now() - discovered_at > timedelta(hours=settings.SCRAPER_FEED_DISCOVERY_TTL):
+        return None
+    return entry['feeds']
+
+
+# ============================================================================
+# Feed parsing
+# ============================================================================
+
+def _local(tag):
+    """Tag name without its XML namespace"""
+    return tag.rsplit('}', 1)[-1] if isinstance(tag, str) else ''
+
+
+def _children(element):
+    return {_local(child.tag): child for child in element}
+
+
+def _child_text(children, *names):
+    for name in names:
+        child = children.get(name)
+        if child is not None and child.text and child.text.strip():
+            return child.text.strip()
+    return ''
+
+
+def _plain_text(value):
+    """Strip markup from a feed title/summary"""
+    return WHITESPACE_RE.sub(' ', html.unescape(TAG_RE.sub(' ', value or ''))).strip()
+
+
+def _parse_feed_date(value):
+    """RFC 822 (RSS) or ISO 8601 (Atom, sitemaps) date as an ISO string, or ''"""
+    if not value:
+        return ''
+    value = value.strip()
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        try:
+            parsed = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return ''
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=dt_timezone.utc)
+    return parsed.astimezone(dt_timezone.utc).isoformat()
+
+
+def _atom_link(element):
+    for child in element:
+        if _local(child.tag) == 'link' and child.get('rel', 'alternate') == 'alternate' and child.get('href'):
+            return child.get('href')
+    return ''
+
+
+def _parse_tree(body):
+    if etree is not None:
+        parser = etree.XMLParser(recover=True, resolve_entities=False, no_network=True)
+        return etree.fromstring(body, parser=parser)
+    return ElementTree.fromstring(body)
+
+
+def parse_feed(body, url):
+    """
+    Parse an RSS, Atom or (news) sitemap document.
+
+    Args:
+        body (bytes): Document body
+        url (str): URL the document was fetched from
+
+    Returns:
+        tuple: (entries, sitemaps) where entries is a list of dicts with url,
+            title, summary and published (ISO string or ''), newest first, and
+            sitemaps lists child news sitemaps from a sitemap index
+    """
+    if isinstance(body, str):
+        body = body.encode('utf-8')
+    root = _parse_tree(body.strip())
+    if root is None:
+        return [], []
+
+    entries = []
+    sitemaps = []
+    for element in root.iter():
+        name = _local(element.tag)
+        if name == 'item':  # RSS
+            children = _children(element)
+            link = _child_text(children, 'link', 'guid')
+            entries.append({
+                'url': link,
+                'title': _child_text(children, 'title'),
+                'summary': _child_text(children, 'description', 'encoded'),
+                'published': _parse_feed_date(_child_text(children, 'pubDate', 'date')),
+            })
+        elif name == 'entry':  # Atom
+            children = _children(element)
+            entries.append({
+                'url': _atom_link(element),
+                'title': _child_text(children, 'title'),
+                'summary': _child_text(children, 'summary', 'content'),
+                'published': _parse_feed_date(_child_text(children, 'published', 'updated')),
+            })
+        elif name == 'url':  # Sitemap <urlset>
+            children = _children(element)
+            news = children.get('news')
+            news_children = _children(news) if news is not None else {}
+            entries.append({
+                'url': _child_text(children, 'loc'),
+                'title': _child_text(news_children, 'title'),
+                'summary': _child_text(news_children, 'keywords'),
+                'published': _parse_feed_date(
+                    _child_text(news_children, 'publication_date') or _child_text(children, 'lastmod')
+                ),
+            })
+        elif name == 'sitemap':  # Sitemap index
+            loc = _child_text(_children(element), 'loc')
+            if loc and is_news_sitemap(loc):
+                sitemaps.append(urljoin(url, loc))
+
+    results = []
+    seen = set()
+    for entry in entries:
+        if not entry['url']:
+            continue
+        entry['url'] = urljoin(url, entry['url'].strip())
+        if entry['url'] in seen:
+            continue
+        seen.add(entry['url'])
+        entry['title'] = _plain_text(entry['title'])
+        entry['summary'] = _plain_text(entry['summary'])[:1000]
+        results.append(entry)
+
+    # UTC ISO strings sort chronologically; undated entries go last
+    results.sort(key=lambda entry: entry['published'], reverse=True)
+    return results, sitemaps
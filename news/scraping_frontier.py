@@ -0,0 +1,91 @@
+"""
+Persistent Scrape Frontier
+
+Remembers which article URLs each NewsSourceConfig has already fetched:
+- Rejected articles are recorded when the crawl ends; accepted ones are
+  recognized by their stored ScrapedArticle, so an article is only skipped
+  once it is actually saved
+- URLs are normalized and stored as SHA-1 hashes (SeenURL table)
+- Lookups happen in batches before any article is downloaded
+- Articles stored by any config (ScrapedArticle.source_url) are skipped too
+"""
+
+import hashlib
+import logging
+from urllib.parse import urlsplit, urlunsplit
+
+from .models import ScrapedArticle, SeenURL
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+
+
+def normalize_url(url):
+    """Lowercase scheme and host, drop the fragment and any trailing slash"""
+    parts = urlsplit(url.strip())
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, parts.query, ''))
+
+
+def url_hash(url):
+    """SHA-1 hex digest of the normalized URL"""
+    return hashlib.sha1(normalize_url(url).encode('utf-8')).hexdigest()
+
+
+class URLFrontier:
+    """
+    Seen-URL set for one news source configuration.
+
+    Usage:
+        frontier = URLFrontier(config)
+        to_fetch = [u for u in urls if u not in frontier.filter_seen(urls)]
+        ...
+        frontier.mark_seen(rejected_urls)
+    """
+
+    def __init__(self, config):
+        self.config = config
+
+    def filter_seen(self, urls):
+        """
+        Find which URLs should not be fetched again.
+
+        Args:
+            urls (list): Candidate article URLs
+
+        Returns:
+            set: URLs already seen by this config or already stored as articles
+        """
+        urls = list(urls)
+        seen = set()
+        for start in range(0, len(urls), BATCH_SIZE):
+            batch = urls[start:start + BATCH_SIZE]
+            hashes = {url_hash(url): url for url in batch}
+            known = SeenURL.objects.filter(
+                source_config=self.config,
+                url_hash__in=list(hashes),
+            ).values_list('url_hash', flat=True)
+            seen.update(hashes[h] for h in known)
+            seen.update(
+                ScrapedArticle.objects.filter(source_url__in=batch)
+                .values_list('source_url', flat=True)
+            )
+        return seen
+
+    def mark_seen(self, urls):
+        """Record fetched article URLs not to fetch again; already-known URLs are ignored"""
+        hashes = {url_hash(url) for url in urls}
+        if not hashes:
+            return
+        SeenURL.objects.bulk_create(
+            [SeenURL(source_config=self.config, url_hash=h) for h in hashes],
+            batch_size=BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+        logger.debug(f"Frontier: recorded {len(hashes)} URLs for {self.config}")
+
+    def reset(self):
+        """Forget all seen URLs, e.g. after the config's keywords change"""
+        deleted, _ = SeenURL.objects.filter(source_config=self.config).delete()
+        return deleted
@@ -0,0 +1,353 @@
+"""
+Image Verification for Scraped Articles
+
+Article pages list every <img>: tracking pixels, logos, icons and the same
+photo at several sizes. A background pass keeps only usable images:
+- Each image is requested with a streamed GET; the type and size headers are
+  checked first, then the dimensions are read from the first chunk and the
+  download is abandoned if the image is too small or badly proportioned
+- Images that pass are read in full (capped at SCRAPER_MAX_RESPONSE_BYTES)
+  once, for a 64-bit difference hash (dHash)
+- Copies of a picture within an article (resized, re-encoded) are collapsed,
+  and across the corpus every copy resolves to the URL of the largest copy
+  stored with its hash
+- Each article keeps its SCRAPER_IMAGE_KEEP largest distinct images; URLs
+  too long to store are dropped unprobed
+
+Probe results are stored as ScrapedImage rows keyed by URL, so an image shared
+by many articles is fetched once. Images are probed outside any transaction;
+only storing the results is atomic. A batch whose results cannot be stored is
+saved article by article, and an article that still fails is marked verified
+with its URLs unchanged, so one bad row cannot stall the queue. Runs claim
+their articles (images_claimed_at), so overlapping beat ticks never probe
+the same ones. Runs as the verify_scraped_images beat task.
+"""
+
+import io
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+import requests
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from PIL import Image, ImageFile, UnidentifiedImageError
+from requests.adapters import HTTPAdapter
+
+from .models import ScrapedArticle, ScrapedImage
+from .scraping_utils import NewsArticleScraper
+
+logger = logging.getLogger(__name__)
+
+IMAGE_CONTENT_TYPES = ('image/jpeg', 'image/png', 'image/webp', 'image/gif')
+IMAGE_FORMATS = ('JPEG', 'MPO', 'PNG', 'WEBP', 'GIF')
+
+# Anything smaller is a tracking pixel or an icon, whatever its dimensions
+MIN_IMAGE_BYTES = 1024
+HEADER_CHUNK_SIZE = 16 * 1024
+
+HASH_SIZE = 8
+HASH_MASK = (1 << 64) - 1
+# dHash bits that may differ between two renditions of the same picture
+HASH_DISTANCE = 6
+
+# Beyond roughly 1200x675 a bigger image is not a better one; page order decides
+RANK_AREA_CAP = 1200 * 675
+
+FAILED_RETRY = timedelta(hours=24)
+
+MAX_URL_LENGTH = ScrapedImage._meta.get_field('url').max_length
+
+
+class ImageRejected(Exception):
+    """An image is unusable: wrong type, too small or badly proportioned"""
+
+
+def dhash(image):
+    """
+    Difference hash: one bit per horizontally adjacent pixel pair of a
+    9x8 grayscale thumbnail.
+
+    Returns:
+        int: Signed 64-bit hash (fits a BigIntegerField)
+    """
+    image.draft('L', (HASH_SIZE * 8, HASH_SIZE * 8))  # JPEG: decode at reduced scale
+    pixels = image.convert('L').resize((HASH_SIZE + 1, HASH_SIZE), Image.Resampling.LANCZOS).tobytes()
+    value = 0
+    for row in range(HASH_SIZE):
+        for col in range(HASH_SIZE):
+            offset = row * (HASH_SIZE + 1) + col
+            value = (value << 1) | (pixels[offset] > pixels[offset + 1])
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def hamming(first, second):
+    return ((first ^ second) & HASH_MASK).bit_count()
+
+
+def _check_dimensions(width, height):
+    if width < settings.SCRAPER_IMAGE_MIN_WIDTH or height < settings.SCRAPER_IMAGE_MIN_HEIGHT:
+        raise ImageRejected(f"Too small ({width}x{height})")
+    if max(width, height) > min(width, height) * settings.SCRAPER_IMAGE_MAX_ASPECT:
+        raise ImageRejected(f"Banner or strip proportions ({width}x{height})")
+
+
+def _read_image(response, result):
+    """Stream an image body, stopping as soon as its header rules it out"""
+    content_type = response.headers.get('Content-Type', '').split(';', 1)[0].strip().lower()
+    result['content_type'] = content_type[:50]
+    if content_type and content_type not in IMAGE_CONTENT_TYPES:
+        raise ImageRejected(f"Unsupported content type {content_type}")
+
+    max_bytes = settings.SCRAPER_MAX_RESPONSE_BYTES
+    declared = response.headers.get('Content-Length', '')
+    if declared.isdigit():
+        if int(declared) < MIN_IMAGE_BYTES:
+            raise ImageRejected(f"Only {declared} bytes")
+        if int(declared) > max_bytes:
+            raise ImageRejected(f"{declared} bytes exceeds {max_bytes}")
+
+    parser = ImageFile.Parser()
+    body = bytearray()
+    for chunk in response.iter_content(chunk_size=HEADER_CHUNK_SIZE):
+        body += chunk
+        if len(body) > max_bytes:
+            raise ImageRejected(f"Exceeds {max_bytes} bytes")
+        if parser.image is None:
+            parser.feed(chunk)
+            if parser.image is not None:
+                if parser.image.format not in IMAGE_FORMATS:
+                    raise ImageRejected(f"Unsupported format {parser.image.format}")
+                result['width'], result['height'] = parser.image.size
+                _check_dimensions(*parser.image.size)
+    if len(body) < MIN_IMAGE_BYTES:
+        raise ImageRejected(f"Only {len(body)} bytes")
+    return bytes(body)
+
+
+def probe_image(url, session, headers=None, timeout=10):
+    """
+    Fetch and check one image.
+
+    Args:
+        url (str): Image URL
+        session (requests.Session): Keep-alive session to reuse
+        headers (dict): Request headers
+        timeout (int): Request timeout in seconds
+
+    Returns:
+        dict: ScrapedImage field values; status is VALID, REJECTED or FAILED
+    """
+    result = {
+        'url': url, 'status': ScrapedImage.Status.FAILED, 'reason': '', 'content_type': '',
+        'width': 0, 'height': 0, 'size_bytes': 0, 'phash': None,
+    }
+    try:
+        with session.get(url, headers=headers, timeout=timeout, stream=True) as response:
+            response.raise_for_status()
+            body = _read_image(response, result)
+        result['size_bytes'] = len(body)
+
+        with Image.open(io.BytesIO(body)) as image:
+            if image.format not in IMAGE_FORMATS:
+                raise ImageRejected(f"Unsupported format {image.format}")
+            result['width'], result['height'] = image.size
+            _check_dimensions(*image.size)
+            result['phash'] = dhash(image)
+        result['status'] = ScrapedImage.Status.VALID
+    except ImageRejected as e:
+        result['status'] = ScrapedImage.Status.REJECTED
+        result['reason'] = str(e)[:255]
+    except UnidentifiedImageError:
+        result['status'] = ScrapedImage.Status.REJECTED
+        result['reason'] = 'Not a readable image'
+    except (OSError, ValueError, Image.DecompressionBombError) as e:
+        # Truncated or corrupt data; OSError also covers connection errors
+        is_http_error = isinstance(e, requests.RequestException)
+        result['status'] = ScrapedImage.Status.FAILED if is_http_error else ScrapedImage.Status.REJECTED
+        result['reason'] = (str(e) or type(e).__name__)[:255]
+    return result
+
+
+def rank_images(urls, images, canonical):
+    """
+    Best distinct images of one article.
+
+    Args:
+        urls (list): Image URLs in page order
+        images (dict): URL -> ScrapedImage
+        canonical (dict): phash -> URL of the largest copy stored with that hash
+
+    Returns:
+        list: At most SCRAPER_IMAGE_KEEP URLs, best first
+    """
+    candidates = [
+        images[url] for url in dict.fromkeys(urls)
+        if url in images and images[url].status == ScrapedImage.Status.VALID
+    ]
+    # Stable sort: equally large images stay in page order (og:image first)
+    candidates.sort(key=lambda image: -min(image.width * image.height, RANK_AREA_CAP))
+
+    kept = []
+    for image in candidates:
+        if any(hamming(image.phash, other.phash) <= HASH_DISTANCE for other in kept):
+            continue  # Another rendition of a picture already kept
+        kept.append(image)
+        if len(kept) == settings.SCRAPER_IMAGE_KEEP:
+            break
+    return list(dict.fromkeys(canonical.get(image.phash, image.url) for image in kept))
+
+
+class ImageVerifier:
+    """
+    Checks the image_urls of scraped articles not yet verified.
+
+    Usage:
+        verified = ImageVerifier().run()
+    """
+
+    def __init__(self, workers=None):
+        self.workers = workers or settings.SCRAPER_IMAGE_WORKERS
+        self.headers = NewsArticleScraper().headers
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=self.workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def _probe_pending(self, urls):
+        """
+        Probe URLs without a usable stored result. Nothing is written, so no
+        transaction is held open across the requests.
+
+        Returns:
+            tuple: (URL -> stored ScrapedImage, list of new probe results)
+        """
+        images = {image.url: image for image in ScrapedImage.objects.filter(url__in=urls)}
+        retry_before = timezone.now() - FAILED_RETRY
+        pending = [
+            url for url in urls
+            if url not in images or (
+                images[url].status == ScrapedImage.Status.FAILED and images[url].checked_at < retry_before
+            )
+        ]
+        if not pending:
+            return images, []
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            results = list(pool.map(lambda url: probe_image(url, self.session, self.headers), pending))
+        valid = sum(1 for result in results if result['status'] == ScrapedImage.Status.VALID)
+        logger.info(f"Probed {len(results)} images: {valid} usable")
+        return images, results
+
+    @staticmethod
+    def _save(articles, images, results):
+        """Store probe results and the articles' ranked image_urls"""
+        if results:
+            fields = [name for name in results[0] if name != 'url'] + ['checked_at']
+            ScrapedImage.objects.bulk_create(
+                [ScrapedImage(**result) for result in results],
+                update_conflicts=True,
+                unique_fields=['url'],
+                update_fields=fields,
+            )
+            images = {**images, **{
+                image.url: image
+                for image in ScrapedImage.objects.filter(url__in=[result['url'] for result in results])
+            }}
+
+        hashes = {image.phash for image in images.values() if image.phash is not None}
+        canonical = {}
+        best_area = {}
+        for phash, url, width, height in (
+            ScrapedImage.objects.filter(phash__in=hashes, status=ScrapedImage.Status.VALID)
+            .order_by('id').values_list('phash', 'url', 'width', 'height')
+        ):
+            if width * height > best_area.get(phash, 0):
+                canonical[phash], best_area[phash] = url, width * height
+
+        for article in articles:
+            article.image_urls = rank_images(article.image_urls, images, canonical)
+            article.images_verified = True
+        ScrapedArticle.objects.bulk_update(articles, ['image_urls', 'images_verified'])
+
+    def verify_batch(self, articles):
+        """
+        Replace each article's image_urls with its best distinct images.
+
+        Images are probed first; only storing the results is transactional.
+        If that fails the articles are saved one by one with the same probe
+        results, and an article that still fails is marked verified with its
+        URLs unchanged.
+
+        Args:
+            articles (list): ScrapedArticle instances with images_verified False
+        """
+        urls = list(dict.fromkeys(
+            url for article in articles for url in article.image_urls if len(url) <= MAX_URL_LENGTH
+        ))
+        images, results = self._probe_pending(urls) if urls else ({}, [])
+        found_urls = {article.pk: article.image_urls for article in articles}
+        try:
+            with transaction.atomic():
+                self._save(articles, images, results)
+            return
+        except Exception as e:
+            if len(articles) > 1:
+                logger.warning(f"Saving image checks of {len(articles)} articles failed, saving one by one: {e}")
+
+        for article in articles:
+            article.image_urls = found_urls[article.pk]
+            own_urls = set(article.image_urls)
+            try:
+                with transaction.atomic():
+                    self._save([article], images, [result for result in results if result['url'] in own_urls])
+            except Exception as e:
+                logger.error(f"Image verification failed for scraped article {article.pk}, keeping its URLs: {e}")
+                ScrapedArticle.objects.filter(pk=article.pk).update(images_verified=True)
+
+    @staticmethod
+    def claim(batch_size):
+        """
+        Claim up to batch_size unverified articles, oldest first. Claimed
+        articles are skipped by overlapping runs until verified or until the
+        claim lapses (CELERY_TASK_TIME_LIMIT, the run died).
+        """
+        now = timezone.now()
+        lapsed = now - timedelta(seconds=settings.CELERY_TASK_TIME_LIMIT)
+        with transaction.atomic():
+            articles = list(
+                ScrapedArticle.objects.select_for_update(skip_locked=True)
+                .filter(images_verified=False)
+                .filter(Q(images_claimed_at__isnull=True) | Q(images_claimed_at__lt=lapsed))
+                .order_by('scraped_at').only('id', 'image_urls')[:batch_size]
+            )
+            ScrapedArticle.objects.filter(pk__in=[article.pk for article in articles]).update(images_claimed_at=now)
+        return articles
+
+    def run(self, batch_size=50, max_articles=500):
+        """
+        Verify articles oldest first.
+
+        Args:
+            batch_size (int): Articles whose images are probed together
+            max_articles (int): Upper bound for one run
+
+        Returns:
+            int: Articles verified
+        """
+        verified = 0
+        try:
+            while verified < max_articles:
+                articles = self.claim(batch_size)
+                if not articles:
+                    break
+                self.verify_batch(articles)
+                verified += len(articles)
+        finally:
+            self.session.close()
+
+        if verified:
+            logger.info(f"Verified images of {verified} scraped articles")
+        return verified
@@ -0,0 +1,240 @@
+"""
+Bulk Ingestion for Scraped Articles
+
+Single write path from scraper output to ScrapedArticle rows:
+- Normalizes scraped dicts to the model's fields and column limits
+- Deduplicates a batch in memory by source URL
+- Skips URLs already stored with one query per batch
+- Writes with bulk_create(ignore_conflicts=True) against the unique
+  source_url index, so concurrent scrapes cannot create duplicates
+- Signs new articles and clusters near-duplicate stories (scraping_dedup);
+  run_scrape defers this until the crawl is over (cluster_unsigned), since
+  MinHash signing in a progress callback would stall the crawler
+"""
+
+import logging
+
+from django.utils import timezone
+
+from .models import ScrapedArticle
+from .scraping_dedup import cluster_articles, sign_articles
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+
+# Scraped dict keys that map onto ScrapedArticle fields
+ARTICLE_FIELDS = (
+    'title', 'content', 'summary', 'source_url', 'source_website', 'author',
+    'published_date', 'matched_keywords', 'relevance_score', 'image_urls',
+    'reference_urls', 'category', 'tags',
+)
+
+LIST_FIELDS = ('matched_keywords', 'image_urls', 'reference_urls', 'tags')
+
+
+def _max_lengths():
+    return {
+        field.name: field.max_length
+        for field in ScrapedArticle._meta.get_fields()
+        if getattr(field, 'max_length', None)
+    }
+
+
+def normalize_article(article_data, config, max_lengths=None):
+    """
+    Map one scraped dict onto ScrapedArticle field values.
+
+    Args:
+        article_data (dict): Scraper output
+        config: NewsSourceConfig the article was scraped for
+        max_lengths (dict): Field name -> max_length, computed if omitted
+
+    Returns:
+        dict: Field values, or None if the article has no URL or title
+    """
+    max_lengths = max_lengths or _max_lengths()
+    values = {field: article_data[field] for field in ARTICLE_FIELDS if field in article_data}
+
+    values['source_url'] = (values.get('source_url') or '').strip()
+    values['title'] = (values.get('title') or '').strip()
+    if not values['source_url'] or not values['title']:
+        return None
+    if len(values['source_url']) > max_lengths['source_url']:
+        return None
+
+    for field in LIST_FIELDS:
+        if not isinstance(values.get(field), list):
+            values[field] = list(values[field]) if values.get(field) else []
+
+    values.setdefault('category', config.category)
+    published_date = values.get('published_date')
+    if published_date and timezone.is_naive(published_date):
+        values['published_date'] = timezone.make_aware(published_date)
+
+    for field, value in values.items():
+        limit = max_lengths.get(field)
+        if limit and isinstance(value, str) and len(value) > limit:
+            values[field] = value[:limit]
+
+    return values
+
+
+def ingest_scraped_articles(config, articles, batch_size=BATCH_SIZE, cluster=True):
+    """
+    Store scraped articles for a config in bulk.
+
+    Args:
+        config: NewsSourceConfig the articles were scraped for
+        articles (list): Scraped article dicts
+        batch_size (int): Rows per lookup and insert
+        cluster (bool): Sign and cluster new articles now; when False they
+            are stored unsigned for cluster_unsigned
+
+    Returns:
+        dict: created, duplicates (already stored or repeated in the batch),
+            invalid (missing URL/title), near_duplicates (new articles
+            clustered with an existing story) and total counts
+    """
+    max_lengths = _max_lengths()
+    unique = {}
+    invalid = 0
+    for article_data in articles:
+        values = normalize_article(article_data, config, max_lengths)
+        if values is None:
+            invalid += 1
+            continue
+        # First occurrence of a URL wins
+        unique.setdefault(values['source_url'], values)
+
+    created = 0
+    near_duplicates = 0
+    rows = list(unique.values())
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start:start + batch_size]
+        existing = set(
+            ScrapedArticle.objects.filter(source_url__in=[row['source_url'] for row in batch])
+            .values_list('source_url', flat=True)
+        )
+        new_articles = [
+            ScrapedArticle(source_config=config, **row)
+            for row in batch if row['source_url'] not in existing
+        ]
+        if not new_articles:
+            continue
+        if cluster:
+            sign_articles(new_articles)
+        ScrapedArticle.objects.bulk_create(new_articles, ignore_conflicts=True)
+        # Primary keys are client-side UUIDs, so this finds exactly the rows
+        # that won any race with a concurrent scrape
+        stored = set(
+            ScrapedArticle.objects.filter(pk__in=[a.pk for a in new_articles])
+            .values_list('pk', flat=True)
+        )
+        created += len(stored)
+        if cluster:
+            near_duplicates += cluster_articles([a for a in new_articles if a.pk in stored])
+
+    result = {
+        'created': created,
+        'duplicates': len(articles) - invalid - created,
+        'invalid': invalid,
+        'near_duplicates': near_duplicates,
+        'total': len(articles),
+    }
+    logger.info(
+        f"Ingested scrape for {config}: {result['created']} new "
+        f"({result['near_duplicates']} near-duplicates), "
+        f"{result['duplicates']} duplicates, {result['invalid']} invalid"
+    )
+    return result
+
+
+def cluster_unsigned(urls, batch_size=BATCH_SIZE):
+    """
+    Sign and cluster stored articles that were ingested with cluster=False.
+
+    Args:
+        urls (iterable): Source URLs of the articles
+        batch_size (int): Articles signed and clustered together
+
+    Returns:
+        int: Articles marked as near-duplicates
+    """
+    urls = [url for url in urls if url]
+    near_duplicates = 0
+    for start in range(0, len(urls), batch_size):
+        articles = list(
+            ScrapedArticle.objects.filter(
+                source_url__in=urls[start:start + batch_size], content_signature__isnull=True,
+            ).order_by('scraped_at').only('id', 'title', 'content')
+        )
+        if not articles:
+            continue
+        sign_articles(articles)
+        ScrapedArticle.objects.bulk_update(articles, ['content_signature'])
+        near_duplicates += cluster_articles(articles)
+    return near_duplicates
+
+
+def run_scrape(config, job=None):
+    """
+    Scrape a config's sources and store the results.
+
+    Articles are ingested in batches while the crawl is still running, so
+    progress (and saved articles) survive a crawl that fails part way. They
+    are signed and clustered once the crawl is over, off the crawler's
+    scheduling thread.
+    Afterwards the config's next scrape is scheduled from its new-article rate.
+    Every scraping entry point goes through here so articles are always
+    written the same way.
+
+    Args:
+        config: NewsSourceConfig to scrape
+        job (ScrapeJob): Optional job to report progress on
+
+    Returns:
+        dict: Ingestion counts (see ingest_scraped_articles)
+    """
+    from .scraping_scheduler import schedule_after_failure, schedule_after_scrape
+    from .scraping_utils import scrape_articles_for_config
+
+    totals = {'created': 0, 'duplicates': 0, 'invalid': 0, 'near_duplicates': 0, 'total': 0}
+    # By URL: the final list is re-sorted, so positions from progress calls don't carry over
+    ingested = set()
+
+    def ingest_new(accepted):
+        batch = [article for article in accepted if article.get('source_url') not in ingested]
+        ingested.update(article.get('source_url') for article in batch)
+        if batch:
+            for key, value in ingest_scraped_articles(config, batch, cluster=False).items():
+                totals[key] += value
+
+    def on_progress(stats, accepted):
+        ingest_new(accepted)
+        if job is not None:
+            job.update_progress(
+                sites_total=stats['sites_total'],
+                sites_done=stats['sites_done'],
+                articles_found=len(accepted),
+                articles_saved=totals['created'],
+                duplicates=totals['duplicates'],
+            )
+
+    try:
+        scraped_data = scrape_articles_for_config(config, on_progress=on_progress)
+        ingest_new(scraped_data)
+    except Exception:
+        schedule_after_failure(config)
+        try:
+            cluster_unsigned(ingested)
+        except Exception as e:
+            logger.error(f"Could not cluster articles of failed scrape for {config}: {e}")
+        raise
+    totals['near_duplicates'] += cluster_unsigned(ingested)
+
+    scraped_at = timezone.now()
+    schedule_after_scrape(config, totals['created'], scraped_at)
+    config.last_scraped_at = scraped_at
+    config.save(update_fields=['last_scraped_at'])
+    return totals
@@ -0,0 +1,195 @@
+"""
+Multi-Keyword Matcher for Scraped Articles
+
+Aho-Corasick automaton over word tokens, built once per NewsSourceConfig:
+- One pass over an article finds every keyword, including multi-word
+  keywords and keywords that overlap
+- Matching is on whole words, so "ai" does not match inside "said"
+- Returns hit counts and character positions per keyword
+- Relevance score for ranking articles (title hits weigh more)
+
+The automaton walks word tokens rather than characters. A compiled regex
+over the keyword vocabulary picks out candidate tokens at C speed, so the
+Python-level walk only sees words that occur in some keyword. Hyphens and
+apostrophes inside a keyword are treated as word separators ("AI-powered"
+matches "ai powered"). Keywords with any other punctuation ("C++", "C#",
+".NET", "Node.js") would lose it as tokens, so they are matched literally
+instead, not touching a word character on either side.
+"""
+
+import math
+import re
+from collections import deque
+
+TOKEN_RE = re.compile(r'\w+')
+WORD_CHAR_RE = re.compile(r'\w')
+# Keywords the token automaton matches as written
+TOKEN_KEYWORD_RE = re.compile(r"\w+(?:[\s'-]+\w+)*")
+
+# Title hits count this many times more than content hits
+TITLE_WEIGHT = 3.0
+
+
+def tokenize(text):
+    """Yield (token, start, end) for each lowercase word in text"""
+    for match in TOKEN_RE.finditer(text.lower()):
+        yield match.group(), match.start(), match.end()
+
+
+class KeywordMatch:
+    """Hits for one article: per-keyword title/content positions"""
+
+    def __init__(self):
+        self.title_positions = {}
+        self.content_positions = {}
+
+    @property
+    def keywords(self):
+        """Matched keywords, most hits first"""
+        counts = self.counts
+        return sorted(counts, key=lambda keyword: -counts[keyword])
+
+    @property
+    def counts(self):
+        counts = {}
+        for positions in (self.title_positions, self.content_positions):
+            for keyword, hits in positions.items():
+                counts[keyword] = counts.get(keyword, 0) + len(hits)
+        return counts
+
+    @property
+    def score(self):
+        """
+        Relevance score: each matched keyword contributes its weighted title
+        hits plus a logarithmically damped content hit count, so articles
+        matching several keywords outrank one repeating a single keyword.
+        """
+        score = 0.0
+        for keyword in self.counts:
+            title_hits = len(self.title_positions.get(keyword, ()))
+            content_hits = len(self.content_positions.get(keyword, ()))
+            score += TITLE_WEIGHT * title_hits
+            if content_hits:
+                score += 1.0 + math.log(content_hits)
+        return round(score, 3)
+
+    def __bool__(self):
+        return bool(self.title_positions or self.content_positions)
+
+
+class KeywordMatcher:
+    """
+    Compiled matcher for a fixed keyword list.
+
+    Usage:
+        matcher = KeywordMatcher(config.keywords)
+        match = matcher.match_article(article_data)
+        if match:
+            article_data['matched_keywords'] = match.keywords
+    """
+
+    def __init__(self, keywords):
+        # Trie over token sequences: goto[state] maps token -> next state
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]  # state -> [(keyword, token_length)]
+        self.literals = []  # [(keyword, compiled pattern)]
+
+        for keyword in dict.fromkeys(k.strip() for k in keywords if k and k.strip()):
+            if not TOKEN_KEYWORD_RE.fullmatch(keyword):
+                self.literals.append(
+                    (keyword, re.compile(r'(?<!\w)%s(?!\w)' % re.escape(keyword.lower())))
+                )
+                continue
+            tokens = [token for token, _, _ in tokenize(keyword)]
+            if tokens:
+                self._add(keyword, tokens)
+        self._build_failure_links()
+        self.max_tokens = max(
+            (length for outputs in self.output for _keyword, length in outputs), default=1
+        )
+        # Longest alternatives first so a token is never cut short
+        vocabulary = sorted(
+            {token for transitions in self.goto for token in transitions}, key=len, reverse=True
+        )
+        self.vocabulary_re = re.compile(
+            r'\b(?:%s)\b' % '|'.join(map(re.escape, vocabulary))
+        ) if vocabulary else None
+
+    def _add(self, keyword, tokens):
+        state = 0
+        for token in tokens:
+            next_state = self.goto[state].get(token)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+                self.goto[state][token] = next_state
+            state = next_state
+        self.output[state].append((keyword, len(tokens)))
+
+    def _build_failure_links(self):
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and token not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(token, 0)
+                self.output[next_state] = self.output[next_state] + self.output[self.fail[next_state]]
+
+    def find(self, text):
+        """
+        Find all keyword occurrences in text.
+
+        Args:
+            text (str): Text to scan
+
+        Returns:
+            dict: keyword -> list of start character offsets
+        """
+        hits = {}
+        if not text:
+            return hits
+
+        lowered = text.lower()
+        for keyword, pattern in self.literals:
+            positions = [match.start() for match in pattern.finditer(lowered)]
+            if positions:
+                hits[keyword] = positions
+        if self.vocabulary_re is None:
+            return hits
+
+        goto, fail, output = self.goto, self.fail, self.output
+        starts = deque(maxlen=self.max_tokens)
+        state = 0
+        previous_end = 0
+        for match in self.vocabulary_re.finditer(lowered):
+            token, start = match.group(), match.start()
+            if state and WORD_CHAR_RE.search(lowered, previous_end, start):
+                # A word outside the vocabulary sits between the two tokens
+                state = 0
+                starts.clear()
+            previous_end = match.end()
+            starts.append(start)
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            for keyword, length in output[state]:
+                hits.setdefault(keyword, []).append(starts[-length])
+        return hits
+
+    def match_article(self, article_data):
+        """
+        Match an article's title and content.
+
+        Returns:
+            KeywordMatch: Falsy when no keyword matched
+        """
+        match = KeywordMatch()
+        match.title_positions = self.find(article_data.get('title', ''))
+        match.content_positions = self.find(article_data.get('content', ''))
+        return match
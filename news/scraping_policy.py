@@ -0,0 +1,224 @@
+"""
+Per-Domain Crawl Policy for the News Scraper
+
+Process-wide cache of what each host allows and how it has been behaving:
+- Parsed robots.txt rules and Crawl-delay / Request-rate, refreshed after
+  SCRAPER_ROBOTS_TTL seconds
+- Rolling window of recent request outcomes (errors, 429s)
+- 429 back-off honouring Retry-After (up to SCRAPER_MAX_RETRY_AFTER
+  seconds), with a pacing penalty that decays on success
+- Circuit breaker: a host whose recent error rate crosses the threshold is
+  skipped for SCRAPER_BREAKER_COOLDOWN seconds
+
+ConcurrentCrawler consults the shared `domain_policies` instance when it
+dispatches requests.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from urllib.parse import urljoin, urlsplit
+from urllib.robotparser import RobotFileParser
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Outcomes older than this no longer count towards a host's error rate
+OUTCOME_WINDOW_SECONDS = 600
+
+# Robots.txt answers that could not be fetched are retried sooner
+ROBOTS_ERROR_TTL = 600
+
+# Rules past the first 500 KiB of a robots.txt are ignored (RFC 9309)
+ROBOTS_MAX_BYTES = 500 * 1024
+
+MAX_PENALTY = 16.0
+
+
+class RobotsDisallowed(Exception):
+    """The URL is disallowed by the host's robots.txt"""
+
+
+class DomainPolicy:
+    """Cached robots rules and recent request history for one host"""
+
+    def __init__(self, host):
+        self.host = host
+        self.robots = None
+        self.robots_expires_at = 0.0
+        self.robots_lock = threading.Lock()
+        self.outcomes = deque(maxlen=settings.SCRAPER_BREAKER_WINDOW)  # (time, is_error)
+        self.penalty = 1.0
+        self.retry_until = 0.0
+        self.breaker_until = 0.0
+
+    def error_rate(self, now):
+        recent = [is_error for at, is_error in self.outcomes if now - at <= OUTCOME_WINDOW_SECONDS]
+        if len(recent) < settings.SCRAPER_BREAKER_MIN_SAMPLES:
+            return 0.0
+        return sum(recent) / len(recent)
+
+
+class DomainPolicyCache:
+    """
+    Thread-safe map of host -> DomainPolicy.
+
+    robots.txt is fetched lazily by the first request to a host (on a fetch
+    worker thread); concurrent requests to the same host wait for it.
+    """
+
+    def __init__(self):
+        self._policies = {}
+        self._lock = threading.Lock()
+
+    def get(self, host):
+        with self._lock:
+            policy = self._policies.get(host)
+            if policy is None:
+                policy = DomainPolicy(host)
+                self._policies[host] = policy
+            return policy
+
+    def clear(self):
+        with self._lock:
+            self._policies.clear()
+
+    # ------------------------------------------------------------------
+    # robots.txt
+    # ------------------------------------------------------------------
+
+    def _load_robots(self, policy, url, session, user_agent):
+        parts = urlsplit(url)
+        robots_url = f"{parts.scheme}://{parts.netloc}/robots.txt"
+        parser = RobotFileParser(robots_url)
+        ttl = settings.SCRAPER_ROBOTS_TTL
+        try:
+            with session.get(robots_url, headers={'User-Agent': user_agent}, timeout=10, stream=True) as response:
+                if response.status_code in (401, 403):
+                    parser.disallow_all = True
+                elif 400 <= response.status_code < 500:
+                    parser.allow_all = True
+                elif response.status_code >= 500:
+                    # Server error: assume disallowed, but ask again soon
+                    parser.disallow_all = True
+                    ttl = ROBOTS_ERROR_TTL
+                else:
+                    body = response.raw.read(ROBOTS_MAX_BYTES, decode_content=True)
+                    parser.parse(body.decode('utf-8', errors='replace').splitlines())
+        except Exception as e:
+            logger.warning(f"Could not fetch {robots_url}: {str(e)}")
+            parser.allow_all = True
+            ttl = ROBOTS_ERROR_TTL
+        parser.modified()
+        policy.robots = parser
+        policy.robots_expires_at = time.monotonic() + ttl
+
+    def allowed(self, url, session, user_agent):
+        """Check robots.txt for url, fetching and caching it if needed"""
+        if not settings.SCRAPER_RESPECT_ROBOTS:
+            return True
+        policy = self.get(urlsplit(url).netloc.lower())
+        if policy.robots_expires_at <= time.monotonic():
+            with policy.robots_lock:
+                if policy.robots_expires_at <= time.monotonic():
+                    self._load_robots(policy, url, session, user_agent)
+        return policy.robots.can_fetch(user_agent, url)
+
+    def crawl_delay(self, host, user_agent):
+        """Crawl-delay (or 1 / Request-rate) from robots.txt, or 0"""
+        robots = self.get(host).robots
+        if robots is None or not settings.SCRAPER_RESPECT_ROBOTS:
+            return 0.0
+        delay = robots.crawl_delay(user_agent) or 0
+        rate = robots.request_rate(user_agent)
+        if rate and rate.requests:
+            delay = max(delay, rate.seconds / rate.requests)
+        return float(delay)
+
+    def sitemaps(self, host):
+        """Sitemap URLs listed in host's cached robots.txt"""
+        robots = self.get(host).robots
+        if robots is None:
+            return []
+        return [urljoin(robots.url, url) for url in robots.site_maps() or []]
+
+    # ------------------------------------------------------------------
+    # Pacing and circuit breaker
+    # ------------------------------------------------------------------
+
+    def delay(self, host, base_delay, user_agent):
+        """Seconds to wait between requests to host"""
+        policy = self.get(host)
+        return max(base_delay, self.crawl_delay(host, user_agent)) * policy.penalty
+
+    def not_before(self, host):
+        """Monotonic time before which host must not be contacted (429 Retry-After)"""
+        return self.get(host).retry_until
+
+    def is_tripped(self, host):
+        """True while host's circuit breaker is open"""
+        policy = self.get(host)
+        if not policy.breaker_until:
+            return False
+        if time.monotonic() < policy.breaker_until:
+            return True
+        # Cool-down over: start afresh (half-open)
+        policy.breaker_until = 0.0
+        policy.outcomes.clear()
+        return False
+
+    def record_success(self, host):
+        policy = self.get(host)
+        policy.outcomes.append((time.monotonic(), False))
+        policy.penalty = max(1.0, policy.penalty * 0.8)
+
+    def record_failure(self, host, status_code=None, retry_after=None):
+        """
+        Record a failed request.
+
+        Args:
+            host (str): Host the request went to
+            status_code (int): HTTP status, or None for network errors
+            retry_after (str): Retry-After header value, if any
+        """
+        policy = self.get(host)
+        now = time.monotonic()
+        policy.outcomes.append((now, True))
+
+        if status_code in (429, 503):
+            policy.penalty = min(policy.penalty * 2, MAX_PENALTY)
+            wait = parse_retry_after(retry_after)
+            if wait is None:
+                wait = settings.SCRAPER_POLITENESS_DELAY * policy.penalty
+            # A hostile or broken Retry-After must not park the host for days
+            wait = min(wait, settings.SCRAPER_MAX_RETRY_AFTER)
+            policy.retry_until = max(policy.retry_until, now + wait)
+            logger.warning(f"{host} is throttling us ({status_code}); pausing {wait:.0f}s")
+
+        if not policy.breaker_until and policy.error_rate(now) >= settings.SCRAPER_BREAKER_ERROR_RATE:
+            policy.breaker_until = now + settings.SCRAPER_BREAKER_COOLDOWN
+            logger.warning(
+                f"Circuit breaker open for {host}: error rate {policy.error_rate(now):.0%}, "
+                f"skipping for {settings.SCRAPER_BREAKER_COOLDOWN}s"
+            )
+
+
+def parse_retry_after(value):
+    """Retry-After as seconds (delta-seconds or HTTP-date), or None"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+# Shared by every crawl in this process
+domain_policies = DomainPolicyCache()
@@ -0,0 +1,165 @@
+"""
+Adaptive Scrape Scheduler
+
+Polls active NewsSourceConfigs on a Celery beat tick:
+- Each config keeps a smoothed (EWMA) rate of new articles per hour
+- Its polling interval is set so a scrape is expected to find about half of
+  max_articles_per_scrape: busy sources are polled sooner, quiet ones back off
+- Intervals stay within [SCRAPER_SCHEDULE_MIN_INTERVAL_MINUTES,
+  scrape_frequency_hours x SCRAPER_SCHEDULE_MAX_BACKOFF]
+- A global budget caps how many scrape jobs may be active at once, so one
+  tick never floods the worker pool
+- Jobs that stopped reporting progress for longer than the Celery task time
+  limit belong to dead workers; each tick fails them (reap_stale_jobs) so
+  they hold neither their config nor the budget
+"""
+
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import NewsSourceConfig, ScrapeJob
+
+logger = logging.getLogger(__name__)
+
+# Weight of the latest observation in the smoothed new-article rate
+RATE_SMOOTHING = 0.3
+
+# Interval multiplier after a scrape that found nothing new or failed
+BACKOFF_FACTOR = 1.5
+
+
+def interval_bounds(config):
+    """(min, max) polling interval in minutes for a config"""
+    base = config.scrape_frequency_hours * 60
+    minimum = min(settings.SCRAPER_SCHEDULE_MIN_INTERVAL_MINUTES, base)
+    return minimum, base * settings.SCRAPER_SCHEDULE_MAX_BACKOFF
+
+
+def current_interval(config):
+    """Polling interval in minutes, starting from scrape_frequency_hours"""
+    return config.adaptive_interval_minutes or config.scrape_frequency_hours * 60
+
+
+def schedule_after_scrape(config, created, scraped_at=None):
+    """
+    Adapt a config's polling interval to the scrape that just finished.
+
+    Args:
+        config: NewsSourceConfig that was scraped
+        created (int): New articles saved by the scrape
+        scraped_at (datetime): When the scrape finished; defaults to now
+    """
+    scraped_at = scraped_at or timezone.now()
+    interval = current_interval(config)
+
+    # Observed rate since the previous scrape, in new articles per hour
+    previous = config.last_scraped_at
+    if previous and previous < scraped_at:
+        elapsed_hours = max((scraped_at - previous).total_seconds() / 3600, 1 / 60)
+    else:
+        elapsed_hours = interval / 60
+    observed_rate = created / elapsed_hours
+    if config.adaptive_interval_minutes is None:
+        rate = observed_rate  # First observation seeds the average
+    else:
+        rate = RATE_SMOOTHING * observed_rate + (1 - RATE_SMOOTHING) * config.new_article_rate
+
+    if created == 0 or rate <= 0:
+        interval *= BACKOFF_FACTOR
+    else:
+        target = max(1, config.max_articles_per_scrape // 2)
+        interval = target / rate * 60
+
+    minimum, maximum = interval_bounds(config)
+    interval = min(max(interval, minimum), maximum)
+
+    config.new_article_rate = round(rate, 4)
+    config.adaptive_interval_minutes = round(interval, 2)
+    config.next_scrape_at = scraped_at + timedelta(minutes=interval)
+    config.save(update_fields=['new_article_rate', 'adaptive_interval_minutes', 'next_scrape_at'])
+    logger.info(
+        f"Scheduled {config.name}: {created} new, {rate:.2f}/h, "
+        f"next scrape in {interval:.0f} min"
+    )
+
+
+def schedule_after_failure(config):
+    """Back off a config whose scrape failed"""
+    minimum, maximum = interval_bounds(config)
+    interval = min(max(current_interval(config) * BACKOFF_FACTOR, minimum), maximum)
+    config.adaptive_interval_minutes = round(interval, 2)
+    config.next_scrape_at = timezone.now() + timedelta(minutes=interval)
+    config.save(update_fields=['adaptive_interval_minutes', 'next_scrape_at'])
+
+
+def reap_stale_jobs(queryset=None):
+    """
+    Fail active scrape jobs that stopped reporting for longer than
+    CELERY_TASK_TIME_LIMIT (their worker died).
+
+    Args:
+        queryset (QuerySet): ScrapeJobs to check; defaults to all
+
+    Returns:
+        int: Number of jobs failed
+    """
+    queryset = ScrapeJob.objects.all() if queryset is None else queryset
+    stale_before = timezone.now() - timedelta(seconds=settings.CELERY_TASK_TIME_LIMIT)
+    stale_jobs = list(queryset.filter(status__in=ScrapeJob.ACTIVE_STATUSES, updated_at__lt=stale_before))
+    for job in stale_jobs:
+        job.mark_failed('Scrape stopped reporting progress')
+    if stale_jobs:
+        logger.warning(f"Failed {len(stale_jobs)} stale scrape jobs")
+    return len(stale_jobs)
+
+
+def due_configs(now=None):
+    """Active configs whose next scrape is due, most overdue first"""
+    now = now or timezone.now()
+    return (
+        NewsSourceConfig.objects
+        .filter(status=NewsSourceConfig.Status.ACTIVE)
+        .exclude(next_scrape_at__gt=now)
+        .exclude(scrape_jobs__status__in=ScrapeJob.ACTIVE_STATUSES)
+        .order_by(F('next_scrape_at').asc(nulls_first=True))
+    )
+
+
+def dispatch_due_scrapes(budget=None):
+    """
+    Start scrape jobs for due configs within the global crawl budget.
+
+    Args:
+        budget (int): Maximum active scrape jobs; defaults to
+            SCRAPER_SCHEDULE_BUDGET
+
+    Returns:
+        list: IDs of the jobs started
+    """
+    from .ai_tasks import enqueue_scrape_job
+
+    budget = settings.SCRAPER_SCHEDULE_BUDGET if budget is None else budget
+    reap_stale_jobs()
+    available = budget - ScrapeJob.objects.filter(status__in=ScrapeJob.ACTIVE_STATUSES).count()
+    if available <= 0:
+        logger.info("Scrape budget exhausted, nothing dispatched this tick")
+        return []
+
+    started = []
+    for config in due_configs()[:available]:
+        try:
+            with transaction.atomic():
+                job = ScrapeJob.objects.create(source_config=config)
+        except IntegrityError:
+            continue  # Started manually since the query ran
+        enqueue_scrape_job(job)
+        started.append(str(job.id))
+
+    if started:
+        logger.info(f"Dispatched {len(started)} scheduled scrapes")
+    return started
@@ -8,11 +8,63 @@ from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
 import logging
 from datetime import datetime
+from django.conf import settings
 from django.utils import timezone
 import re
+import time
+
+from .scraping_extract import MAX_IMAGE_CANDIDATES, extract_links, is_article_url, parse_article
 
 logger = logging.getLogger(__name__)
 
+# Content types worth downloading; anything else is dropped after the headers
+HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml')
+FEED_CONTENT_TYPES = HTML_CONTENT_TYPES + (
+    'application/rss+xml', 'application/atom+xml', 'application/xml', 'text/xml', 'text/plain',
+)
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class ResponseRejected(Exception):
+    """A response was dropped unread: unwanted content type or too large"""
+
+
+def read_body(response, accept=HTML_CONTENT_TYPES, max_bytes=None):
+    """
+    Read a streamed response body, giving up as early as possible.
+    
+    The Content-Type and Content-Length headers are checked before any of
+    the body is downloaded, and reading stops once max_bytes is exceeded
+    (for servers that send no length or compress the body).
+    
+    Args:
+        response (requests.Response): Response opened with stream=True
+        accept (tuple): Allowed media types; a missing Content-Type is allowed
+        max_bytes (int): Size cap; defaults to SCRAPER_MAX_RESPONSE_BYTES
+        
+    Returns:
+        bytes: Response body (decompressed)
+        
+    Raises:
+        ResponseRejected: If the response is of the wrong type or too large
+    """
+    max_bytes = max_bytes or settings.SCRAPER_MAX_RESPONSE_BYTES
+    content_type = response.headers.get('Content-Type', '').split(';', 1)[0].strip().lower()
+    if accept and content_type and content_type not in accept:
+        raise ResponseRejected(f"Unwanted content type {content_type}: {response.url}")
+    
+    declared = response.headers.get('Content-Length', '')
+    if declared.isdigit() and int(declared) > max_bytes:
+        raise ResponseRejected(f"Response of {declared} bytes exceeds {max_bytes}: {response.url}")
+    
+    body = bytearray()
+    for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+        body += chunk
+        if len(body) > max_bytes:
+            raise ResponseRejected(f"Response exceeds {max_bytes} bytes: {response.url}")
+    return bytes(body)
+
 
 class NewsArticleScraper:
     """Scraper for extracting news articles from websites"""
@@ -23,59 +75,149 @@ class NewsArticleScraper:
         }
         self.timeout = 15
         
-    def scrape_article_from_url(self, url):
+    def fetch_html(self, url, session=None, timeout=None, accept=HTML_CONTENT_TYPES):
+        """
+        Download a page and return its raw body.
+        
+        The body is streamed, so non-HTML and oversized responses are dropped
+        without being downloaded (see read_body).
+        
+        Args:
+            url (str): The URL to fetch
+            session (requests.Session): Optional keep-alive session to reuse
+            timeout (int): Optional timeout override in seconds
+            accept (tuple): Allowed content types
+            
+        Returns:
+            bytes: Response body
+            
+        Raises:
+            requests.RequestException: If the request fails or returns an error status
+            ResponseRejected: If the response is of the wrong type or too large
+        """
+        client = session or requests
+        with client.get(url, headers=self.headers, timeout=timeout or self.timeout, stream=True) as response:
+            response.raise_for_status()
+            return read_body(response, accept)
+
+    def fetch_conditional(self, url, cache, session=None, timeout=None, accept=HTML_CONTENT_TYPES):
+        """
+        Download a page using validators from the HTTP cache.
+
+        Sends If-None-Match / If-Modified-Since from the cached entry. A 304
+        response, or a 200 whose body digest matches the cached digest, counts
+        as unchanged. The cache is not written here; callers store the returned
+        validators once they have finished processing the body.
+
+        Args:
+            url (str): The URL to fetch
+            cache (HttpResponseCache): Cache holding validators for the URL
+            session (requests.Session): Optional keep-alive session to reuse
+            timeout (int): Optional timeout override in seconds
+            accept (tuple): Allowed content types
+
+        Returns:
+            tuple: (body, validators) where body is None if the page is unchanged
+                and validators is a dict with etag, last_modified, digest and
+                the previously cached links, feeds and entries
+        """
+        from .scraping_cache import HttpResponseCache, body_digest
+
+        entry = cache.get(url) or {}
+        headers = dict(self.headers)
+        headers.update(HttpResponseCache.conditional_headers(entry))
+
+        client = session or requests
+        with client.get(url, headers=headers, timeout=timeout or self.timeout, stream=True) as response:
+            if response.status_code == 304 and entry:
+                return None, entry
+
+            response.raise_for_status()
+            body = read_body(response, accept)
+        digest = body_digest(body)
+
+        validators = {
+            'etag': response.headers.get('ETag', ''),
+            'last_modified': response.headers.get('Last-Modified', ''),
+            'digest': digest,
+            'links': entry.get('links', []),
+            'feeds': entry.get('feeds', []),
+            'entries': entry.get('entries', []),
+        }
+
+        if entry and entry.get('digest') == digest:
+            return None, validators
+
+        return body, validators
+
+    def scrape_article_from_url(self, url, session=None):
         """
         Extract article content from a given URL.
         
         Args:
             url (str): The URL of the article
+            session (requests.Session): Optional keep-alive session to reuse
             
         Returns:
             dict: Article data or None if failed
         """
         try:
-            response = requests.get(url, headers=self.headers, timeout=self.timeout)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Remove script and style elements
-            for script in soup(["script", "style", "nav", "footer", "header"]):
-                script.decompose()
-            
-            # Extract title
-            title = self._extract_title(soup)
-            
-            # Extract main content
-            content = self._extract_content(soup)
-            
-            # Extract images
-            images = self._extract_images(soup, url)
-            
-            # Extract author
-            author = self._extract_author(soup)
-            
-            # Extract publish date
-            publish_date = self._extract_date(soup)
-            
-            # Create summary (first 500 chars of content)
-            summary = content[:500] + "..." if len(content) > 500 else content
-            
-            return {
-                'title': title,
-                'content': content,
-                'summary': summary,
-                'source_url': url,
-                'source_website': urlparse(url).netloc,
-                'author': author,
-                'published_date': publish_date,
-                'image_urls': images[:5],  # Limit to 5 images
-            }
+            html = self.fetch_html(url, session=session)
+            return parse_article(html, url)
             
         except Exception as e:
             logger.error(f"Error scraping article from {url}: {str(e)}")
             return None
     
+    def parse_article_html(self, html, url):
+        """
+        Extract article data from an already downloaded page with BeautifulSoup.
+        
+        Reference implementation; scraping_extract.parse_article uses a faster
+        lxml path with the same output and falls back to this one.
+        
+        Args:
+            html (bytes|str): Page body
+            url (str): The URL the page was fetched from
+            
+        Returns:
+            dict: Article data
+        """
+        soup = BeautifulSoup(html, 'html.parser')
+        
+        # Remove script and style elements
+        for script in soup(["script", "style", "nav", "footer", "header"]):
+            script.decompose()
+        
+        # Extract title
+        title = self._extract_title(soup)
+        
+        # Extract main content
+        content = self._extract_content(soup)
+        
+        # Extract images
+        images = self._extract_images(soup, url)
+        
+        # Extract author
+        author = self._extract_author(soup)
+        
+        # Extract publish date
+        publish_date = self._extract_date(soup)
+        
+        # Create summary (first 500 chars of content)
+        summary = content[:500] + "..." if len(content) > 500 else content
+        
+        return {
+            'title': title,
+            'content': content,
+            'summary': summary,
+            'source_url': url,
+            'source_website': urlparse(url).netloc,
+            'author': author,
+            'published_date': publish_date,
+            'image_urls': images[:MAX_IMAGE_CANDIDATES],
+        }
+    
     def _extract_title(self, soup):
         """Extract article title"""
         # Try multiple selectors
@@ -222,14 +364,10 @@ class NewsArticleScraper:
             
             for search_url in search_urls:
                 try:
-                    response = requests.get(
-                        search_url,
-                        headers=self.headers,
-                        timeout=10
-                    )
+                    html = self.fetch_html(search_url, timeout=10)
                     
-                    if response.status_code == 200:
-                        soup = BeautifulSoup(response.content, 'html.parser')
+                    if html:
+                        soup = BeautifulSoup(html, 'html.parser')
                         
                         # Find article links (common patterns)
                         links = soup.find_all('a', href=True)
@@ -268,152 +406,122 @@ class NewsArticleScraper:
         
         return article_urls[:max_results]
     
-    def _scrape_homepage_articles(self, website_url, max_results=5):
-        """Scrape recent articles from website homepage"""
-        article_urls = []
-        
+    def _scrape_homepage_articles(self, website_url, max_results=5, session=None, cache=None):
+        """
+        Scrape recent articles from website homepage.
+
+        With an HttpResponseCache the homepage is fetched conditionally, and
+        an unchanged homepage returns its cached links without being parsed.
+        """
         try:
-            response = requests.get(
-                website_url,
-                headers=self.headers,
-                timeout=10
-            )
-            
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.content, 'html.parser')
-                links = soup.find_all('a', href=True)
-                
-                for link in links:
-                    href = link.get('href')
-                    if href:
-                        full_url = urljoin(website_url, href)
-                        if self._is_article_url(full_url) and full_url not in article_urls:
-                            article_urls.append(full_url)
-                            if len(article_urls) >= max_results:
-                                break
-                                
+            if cache is None:
+                html = self.fetch_html(website_url, session=session, timeout=10)
+                return self.extract_article_links(html, website_url, max_results)
+
+            html, validators = self.fetch_conditional(website_url, cache, session=session, timeout=10)
+            if html is None:
+                logger.debug(f"Homepage unchanged, reusing cached links: {website_url}")
+                return validators.get('links', [])[:max_results]
+
+            links = self.extract_article_links(html, website_url, max_results)
+            validators['links'] = links
+            cache.set(website_url, **validators)
+            return links
+
         except Exception as e:
             logger.error(f"Error scraping homepage {website_url}: {str(e)}")
         
-        return article_urls
+        return []
+    
+    def extract_article_links(self, html, website_url, max_results=5):
+        """Collect article-like links from an already downloaded homepage"""
+        return extract_links(html, website_url, max_results)
     
     def _is_article_url(self, url):
         """Check if URL looks like an article"""
-        # Exclude common non-article patterns
-        exclude_patterns = [
-            '/tag/', '/category/', '/author/', '/page/',
-            '/wp-content/', '/wp-includes/', '/static/',
-            '/assets/', '/images/', '/css/', '/js/',
-            '/login', '/register', '/search', '/contact',
-            '.jpg', '.png', '.gif', '.pdf', '.xml', '.json'
-        ]
-        
-        url_lower = url.lower()
-        
-        # Exclude if matches exclude patterns
-        if any(pattern in url_lower for pattern in exclude_patterns):
-            return False
-        
-        # Include if matches common article patterns
-        include_patterns = [
-            '/article/', '/news/', '/post/', '/blog/',
-            '/story/', '/2024/', '/2025/',  # Year in URL often indicates article
-        ]
-        
-        if any(pattern in url_lower for pattern in include_patterns):
-            return True
-        
-        # Check URL structure (articles often have multiple path segments)
-        path = urlparse(url).path
-        segments = [s for s in path.split('/') if s]
-        
-        # Articles usually have 2+ path segments and some meaningful length
-        return len(segments) >= 2 and len(path) > 20
+        return is_article_url(url)
+
+def normalize_website_url(website):
+    """Ensure a configured source website has a scheme"""
+    website = website.strip()
+    if not website.startswith(('http://', 'https://')):
+        website = 'https://' + website
+    return website
 
 
-def scrape_articles_for_config(config):
+def scrape_articles_for_config(config, on_progress=None):
     """
     Scrape articles based on a NewsSourceConfig.
-    OPTIMIZED: Scrapes homepage articles only, then filters by keywords.
-    This is MUCH faster than searching for each keyword individually.
+    Homepages (or their RSS/Atom feeds and news sitemaps) and articles are
+    fetched concurrently (see ConcurrentCrawler). Feed entries are filtered by
+    keywords on their title and summary before the article is fetched, and
+    every article is filtered again once parsed.
     
     Args:
         config: NewsSourceConfig instance
+        on_progress (callable): Optional on_progress(stats, accepted) callback,
+            see ConcurrentCrawler.crawl
         
     Returns:
-        list: List of scraped article data dictionaries
+        list: Scraped article data dictionaries, most relevant first
     """
-    scraper = NewsArticleScraper()
-    scraped_articles = []
-    seen_urls = set()  # Track unique URLs
+    from .scraping_crawler import ConcurrentCrawler
+    from .scraping_cache import HttpResponseCache
+    from .scraping_frontier import URLFrontier
+    from .scraping_matcher import KeywordMatcher
     
-    # Limit websites to prevent timeout (120s max)
-    websites_to_use = config.source_websites[:10] if len(config.source_websites) > 10 else config.source_websites
+    websites = [normalize_website_url(w) for w in config.source_websites if w and w.strip()]
     
-    # Convert keywords to lowercase for matching
-    keywords_lower = [kw.lower() for kw in config.keywords]
+    # Compile the keyword matcher once for the whole scrape
+    matcher = KeywordMatcher(config.keywords)
     
-    logger.info(f"🚀 FAST SCRAPE: {len(websites_to_use)} websites, filtering by {len(keywords_lower)} keywords")
+    logger.info(f"🚀 CONCURRENT SCRAPE: {len(websites)} websites, filtering by {len(config.keywords)} keywords")
     
-    # Process each website (limited list)
-    for idx, website in enumerate(websites_to_use, 1):
-        # Ensure URL has a scheme
-        if not website.startswith(('http://', 'https://')):
-            website = 'https://' + website
+    frontier = URLFrontier(config)
+    rejected_urls = []
+    
+    def accept_article(article_data):
+        """Keep articles with enough content that match at least one keyword"""
+        if len(article_data.get('content', '')) <= 200:
+            rejected_urls.append(article_data['source_url'])
+            return False
         
-        try:
-            logger.info(f"[{idx}/{len(websites_to_use)}] Scraping homepage: {website}")
-            
-            # FAST APPROACH: Get recent articles from homepage directly (no search!)
-            article_urls = scraper._scrape_homepage_articles(website, max_results=10)
-            
-            if not article_urls:
-                logger.warning(f"No articles found on {website}")
-                continue
-            
-            # Extract content and filter by keywords
-            for url in article_urls:
-                if url in seen_urls:
-                    continue
-                
-                seen_urls.add(url)
-                    
-                try:
-                    article_data = scraper.scrape_article_from_url(url)
-                    
-                    if article_data and len(article_data.get('content', '')) > 200:
-                        # Check if article matches ANY keyword
-                        matched = []
-                        content_lower = article_data['content'].lower()
-                        title_lower = article_data['title'].lower()
-                        
-                        for keyword in keywords_lower:
-                            if keyword in content_lower or keyword in title_lower:
-                                matched.append(keyword)
-                        
-                        # Only save if matches at least one keyword
-                        if matched:
-                            article_data['matched_keywords'] = matched
-                            article_data['category'] = config.category
-                            article_data['reference_urls'] = []
-                            
-                            scraped_articles.append(article_data)
-                            logger.info(f"✅ Found: {article_data['title'][:50]}... (keywords: {', '.join(matched[:3])})")
-                            
-                            # Stop if we've reached max articles
-                            if len(scraped_articles) >= config.max_articles_per_scrape:
-                                logger.info(f"🎯 Reached max: {config.max_articles_per_scrape} articles")
-                                return scraped_articles
-                        else:
-                            logger.debug(f"⏭️  Skipped (no match): {article_data['title'][:50]}...")
-                            
-                except Exception as e:
-                    logger.error(f"Error extracting article from {url}: {str(e)}")
-                    continue
-                    
-        except Exception as e:
-            logger.error(f"Error processing website {website}: {str(e)}")
-            continue
+        match = matcher.match_article(article_data)
+        if not match:
+            logger.debug(f"⏭️  Skipped (no match): {article_data['title'][:50]}...")
+            rejected_urls.append(article_data['source_url'])
+            return False
+        
+        matched = match.keywords
+        article_data['matched_keywords'] = matched
+        article_data['relevance_score'] = match.score
+        article_data['category'] = config.category
+        article_data['reference_urls'] = []
+        logger.info(f"✅ Found: {article_data['title'][:50]}... (keywords: {', '.join(matched[:3])})")
+        return True
+    
+    def match_entry(entry):
+        """Only fetch feed entries whose title or summary mentions a keyword"""
+        return bool(matcher.find(f"{entry['title']}\n{entry['summary']}"))
+    
+    crawler = ConcurrentCrawler(NewsArticleScraper(), cache=HttpResponseCache())
+    try:
+        scraped_articles = crawler.crawl(
+            websites,
+            accept_article,
+            max_articles=config.max_articles_per_scrape,
+            skip_urls=frontier.filter_seen,
+            entry_filter=match_entry,
+            on_progress=on_progress,
+            # Never wait on a throttled host past the task's soft time limit
+            deadline=time.monotonic() + settings.CELERY_TASK_SOFT_TIME_LIMIT,
+        )
+    finally:
+        # Rejected articles are never downloaded again. Accepted ones are
+        # skipped once stored (filter_seen checks ScrapedArticle), so an
+        # ingest that fails after the crawl leaves them to the next run
+        frontier.mark_seen(rejected_urls)
     
+    scraped_articles = sorted(scraped_articles, key=lambda article: article['relevance_score'], reverse=True)
     logger.info(f"Batch scrape completed: {len(scraped_articles)} articles found")
     return scraped_articles
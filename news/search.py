@@ -0,0 +1,311 @@
+"""
+Full-Text Search for News Articles
+
+Replaces icontains scans over title/content/excerpt/tags with an index:
+- PostgreSQL: News.search_vector, a stored weighted tsvector (title A,
+  tags and excerpt B, content C) with a GIN index
+- SQLite (development): the FTS5 table news_news_fts, keyed by article ID
+  and ranked with bm25 using the same weights
+- Other databases, or SQLite builds without FTS5: icontains matching,
+  unranked
+
+The index is refreshed whenever an article is saved (News.save) and its
+entry dropped when it is deleted (post_delete); rebuild_search_index re-creates it after bulk updates. Every word of a query
+must match (stemmed); the last word, and any word ending in *, also
+matches as a prefix so partially typed queries find results. Results carry
+search_rank (higher is better) and highlight() returns snippets with the
+matches wrapped in <mark>.
+"""
+
+import logging
+import re
+
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank, SearchVector
+from django.db import connection
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+from django.utils.html import escape, strip_tags
+from rest_framework import filters
+
+from .models import News
+
+logger = logging.getLogger(__name__)
+
+SEARCH_CONFIG = 'english'
+FTS_TABLE = 'news_news_fts'
+
+# Fields feeding the index; saves touching none of them skip re-indexing
+SEARCH_FIELDS = ('title', 'tags', 'excerpt', 'content')
+
+TERM_RE = re.compile(r'\w+\*?')
+MAX_TERMS = 10
+SNIPPET_WORDS = 30
+
+# Highlight markers survive escaping and tag stripping, then become <mark>
+MARK_START = '\x02'
+MARK_END = '\x03'
+
+
+def parse_query(query):
+    """
+    Split a user query into search terms.
+
+    Returns:
+        list: (word, is_prefix) tuples, lowercase, at most MAX_TERMS
+    """
+    tokens = TERM_RE.findall(query or '')[:MAX_TERMS]
+    terms = []
+    for position, token in enumerate(tokens):
+        word = token.rstrip('*').lower()
+        if word:
+            terms.append((word, token.endswith('*') or position == len(tokens) - 1))
+    return terms
+
+
+def _snippet_html(fragment):
+    """Plain-text snippet with markers turned into <mark> tags"""
+    return escape(strip_tags(fragment)).replace(MARK_START, '<mark>').replace(MARK_END, '</mark>')
+
+
+# ============================================================================
+# Backends
+# ============================================================================
+
+class BasicSearchBackend:
+    """icontains matching: works on any database, but scans every article and does not rank"""
+
+    name = 'basic'
+
+    def search(self, queryset, query):
+        """
+        Filter a News queryset to articles matching query, best first.
+
+        Args:
+            queryset (QuerySet): News queryset to search within
+            query (str): User query
+
+        Returns:
+            QuerySet: Matching articles annotated with search_rank
+        """
+        terms = parse_query(query)
+        if not terms:
+            return queryset.none()
+        for word, _prefix in terms:
+            queryset = queryset.filter(
+                Q(title__icontains=word) | Q(content__icontains=word) |
+                Q(excerpt__icontains=word) | Q(tags__icontains=word)
+            )
+        return queryset.annotate(
+            search_rank=Value(0.0, output_field=FloatField())
+        ).order_by('-created_at')
+
+    def highlight(self, articles, query):
+        """
+        Snippets of article content around the query's matches.
+
+        Args:
+            articles (iterable): News instances (e.g. one page of results)
+            query (str): User query
+
+        Returns:
+            dict: Article ID -> HTML snippet ('' when the match is not in the content)
+        """
+        terms = parse_query(query)
+        if not terms:
+            return {}
+        pattern = re.compile(
+            r'\b(?:' + '|'.join(
+                re.escape(word) + (r'\w*' if prefix else r'\b') for word, prefix in terms
+            ) + ')',
+            re.IGNORECASE,
+        )
+        snippets = {}
+        for article in articles:
+            words = strip_tags(article.content).split()
+            first = next((i for i, word in enumerate(words) if pattern.match(word)), None)
+            if first is None:
+                snippets[article.pk] = ''
+                continue
+            start = max(first - SNIPPET_WORDS // 3, 0)
+            window = ' '.join(words[start:start + SNIPPET_WORDS])
+            marked = pattern.sub(lambda match: f'{MARK_START}{match.group()}{MARK_END}', window)
+            ellipsis_before = '…' if start else ''
+            ellipsis_after = '…' if start + SNIPPET_WORDS < len(words) else ''
+            snippets[article.pk] = _snippet_html(ellipsis_before + marked + ellipsis_after)
+        return snippets
+
+    def index(self, article):
+        """Refresh one article's index entry"""
+
+    def remove(self, pk):
+        """Drop a deleted article's index entry"""
+
+    def rebuild(self):
+        """Re-index every article; returns the number indexed"""
+        return 0
+
+
+class PostgresSearchBackend(BasicSearchBackend):
+    """Weighted tsvector stored on News.search_vector, GIN indexed"""
+
+    name = 'postgres'
+
+    @staticmethod
+    def vector():
+        return (
+            SearchVector('title', weight='A', config=SEARCH_CONFIG) +
+            SearchVector('tags', weight='B', config=SEARCH_CONFIG) +
+            SearchVector('excerpt', weight='B', config=SEARCH_CONFIG) +
+            SearchVector('content', weight='C', config=SEARCH_CONFIG)
+        )
+
+    @staticmethod
+    def tsquery(terms):
+        # Terms are \w+ only, so no tsquery operators can be smuggled in
+        return SearchQuery(
+            ' & '.join(f'{word}:*' if prefix else word for word, prefix in terms),
+            search_type='raw',
+            config=SEARCH_CONFIG,
+        )
+
+    def search(self, queryset, query):
+        terms = parse_query(query)
+        if not terms:
+            return queryset.none()
+        tsquery = self.tsquery(terms)
+        return queryset.filter(search_vector=tsquery).annotate(
+            search_rank=SearchRank(F('search_vector'), tsquery)
+        ).order_by('-search_rank', '-created_at')
+
+    def highlight(self, articles, query):
+        terms = parse_query(query)
+        ids = [article.pk for article in articles]
+        if not terms or not ids:
+            return {}
+        headlines = News.objects.filter(pk__in=ids).annotate(
+            headline=SearchHeadline(
+                'content', self.tsquery(terms), config=SEARCH_CONFIG,
+                start_sel=MARK_START, stop_sel=MARK_END,
+                max_words=SNIPPET_WORDS, min_words=SNIPPET_WORDS // 2,
+            )
+        ).values_list('pk', 'headline')
+        return {pk: _snippet_html(headline) if MARK_START in headline else '' for pk, headline in headlines}
+
+    def index(self, article):
+        News.objects.filter(pk=article.pk).update(search_vector=self.vector())
+
+    def rebuild(self):
+        return News.objects.update(search_vector=self.vector())
+
+
+class SQLiteSearchBackend(BasicSearchBackend):
+    """FTS5 table with one row per article (rowid = News.id)"""
+
+    name = 'sqlite_fts5'
+
+    # bm25 column weights, matching the tsvector weights used on PostgreSQL
+    WEIGHTS = '10.0, 4.0, 4.0, 1.0'
+
+    @staticmethod
+    def match_expression(terms):
+        # Quoted strings: FTS5 operators and column filters in the input are inert
+        return ' '.join(f'"{word}"*' if prefix else f'"{word}"' for word, prefix in terms)
+
+    def search(self, queryset, query):
+        terms = parse_query(query)
+        if not terms:
+            return queryset.none()
+        match = self.match_expression(terms)
+        table = News._meta.db_table
+        return queryset.filter(
+            pk__in=RawSQL(f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', [match])
+        ).annotate(
+            search_rank=RawSQL(
+                f'SELECT -bm25({FTS_TABLE}, {self.WEIGHTS}) FROM {FTS_TABLE} '
+                f'WHERE {FTS_TABLE} MATCH %s AND rowid = "{table}"."id"',
+                [match],
+                output_field=FloatField(),
+            )
+        ).order_by('-search_rank', '-created_at')
+
+    def highlight(self, articles, query):
+        terms = parse_query(query)
+        ids = [article.pk for article in articles]
+        if not terms or not ids:
+            return {}
+        placeholders = ', '.join(['%s'] * len(ids))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT rowid, snippet({FTS_TABLE}, 3, %s, %s, '…', {SNIPPET_WORDS}) FROM {FTS_TABLE} "
+                f"WHERE {FTS_TABLE} MATCH %s AND rowid IN ({placeholders})",
+                [MARK_START, MARK_END, self.match_expression(terms), *ids],
+            )
+            return {pk: _snippet_html(snippet) if MARK_START in snippet else '' for pk, snippet in cursor.fetchall()}
+
+    @staticmethod
+    def _row(pk, title, tags, excerpt, content):
+        return (pk, title, tags, excerpt, strip_tags(content))
+
+    def index(self, article):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [article.pk])
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE} (rowid, title, tags, excerpt, content) VALUES (%s, %s, %s, %s, %s)',
+                self._row(article.pk, article.title, article.tags, article.excerpt, article.content),
+            )
+
+    def remove(self, pk):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [pk])
+
+    def rebuild(self):
+        rows = [
+            self._row(*values)
+            for values in News.objects.values_list(*(('pk',) + SEARCH_FIELDS)).iterator()
+        ]
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE}')
+            cursor.executemany(
+                f'INSERT INTO {FTS_TABLE} (rowid, title, tags, excerpt, content) VALUES (%s, %s, %s, %s, %s)',
+                rows,
+            )
+        return len(rows)
+
+
+_backend = None
+
+
+def search_backend():
+    """The search backend for the default database"""
+    global _backend
+    if _backend is None:
+        if connection.vendor == 'postgresql':
+            _backend = PostgresSearchBackend()
+        elif connection.vendor == 'sqlite' and FTS_TABLE in connection.introspection.table_names():
+            _backend = SQLiteSearchBackend()
+        else:
+            _backend = BasicSearchBackend()
+        logger.info(f"News search backend: {_backend.name}")
+    return _backend
+
+
+# ============================================================================
+# DRF integration
+# ============================================================================
+
+class FullTextSearchFilter(filters.SearchFilter):
+    """
+    ?search= through the full-text index instead of icontains over search_fields.
+
+    List it after OrderingFilter: results are ranked unless ?ordering= is given.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, '').strip()
+        if not query:
+            return queryset
+        ordering = queryset.query.order_by
+        queryset = search_backend().search(queryset, query)
+        if request.query_params.get(filters.OrderingFilter.ordering_param) and ordering:
+            queryset = queryset.order_by(*ordering)
+        return queryset
@@ -1,8 +1,9 @@
 from rest_framework import serializers
+from .fieldsets import SparseFieldsMixin
 from .models import News, TeamMember, Comment, ShareCount, Subscriber, JobOpening, JobApplication, Advertisement
 
 
-class TeamMemberSerializer(serializers.ModelSerializer):
+class TeamMemberSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for TeamMember model"""
     role_display = serializers.CharField(source='get_role_display', read_only=True)
     article_count = serializers.SerializerMethodField()
@@ -14,10 +15,30 @@ class TeamMemberSerializer(serializers.ModelSerializer):
             'email', 'twitter_url', 'linkedin_url', 'is_active',
             'order', 'joined_date', 'article_count'
         ]
+        field_sources = {'role_display': ('role',), 'article_count': ()}
+        always_load = ('updated_at',)  # Response versions (news.conditional)
     
     def get_article_count(self, obj):
         """Get count of articles written by this team member"""
+        if hasattr(obj, 'num_articles'):  # TeamMember.objects.with_article_counts()
+            return obj.num_articles
         return obj.articles.count()
+    
+    def optimize_queryset(self, queryset):
+        """Count articles only when article_count is shown"""
+        queryset = super().optimize_queryset(queryset)
+        if 'article_count' in self.fields:
+            queryset = queryset.with_article_counts()
+        return queryset
+
+
+class TeamMemberSummarySerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """Compact author of an article (sparse fieldsets without ?expand=author)"""
+    
+    class Meta:
+        model = TeamMember
+        fields = ['id', 'name', 'photo']
+        always_load = ('updated_at',)  # Response versions (news.conditional)
 
 
 class CommentSerializer(serializers.ModelSerializer):
@@ -55,7 +76,7 @@ class ShareCountSerializer(serializers.ModelSerializer):
         fields = ['id', 'platform', 'platform_display', 'count', 'last_shared']
 
 
-class NewsListSerializer(serializers.ModelSerializer):
+class NewsListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for listing news articles (summary view)"""
     author = TeamMemberSerializer(read_only=True)
     category_display = serializers.CharField(source='get_category_display', read_only=True)
@@ -70,21 +91,30 @@ class NewsListSerializer(serializers.ModelSerializer):
             'author', 'image', 'created_at', 'updated_at', 'publish_date',
             'comment_count', 'share_count', 'tags_list'
         ]
+        field_sources = {
+            'category_display': ('category',),
+            'comment_count': ('approved_comment_count',),
+            'share_count': ('share_total',),
+            'tags_list': ('tags',),
+        }
+        compact_fields = {'author': TeamMemberSummarySerializer}
+        # Pagination keys and response versions (news.pagination, news.conditional)
+        always_load = ('created_at', 'updated_at', 'approved_comment_count', 'share_total')
     
     def get_comment_count(self, obj):
         """Get count of approved comments"""
-        return obj.comments.filter(is_approved=True).count()
+        return obj.approved_comment_count
     
     def get_share_count(self, obj):
         """Get total share count across all platforms"""
-        return sum(share.count for share in obj.shares.all())
+        return obj.share_total
     
     def get_tags_list(self, obj):
         """Get tags as a list"""
         return obj.get_tags_list()
 
 
-class NewsDetailSerializer(serializers.ModelSerializer):
+class NewsDetailSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for detailed news article view"""
     author = TeamMemberSerializer(read_only=True)
     category_display = serializers.CharField(source='get_category_display', read_only=True)
@@ -103,26 +133,32 @@ class NewsDetailSerializer(serializers.ModelSerializer):
             'publish_date', 'meta_description', 'tags', 'tags_list',
             'comments', 'comment_count', 'shares', 'total_shares', 'related_news'
         ]
+        field_sources = {
+            'category_display': ('category',),
+            'comment_count': ('approved_comment_count',),
+            'total_shares': ('share_total',),
+            'tags_list': ('tags',),
+            'related_news': ('category',),
+        }
+        compact_fields = {'author': TeamMemberSummarySerializer}
+        always_load = ('updated_at', 'approved_comment_count', 'share_total')
     
     def get_comment_count(self, obj):
         """Get count of approved comments"""
-        return obj.comments.filter(is_approved=True).count()
+        return obj.approved_comment_count
     
     def get_total_shares(self, obj):
         """Get total share count across all platforms"""
-        return sum(share.count for share in obj.shares.all())
+        return obj.share_total
     
     def get_tags_list(self, obj):
         """Get tags as a list"""
         return obj.get_tags_list()
     
     def get_related_news(self, obj):
-        """Get related news articles from the same category"""
-        related = News.objects.filter(
-            category=obj.category,
-            visibility='public'
-        ).exclude(id=obj.id).order_by('-created_at')[:3]
-        
+        """Get the most similar news articles (see news.related)"""
+        serializer = NewsListSerializer(context=self.context)
+        related = obj.related_articles(serializer.optimize_queryset(News.objects.all()))
         return NewsListSerializer(related, many=True, context=self.context).data
 
 
@@ -251,13 +287,15 @@ class NewsAdminSerializer(serializers.ModelSerializer):
         ]
     
     def get_comment_count(self, obj):
+        if hasattr(obj, 'num_comments'):  # News.objects.with_counts()
+            return obj.num_comments
         return obj.comments.count()
     
     def get_approved_comment_count(self, obj):
-        return obj.comments.filter(is_approved=True).count()
+        return obj.approved_comment_count
     
     def get_total_shares(self, obj):
-        return sum(share.count for share in obj.shares.all())
+        return obj.share_total
     
     def get_tags_list(self, obj):
         return obj.get_tags_list()
@@ -278,6 +316,8 @@ class TeamMemberAdminSerializer(serializers.ModelSerializer):
         ]
     
     def get_article_count(self, obj):
+        if hasattr(obj, 'num_articles'):  # TeamMember.objects.with_article_counts()
+            return obj.num_articles
         return obj.articles.count()
     
     def get_recent_articles(self, obj):
@@ -358,6 +398,8 @@ class AdvertisementAdminSerializer(serializers.ModelSerializer):
     """Admin serializer for Advertisement with all fields including stats"""
     position_display = serializers.CharField(source='get_position_display', read_only=True)
     size_display = serializers.CharField(source='get_size_display', read_only=True)
+    clicks = serializers.IntegerField(source='live_counts.clicks', read_only=True)
+    impressions = serializers.IntegerField(source='live_counts.impressions', read_only=True)
     click_through_rate = serializers.ReadOnlyField()
     
     class Meta:
@@ -366,7 +408,7 @@ class AdvertisementAdminSerializer(serializers.ModelSerializer):
             'id', 'title', 'position', 'position_display', 'size', 'size_display',
             'image', 'link_url', 'alt_text', 'is_active', 'clicks', 'impressions',
             'click_through_rate', 'start_date', 'end_date', 'created_at', 
-            'updated_at', 'order'
+            'updated_at', 'order', 'weight', 'frequency_cap'
         ]
         read_only_fields = ['clicks', 'impressions', 'click_through_rate', 'created_at', 'updated_at']
 
@@ -0,0 +1,243 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from .ai_tasks import index_related_article
+from .models import News, NewsSourceConfig, RelatedArticle, ScrapeJob, TeamMember
+from .scraping_matcher import KeywordMatcher
+from .scraping_scheduler import dispatch_due_scrapes
+from .search import FTS_TABLE, search_backend
+
+
+class DispatchDueScrapesTests(TestCase):
+    """Scheduled scrapes are not blocked by jobs of dead workers"""
+
+    def setUp(self):
+        self.config = NewsSourceConfig.objects.create(
+            name='Tech', keywords=['ai'], source_websites=['https://example.com'],
+        )
+
+    def _job(self, status, age_seconds):
+        job = ScrapeJob.objects.create(source_config=self.config, status=status)
+        ScrapeJob.objects.filter(pk=job.pk).update(
+            updated_at=timezone.now() - timedelta(seconds=age_seconds)
+        )
+        return job
+
+    @mock.patch('news.ai_tasks.enqueue_scrape_job')
+    def test_stale_running_job_no_longer_blocks_dispatch(self, enqueue):
+        stale = self._job(ScrapeJob.Status.RUNNING, settings.CELERY_TASK_TIME_LIMIT + 60)
+
+        started = dispatch_due_scrapes(budget=1)
+
+        stale.refresh_from_db()
+        self.assertEqual(stale.status, ScrapeJob.Status.FAILED)
+        self.assertEqual(len(started), 1)
+        enqueue.assert_called_once()
+
+    @mock.patch('news.ai_tasks.enqueue_scrape_job')
+    def test_live_running_job_still_blocks_dispatch(self, enqueue):
+        live = self._job(ScrapeJob.Status.RUNNING, 60)
+
+        started = dispatch_due_scrapes(budget=1)
+
+        live.refresh_from_db()
+        self.assertEqual(live.status, ScrapeJob.Status.RUNNING)
+        self.assertEqual(started, [])
+        enqueue.assert_not_called()
+
+
+@override_settings(RELATED_ARTICLES_K=3)
+class RelatedArticlesTests(TestCase):
+    """Saves queue re-indexing; an edit keeps the neighbour lists it was in full"""
+
+    def setUp(self):
+        # Run queued index_related_article tasks in-process
+        patcher = mock.patch.object(
+            index_related_article, 'apply_async', side_effect=lambda args, **kwargs: index_related_article(*args),
+        )
+        self.apply_async = patcher.start()
+        self.addCleanup(patcher.stop)
+        broker = mock.patch('news.ai_tasks._probe_broker')
+        broker.start()
+        self.addCleanup(broker.stop)
+
+        body = 'Quantum processor research laboratory results'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.others = [
+                News.objects.create(title=f'Quantum processor {word}', content=f'{body} {word}')
+                for word in ('benchmark', 'cooling', 'startup', 'funding')
+            ]
+            self.b = self.others[0]
+            self.a = News.objects.create(title=self.b.title, content=self.b.content)
+
+    def test_save_queues_indexing_on_commit(self):
+        self.apply_async.reset_mock()
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.a.title = 'Quantum processor cooling'
+            self.a.save()
+            self.apply_async.assert_not_called()
+
+        for callback in callbacks:
+            callback()
+        self.apply_async.assert_called_once_with(args=[self.a.pk], retry=False)
+
+    def test_edit_keeps_neighbour_lists_full(self):
+        self.assertTrue(RelatedArticle.objects.filter(news=self.b, related=self.a).exists())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.a.title = 'Garden pasta recipes'
+            self.a.content = 'Slow cooked tomato sauce with basil from the garden'
+            self.a.save()
+
+        links = RelatedArticle.objects.filter(news=self.b)
+        self.assertEqual(links.count(), 3)
+        self.assertFalse(links.filter(related=self.a).exists())
+
+
+@override_settings(RESPONSE_CACHE_TTL=0)
+class ConditionalGetTests(TestCase):
+    """Public list endpoints answer 304 while the client's copy is current"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.author = TeamMember.objects.create(name='Asha', role='business_reporter')
+        self.news = News.objects.create(
+            title='Rates held', content='The central bank held rates.', category='business', author=self.author,
+        )
+
+    def assert_revalidates(self, url, change):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        change()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_by_category(self):
+        self.assert_revalidates(
+            '/api/news/by_category/?category=business',
+            lambda: News.objects.create(title='Markets rally', content='Stocks rose.', category='business'),
+        )
+
+    def test_team_member_articles(self):
+        self.assert_revalidates(
+            f'/api/team/{self.author.pk}/articles/',
+            lambda: News.objects.filter(pk=self.news.pk).update(share_total=5),
+        )
+
+    def test_team_member_articles_cursor_pages(self):
+        self.assert_revalidates(
+            f'/api/team/{self.author.pk}/articles/?pagination=cursor',
+            lambda: News.objects.create(title='Markets rally', content='Stocks rose.', author=self.author),
+        )
+
+
+@override_settings(RESPONSE_CACHE_TTL=300)
+class ResponseCacheTests(TestCase):
+    """Cached public reads stay correct for every visitor"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.news = News.objects.create(title='Rates held', content='The central bank held rates.')
+
+    def test_blank_fields_param_does_not_narrow_cached_list(self):
+        response = self.client.get('/api/news/?fields=')
+        self.assertIn('title', response.data['results'][0])
+
+        response = self.client.get('/api/news/')
+        self.assertIn('title', response.data['results'][0])
+
+    def test_repeated_read_is_served_from_cache(self):
+        self.client.get('/api/news/')
+
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/news/')
+        self.assertEqual(response.data['results'][0]['title'], 'Rates held')
+
+    def test_article_save_invalidates_lists_showing_it(self):
+        self.client.get('/api/news/')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.news.title = 'Rates cut'
+            self.news.save()
+
+        response = self.client.get('/api/news/')
+        self.assertEqual(response.data['results'][0]['title'], 'Rates cut')
+
+    def test_unrelated_write_keeps_entry(self):
+        self.client.get('/api/news/')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            TeamMember.objects.create(name='Asha', role='business_reporter')
+
+        with self.assertNumQueries(0):
+            self.client.get('/api/news/')
+
+    def test_cached_entry_answers_if_none_match(self):
+        etag = self.client.get('/api/news/')['ETag']
+
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/news/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+
+class KeywordMatcherTests(TestCase):
+    """Keywords match whole words, punctuation included"""
+
+    def test_punctuated_keywords_match_literally(self):
+        hits = KeywordMatcher(['C++', '.NET']).find('I like C++ and .NET and c')
+
+        self.assertEqual(hits, {'C++': [7], '.NET': [15]})
+
+    def test_hyphenated_keywords_match_either_form(self):
+        hits = KeywordMatcher(['AI-powered']).find('AI-powered tools, ai powered search, said')
+
+        self.assertEqual(hits, {'AI-powered': [0, 18]})
+
+
+class SearchTests(TestCase):
+    """Article search page and index maintenance"""
+
+    def setUp(self):
+        with mock.patch('news.ai_tasks.enqueue_related_index'), self.captureOnCommitCallbacks(execute=True):
+            self.articles = [
+                News.objects.create(title=f'Election result {i}', content='Votes were counted.', category='political')
+                for i in range(12)
+            ]
+            self.tech = News.objects.create(title='Chip launch', content='A faster processor.', category='tech')
+
+    def test_results_are_paginated(self):
+        first = self.client.get('/search/', {'q': 'election'})
+        second = self.client.get('/search/', {'q': 'election', 'page': 2})
+
+        self.assertEqual(first.context['count'], 12)
+        self.assertEqual(len(first.context['results']), 10)
+        self.assertEqual(len(second.context['results']), 2)
+
+    def test_category_name_matches(self):
+        response = self.client.get('/search/', {'q': 'tech'})
+
+        self.assertEqual([news.pk for news in response.context['results']], [self.tech.pk])
+
+    def test_deleted_article_leaves_no_index_entry(self):
+        if search_backend().name != 'sqlite_fts5':
+            self.skipTest('Index rows are only kept apart from News on SQLite FTS5')
+        pk = self.tech.pk
+
+        News.objects.filter(pk=pk).delete()
+
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT COUNT(*) FROM {FTS_TABLE} WHERE rowid = %s', [pk])
+            self.assertEqual(cursor.fetchone()[0], 0)
@@ -1,14 +1,18 @@
 from django.shortcuts import render, get_object_or_404, redirect
-from django.db.models import Count, Q
+from django.db.models import Count
 from django.contrib import messages
 from django.http import JsonResponse
 from django.views.decorators.http import require_POST
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
 from django.conf import settings
-from .models import News, TeamMember, Comment, ShareCount
+from .models import News, TeamMember, Comment
+from .search import search_backend
 import json
 import os
 
+# Search results per page; results are ranked, so the best come first
+SEARCH_RESULTS_PER_PAGE = 10
+
 def home(request):
     # Get latest news articles for display
     latest_news = News.objects.order_by('-created_at')[:15]
@@ -30,19 +34,35 @@ def home(request):
 def search(request):
     query = request.GET.get('q', '')
     results = []
+    count = 0
+    page = None
     
     if query:
-        # Search in title, content, and category
-        results = News.objects.filter(
-            Q(title__icontains=query) | 
-            Q(content__icontains=query) | 
-            Q(category__icontains=query)
-        ).order_by('-created_at')
+        # Full-text search over title, tags, excerpt and content, best match first
+        backend = search_backend()
+        articles = News.objects.select_related('author')
+        matches = backend.search(articles, query)
+        # Followed by the other articles of a category the query names, newest first
+        in_category = articles.filter(category__icontains=query).exclude(pk__in=matches.values('pk'))
+        if in_category.exists():
+            pks = list(matches.values_list('pk', flat=True))
+            pks += list(in_category.order_by('-created_at').values_list('pk', flat=True))
+            page = Paginator(pks, SEARCH_RESULTS_PER_PAGE).get_page(request.GET.get('page'))
+            by_pk = articles.in_bulk(page.object_list)
+            results = [by_pk[pk] for pk in page.object_list if pk in by_pk]
+        else:
+            page = Paginator(matches, SEARCH_RESULTS_PER_PAGE).get_page(request.GET.get('page'))
+            results = list(page.object_list)
+        count = page.paginator.count
+        snippets = backend.highlight(results, query)
+        for news in results:
+            news.search_snippet = snippets.get(news.pk, '')
     
     context = {
         'query': query,
         'results': results,
-        'count': results.count() if results else 0
+        'count': count,
+        'page': page,
     }
     
     return render(request, 'news/search_results.html', context)
@@ -90,19 +110,14 @@ def news_detail(request, pk):
     
     # Get approved comments for this article
     comments = news.comments.filter(is_approved=True).order_by('-created_at')
-    comment_count = comments.count()
+    comment_count = news.approved_comment_count
     
-    # Get related articles from the same category
-    related_articles = News.objects.filter(category=news.category).exclude(pk=pk).order_by('-created_at')[:3]
+    # Get the most similar articles
+    related_articles = news.related_articles()
     
     # Get share counts for this article
-    share_counts = {}
-    for platform in ['facebook', 'twitter', 'linkedin', 'email']:
-        try:
-            share = ShareCount.objects.get(news=news, platform=platform)
-            share_counts[platform] = share.count
-        except ShareCount.DoesNotExist:
-            share_counts[platform] = 0
+    share_counts = dict.fromkeys(['facebook', 'twitter', 'linkedin', 'email'], 0)
+    share_counts.update(news.platform_shares())
     
     total_shares = sum(share_counts.values())
     
@@ -128,20 +143,11 @@ def track_share(request, pk):
         if platform not in ['facebook', 'twitter', 'linkedin', 'email']:
             return JsonResponse({'success': False, 'error': 'Invalid platform'}, status=400)
         
-        # Get or create share count record
-        share, created = ShareCount.objects.get_or_create(
-            news=news,
-            platform=platform,
-            defaults={'count': 0}
-        )
-        
-        # Increment the count
-        share.count += 1
-        share.save()
+        platform_shares = news.record_share(platform)
         
         return JsonResponse({
             'success': True,
-            'count': share.count,
+            'count': platform_shares.get(platform, 0),
             'platform': platform
         })
         